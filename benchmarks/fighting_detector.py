@@ -0,0 +1,98 @@
+import argparse
+import time
+
+import numpy as np
+from benchmarks.lying_detector import STANDING
+from common.frame_data import FrameData
+from common.person import PersonBatch
+from event_detection.fighting import FightingDetector
+from pose_estimation.pose_connections import LEFT_ELBOW, LEFT_WRIST, RIGHT_ELBOW, RIGHT_WRIST
+
+ARMS = [LEFT_ELBOW, RIGHT_ELBOW, LEFT_WRIST, RIGHT_WRIST]
+
+
+def synthetic_scene(rng, num_people, num_fights, width=1920, height=1080):
+    """
+    Random people walking across the frame, plus `num_fights` pairs standing close together.
+    Returns:
+        tuple: ((P, 2) origins, (P, 2) per-frame velocities, (P,) sizes, (P,) fight pair id or -1).
+    """
+    sizes = rng.uniform(150, 300, size=num_people)
+    origins = rng.uniform((0, 0), (width - 300, height - 300), size=(num_people, 2))
+    velocities = rng.normal(0, 3, size=(num_people, 2))
+    pair = np.full(num_people, -1)
+    for k in range(min(num_fights, num_people // 2)):
+        first, second = 2 * k, 2 * k + 1
+        pair[[first, second]] = k
+        origins[second] = origins[first] + (0.5 * sizes[first], 0)
+        sizes[second] = sizes[first]
+        velocities[[first, second]] = 0
+    return origins, velocities, sizes, pair
+
+
+def replay_frame(rng, scene, index):
+    """Skeletons of a scene at frame `index`; fighters swing their arms around, walkers keep them still."""
+    origins, velocities, sizes, pair = scene
+    positions = origins + velocities * index
+    shape = np.broadcast_to(STANDING, (len(sizes), 17, 2)).copy()
+    fighting = pair >= 0
+    swing = rng.uniform(-0.25, 0.25, size=(int(fighting.sum()), len(ARMS), 2))
+    arms = shape[fighting]
+    arms[:, ARMS] += swing
+    shape[fighting] = arms
+
+    xy = positions[:, None, :] + shape * sizes[:, None, None] + rng.normal(0, 2, size=shape.shape)
+    keypoints = np.concatenate((xy, rng.uniform(0.6, 1.0, size=(len(sizes), 17, 1))), axis=2)
+    bboxes = np.concatenate((xy.min(axis=1), xy.max(axis=1)), axis=1)
+    return bboxes, keypoints
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="fighting detector benchmark",
+        description="replays synthetic pose streams through the fighting detector and reports latency and accuracy",
+    )
+    parser.add_argument("--cameras", type=int, default=16, help="number of cameras")
+    parser.add_argument("--people", type=int, default=30, help="people per frame")
+    parser.add_argument("--fights", type=int, default=2, help="fighting pairs per camera")
+    parser.add_argument("--frames", type=int, default=200, help="frames per camera")
+    parser.add_argument("--fps", type=float, default=25, help="target frame rate per camera")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    detector = FightingDetector()
+    scenes = [synthetic_scene(rng, args.people, args.fights) for _ in range(args.cameras)]
+    image = np.zeros((1, 1, 3), dtype=np.uint8)
+    track_ids = np.arange(args.people)
+
+    elapsed, flagged = 0.0, [set() for _ in scenes]
+    for index in range(args.frames):
+        for camera_id, scene in enumerate(scenes):
+            bboxes, keypoints = replay_frame(rng, scene, index)
+            people = PersonBatch.from_arrays(bboxes, keypoints, np.ones(args.people), track_ids=track_ids)
+            frame_data = FrameData(image, index, camera_id=camera_id, people=people)
+
+            start = time.perf_counter()
+            events = detector.process(frame_data)
+            elapsed += time.perf_counter() - start
+
+            if index == args.frames - 1:
+                flagged[camera_id] = {tuple(event.track_ids) for event in events}
+
+    # Pairs formed across two overlapping fights are a brawl, only pairs with a bystander are false alarms
+    hits, false_alarms, fights_total = 0, 0, 0
+    for (_, _, _, pair), pairs in zip(scenes, flagged):
+        fights = {(2 * k, 2 * k + 1) for k in range(int(pair.max()) + 1)}
+        hits += len(pairs & fights)
+        false_alarms += sum(1 for first, second in pairs if pair[first] < 0 or pair[second] < 0)
+        fights_total += len(fights)
+
+    frames = args.frames * args.cameras
+    per_frame = elapsed / frames
+    print(f"{per_frame * 1000:.4f} ms/frame with {args.people} people ({frames} frames)")
+    print(f"one core keeps up with {1 / (per_frame * args.fps):.0f} cameras at {args.fps:g} FPS")
+    print(f"detected {hits}/{fights_total} fights, {false_alarms} false alarms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+from pose_estimation.preprocess import LetterboxPreprocessor, letterbox_copy
+
+
+def measure(preprocess, frames, repeat):
+    """Return (ms per frame, peak bytes allocated while preprocessing one frame)."""
+    for frame in frames:  # Warm-up so cached buffers are not counted
+        preprocess(frame)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for frame in frames:
+            preprocess(frame)
+    latency = (time.perf_counter() - start) / (repeat * len(frames))
+
+    peaks = []
+    tracemalloc.start()
+    for frame in frames:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        preprocess(frame)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - baseline)
+    tracemalloc.stop()
+    return latency * 1000, sum(peaks) / len(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="letterbox benchmark",
+        description="compares allocating and buffered letterbox preprocessing",
+    )
+    parser.add_argument("--width", type=int, default=1920, help="source frame width")
+    parser.add_argument("--height", type=int, default=1080, help="source frame height")
+    parser.add_argument("--input_size", type=int, default=640, help="model input size")
+    parser.add_argument("--repeat", type=int, default=50, help="number of passes over the frames")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 255, size=(args.height, args.width, 3), dtype=np.uint8) for _ in range(4)]
+    preprocessor = LetterboxPreprocessor(args.input_size, args.input_size)
+
+    # Both paths must produce the same tensor
+    reference, _ = letterbox_copy(frames[0], args.input_size, args.input_size)
+    buffered, _ = preprocessor([frames[0]])
+    assert np.allclose(reference, buffered[0], atol=1e-6), "preprocessing outputs differ"
+
+    results = {
+        "copy": measure(lambda frame: letterbox_copy(frame, args.input_size, args.input_size), frames, args.repeat),
+        "buffered": measure(lambda frame: preprocessor([frame]), frames, args.repeat),
+    }
+    for name, (latency, allocated) in results.items():
+        print(f"{name:9s} {latency:7.3f} ms/frame  {allocated / 1e6:7.2f} MB allocated/frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import time
+
+import numpy as np
+from common.frame_data import FrameData
+from common.person import PersonBatch
+from event_detection.lying import LyingDetector
+
+# Upright skeleton in a unit box (x, y), y pointing down
+STANDING = np.array(
+    [
+        [0.50, 0.08],
+        [0.47, 0.06],
+        [0.53, 0.06],
+        [0.44, 0.07],
+        [0.56, 0.07],
+        [0.38, 0.20],
+        [0.62, 0.20],
+        [0.33, 0.35],
+        [0.67, 0.35],
+        [0.30, 0.48],
+        [0.70, 0.48],
+        [0.42, 0.52],
+        [0.58, 0.52],
+        [0.42, 0.74],
+        [0.58, 0.74],
+        [0.42, 0.95],
+        [0.58, 0.95],
+    ],
+    dtype=np.float32,
+)
+
+
+def synthetic_people(rng, num_people, lying_fraction, width=1920, height=1080):
+    """Random standing and lying skeletons with keypoint noise."""
+    lying = rng.uniform(size=num_people) < lying_fraction
+    sizes = rng.uniform(120, 300, size=num_people)
+    origins = rng.uniform((0, 0), (width - 300, height - 300), size=(num_people, 2))
+
+    shape = np.broadcast_to(STANDING, (num_people, 17, 2)).copy()
+    shape[lying] = shape[lying][:, :, ::-1]  # Swap axes to lay the skeleton on its side
+    xy = origins[:, None, :] + shape * sizes[:, None, None] + rng.normal(0, 4, size=(num_people, 17, 2))
+    keypoints = np.concatenate((xy, rng.uniform(0.4, 1.0, size=(num_people, 17, 1))), axis=2)
+    bboxes = np.concatenate((xy.min(axis=1), xy.max(axis=1)), axis=1)
+    return bboxes, keypoints, lying
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="lying detector benchmark",
+        description="measures lying detection latency and accuracy on synthetic pose streams",
+    )
+    parser.add_argument("--cameras", type=int, default=16, help="number of cameras")
+    parser.add_argument("--people", type=int, default=30, help="people per frame")
+    parser.add_argument("--frames", type=int, default=200, help="frames per camera")
+    parser.add_argument("--lying_fraction", type=float, default=0.1, help="share of people lying down")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    detector = LyingDetector()
+    streams = [synthetic_people(rng, args.people, args.lying_fraction) for _ in range(args.cameras)]
+    image = np.zeros((1, 1, 3), dtype=np.uint8)
+
+    elapsed, hits, false_alarms, lying_total = 0.0, 0, 0, 0
+    for index in range(args.frames):
+        for camera_id, (bboxes, keypoints, lying) in enumerate(streams):
+            people = PersonBatch.from_arrays(bboxes, keypoints, np.ones(args.people), track_ids=np.arange(args.people))
+            frame_data = FrameData(image, index, camera_id=camera_id, people=people)
+
+            start = time.perf_counter()
+            events = detector.process(frame_data)
+            elapsed += time.perf_counter() - start
+
+            if index == args.frames - 1:
+                flagged = np.zeros(args.people, dtype=bool)
+                flagged[[event.track_ids[0] for event in events]] = True
+                hits += int((flagged & lying).sum())
+                false_alarms += int((flagged & ~lying).sum())
+                lying_total += int(lying.sum())
+
+    frames = args.frames * args.cameras
+    print(f"{elapsed / frames * 1000:.4f} ms/frame with {args.people} people ({frames} frames)")
+    print(f"detected {hits}/{lying_total} lying people, {false_alarms} false alarms")
+
+
+if __name__ == "__main__":
+    main()
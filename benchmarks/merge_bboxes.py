@@ -0,0 +1,45 @@
+import argparse
+import time
+
+import numpy as np
+
+from kit.box_utils import merge_bboxes, merge_bboxes_sequential
+
+
+def random_rois(count, width=3840, height=2160, seed=0):
+    """Clustered [x, y, w, h] ROIs, like motion blobs around people."""
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform((0, 0), (width, height), size=(max(count // 5, 1), 2))
+    xy = centers[rng.integers(0, len(centers), size=count)] + rng.normal(0, 40, size=(count, 2))
+    wh = rng.uniform(10, 60, size=(count, 2))
+    return np.concatenate((xy, wh), axis=1).astype(int).tolist()
+
+
+def time_merge(merge, rois, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = merge(list(rois))
+    return (time.perf_counter() - start) / repeat, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="merge bboxes benchmark",
+        description="compares the sequential and union-find ROI merges",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000], help="ROI counts")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per size")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        rois = random_rois(size)
+        sequential_time, sequential_count = time_merge(merge_bboxes_sequential, rois, args.repeat)
+        merged_time, merged_count = time_merge(merge_bboxes, rois, args.repeat)
+        print(
+            f"{size:5d} boxes  sequential {sequential_time * 1000:9.2f} ms ({sequential_count} boxes)  "
+            f"union-find {merged_time * 1000:7.2f} ms ({merged_count} boxes)"
+        )
+
+
+if __name__ == "__main__":
+    main()
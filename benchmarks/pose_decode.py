@@ -0,0 +1,85 @@
+import argparse
+import time
+
+import numpy as np
+from pose_estimation.model import NMS_IOU_THRESHOLD, decode_poses, decode_poses_loop
+
+IOU_THRESHOLDS = (0.45, 0.5, 0.6, 0.7, 0.8)
+
+
+def synthetic_output(num_anchors=8400, num_people=10, seed=0):
+    """Build a fake YOLOv8-pose output with `num_people` confident anchor clusters."""
+    rng = np.random.default_rng(seed)
+    output = rng.uniform(0, 640, size=(56, num_anchors)).astype(np.float32)
+    output[2:4] = rng.uniform(20, 200, size=(2, num_anchors))
+    output[4] = rng.uniform(0, 0.3, size=num_anchors)
+    confident = rng.choice(num_anchors, size=num_people * 5, replace=False)
+    output[4, confident] = rng.uniform(0.6, 0.95, size=confident.size)
+    output[7:56:3] = rng.uniform(0, 1, size=(17, num_anchors))
+    return output
+
+
+def time_decode(decode, outputs, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for output in outputs:
+            decode(output, 0.5, 0, 80)
+    return (time.perf_counter() - start) / (repeat * len(outputs))
+
+
+def check_equal(outputs):
+    """Verify both decode paths return the same detections."""
+    for output in outputs:
+        fast = decode_poses(output, 0.5, 0, 80)
+        slow = decode_poses_loop(output, 0.5, 0, 80)
+        assert len(fast) == len(slow), "detection count differs"
+        for (bbox_f, kps_f, conf_f), (bbox_s, kps_s, conf_s) in zip(fast, slow):
+            assert np.allclose(bbox_f, bbox_s, atol=1), "bbox differs"
+            assert np.allclose(kps_f, kps_s, atol=1e-3), "keypoints differ"
+            assert abs(conf_f - conf_s) < 1e-6, "confidence differs"
+
+
+def detections_per_threshold(outputs, thresholds=IOU_THRESHOLDS):
+    """Mean number of detections per output at each NMS IoU threshold, to spot duplicate persons."""
+    return {
+        threshold: np.mean([len(decode_poses(output, 0.5, 0, 80, iou_threshold=threshold)) for output in outputs])
+        for threshold in thresholds
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="pose decode benchmark",
+        description="compares vectorized and loop decoding of PoseModel outputs",
+    )
+    parser.add_argument(
+        "--outputs",
+        type=str,
+        default=None,
+        help="path to a .npy file of recorded raw outputs, shape (N, 56, anchors) or (56, anchors)",
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="number of passes over the outputs")
+    args = parser.parse_args()
+
+    if args.outputs:
+        recorded = np.load(args.outputs)
+        outputs = [recorded] if recorded.ndim == 2 else list(recorded)
+    else:
+        outputs = [synthetic_output(seed=seed) for seed in range(10)]
+
+    check_equal(outputs)
+    loop_time = time_decode(decode_poses_loop, outputs, args.repeat)
+    vectorized_time = time_decode(decode_poses, outputs, args.repeat)
+
+    print(f"loop:       {loop_time * 1000:.3f} ms/frame")
+    print(f"vectorized: {vectorized_time * 1000:.3f} ms/frame")
+    print(f"speedup:    {loop_time / vectorized_time:.1f}x")
+
+    print("detections per frame by NMS IoU threshold:")
+    for threshold, count in detections_per_threshold(outputs).items():
+        marker = " (NMS_IOU_THRESHOLD)" if threshold == NMS_IOU_THRESHOLD else ""
+        print(f"  {threshold:.2f}: {count:.2f}{marker}")
+
+
+if __name__ == "__main__":
+    main()
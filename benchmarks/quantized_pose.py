@@ -0,0 +1,92 @@
+import argparse
+import time
+
+import numpy as np
+from pose_estimation.config import variant_model_path
+from pose_estimation.model import PoseModel
+from pose_estimation.quantization import load_frames
+
+# Per-keypoint falloff constants from the COCO keypoint evaluation
+COCO_SIGMAS = (
+    np.array([0.26, 0.25, 0.25, 0.35, 0.35, 0.79, 0.79, 0.72, 0.72, 0.62, 0.62, 1.07, 1.07, 0.87, 0.87, 0.89, 0.89])
+    / 10.0
+)
+
+
+def box_iou(box1, box2):
+    """IoU of two [x_min, y_min, x_max, y_max] boxes."""
+    inter_w = max(0, min(box1[2], box2[2]) - max(box1[0], box2[0]))
+    inter_h = max(0, min(box1[3], box2[3]) - max(box1[1], box2[1]))
+    inter = inter_w * inter_h
+    union = (box1[2] - box1[0]) * (box1[3] - box1[1]) + (box2[2] - box2[0]) * (box2[3] - box2[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def object_keypoint_similarity(reference, candidate, bbox, conf_threshold=0.5):
+    """OKS of `candidate` keypoints against `reference` keypoints, over the reference's visible keypoints."""
+    visible = reference[:, 2] > conf_threshold
+    if not visible.any():
+        return None
+    area = max((bbox[2] - bbox[0]) * (bbox[3] - bbox[1]), 1)
+    squared_distance = ((reference[:, :2] - candidate[:, :2]) ** 2).sum(axis=1)
+    similarity = np.exp(-squared_distance / (2 * area * (2 * COCO_SIGMAS) ** 2))
+    return float(similarity[visible].mean())
+
+
+def agreement(reference_poses, candidate_poses, iou_threshold=0.5):
+    """Greedily match detections by IoU and return (OKS of each match, number of reference detections)."""
+    scores = []
+    unmatched = list(candidate_poses)
+    for bbox, keypoints, _ in reference_poses:
+        if not unmatched:
+            break
+        ious = [box_iou(bbox, candidate[0]) for candidate in unmatched]
+        best = int(np.argmax(ious))
+        if ious[best] < iou_threshold:
+            continue
+        oks = object_keypoint_similarity(keypoints, unmatched.pop(best)[1], bbox)
+        if oks is not None:
+            scores.append(oks)
+    return scores, len(reference_poses)
+
+
+def run(model, frames):
+    """Return (frames per second, poses for each frame)."""
+    start = time.perf_counter()
+    poses = [model.get_poses(frame) for frame in frames]
+    return len(frames) / (time.perf_counter() - start), poses
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="quantized pose benchmark",
+        description="compares speed and keypoint agreement of pose model variants against FP32",
+    )
+    parser.add_argument("--model_path", type=str, required=True, help="path to the FP32 model")
+    parser.add_argument("--frames", type=str, required=True, help="directory of images or video to evaluate on")
+    parser.add_argument("--precisions", type=str, nargs="+", default=["int8"], help="variants to compare")
+    parser.add_argument("--limit", type=int, default=200, help="max frames to evaluate")
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames, limit=args.limit)
+    reference_fps, reference = run(PoseModel(args.model_path), frames)
+    print(f"fp32  {reference_fps:7.2f} FPS")
+
+    for precision in args.precisions:
+        fps, poses = run(PoseModel(variant_model_path(args.model_path, precision)), frames)
+        scores, total, matched = [], 0, 0
+        for reference_poses, candidate_poses in zip(reference, poses):
+            frame_scores, frame_total = agreement(reference_poses, candidate_poses)
+            scores.extend(frame_scores)
+            total += frame_total
+            matched += len(frame_scores)
+        mean_oks = np.mean(scores) if scores else float("nan")
+        recall = matched / total if total else float("nan")
+        print(
+            f"{precision:5s} {fps:7.2f} FPS  speedup {fps / reference_fps:4.2f}x  "
+            f"mean OKS {mean_oks:.3f}  matched {recall:.1%} of FP32 detections"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import time
+
+import numpy as np
+from tracking.tracker import Tracker
+
+
+def simulate(num_people, num_frames, seed=0, width=1920, height=1080):
+    """Yield (boxes, scores, true ids) for people walking in straight lines with detector noise and misses."""
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform((0, 0), (width, height), size=(num_people, 2))
+    velocities = rng.normal(0, 4, size=(num_people, 2))
+    sizes = rng.uniform((40, 100), (80, 220), size=(num_people, 2))
+    for _ in range(num_frames):
+        positions = positions + velocities
+        # Bounce off the frame edges
+        outside = (positions < 0) | (positions > (width, height))
+        velocities[outside] *= -1
+        visible = rng.uniform(size=num_people) > 0.05
+        noise = rng.normal(0, 2, size=(num_people, 4))
+        boxes = np.concatenate((positions, positions + sizes), axis=1) + noise
+        scores = rng.uniform(0.2, 0.95, size=num_people)
+        yield boxes[visible], scores[visible], np.flatnonzero(visible)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="tracker benchmark",
+        description="measures tracker throughput and id switches on synthetic crowds",
+    )
+    parser.add_argument("--people", type=int, nargs="+", default=[10, 50, 100, 200], help="people per frame")
+    parser.add_argument("--frames", type=int, default=500, help="frames per run")
+    args = parser.parse_args()
+
+    for num_people in args.people:
+        tracker = Tracker()
+        frames = list(simulate(num_people, args.frames))
+        assigned = {}
+        switches = 0
+
+        start = time.perf_counter()
+        results = [tracker.update(boxes, scores) for boxes, scores, _ in frames]
+        elapsed = time.perf_counter() - start
+
+        # Count how often a person's track id changes between frames
+        for (_, _, true_ids), track_ids in zip(frames, results):
+            for true_id, track_id in zip(true_ids.tolist(), track_ids.tolist()):
+                if track_id < 0:
+                    continue
+                if assigned.get(true_id, track_id) != track_id:
+                    switches += 1
+                assigned[true_id] = track_id
+
+        print(
+            f"{num_people:4d} people  {elapsed / args.frames * 1000:6.3f} ms/frame  "
+            f"{args.frames / elapsed:8.1f} FPS  {switches} id switches"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+
+@dataclass
+class MotionConfig:
+    """Settings for MotionGate; lower `pixel_threshold` and `min_area` make the gate more sensitive."""
+
+    enabled: bool = False
+    width: int = 160  # Frames are compared at this width, keeping the aspect ratio
+    pixel_threshold: int = 25  # Grey level change for a pixel to count as moving
+    min_area: float = 0.002  # Fraction of moving pixels for a frame to count as moving
+    learning_rate: float = 0.05  # How fast the background absorbs scene changes
+    idle_interval: float = 2.0  # Seconds between frames let through while nothing moves, 0 for none
+    blur: int = 5  # Gaussian kernel applied to the small frame to suppress sensor noise
+
+
+class MotionGate:
+    """
+    Decides per camera whether a frame needs pose inference.
+
+    Each frame is converted to a small blurred greyscale image and compared against a running-average
+    background. Frames where too few pixels differ are skipped, except for one frame every `idle_interval`
+    seconds so that still persons (someone lying down) keep being analyzed. The moving regions of frames let
+    through are returned as boxes in full-frame coordinates.
+    """
+
+    def __init__(self, config: MotionConfig | None = None):
+        self.config = config or MotionConfig()
+        self.backgrounds = {}  # camera id -> float32 small greyscale background
+        self.last_passed = {}  # camera id -> timestamp in seconds of the last frame let through
+        self.kernel = np.ones((3, 3), dtype=np.uint8)
+        self.passed = 0
+        self.skipped = 0
+
+    def small(self, image):
+        """Downscaled, blurred greyscale copy of a BGR frame."""
+        height, width = image.shape[:2]
+        size = (self.config.width, max(1, round(height * self.config.width / width)))
+        small = cv2.resize(image, size, interpolation=cv2.INTER_LINEAR)  # Cheap sampling, the blur below smooths noise
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        if self.config.blur > 1:
+            small = cv2.GaussianBlur(small, (self.config.blur, self.config.blur), 0)
+        return small
+
+    def check(self, camera_id, image, timestamp):
+        """
+        Compare a frame against its camera's background.
+        Parameters:
+            camera_id: Camera the frame came from.
+            image (np.array): BGR frame.
+            timestamp (float): Capture time in seconds.
+        Returns:
+            tuple: (bool whether the frame should be analyzed, list of (x, y, width, height) moving regions).
+        """
+        small = self.small(image)
+        background = self.backgrounds.get(camera_id)
+        if background is None or background.shape != small.shape:
+            self.backgrounds[camera_id] = small.astype(np.float32)
+            self.last_passed[camera_id] = timestamp
+            self.passed += 1
+            return True, []
+
+        difference = cv2.absdiff(small, cv2.convertScaleAbs(background))
+        cv2.accumulateWeighted(small, background, self.config.learning_rate)
+        mask = (difference > self.config.pixel_threshold).astype(np.uint8)
+        moving = cv2.countNonZero(mask) >= self.config.min_area * mask.size
+
+        idle_due = (
+            self.config.idle_interval > 0 and timestamp - self.last_passed[camera_id] >= self.config.idle_interval
+        )
+        if not moving and not idle_due:
+            self.skipped += 1
+            return False, []
+        self.last_passed[camera_id] = timestamp
+        self.passed += 1
+        return True, self.regions(mask, image.shape) if moving else []
+
+    def regions(self, mask, shape):
+        """Bounding boxes of the moving areas of a small mask, scaled to a frame of `shape`."""
+        mask = cv2.dilate(mask, self.kernel, iterations=2)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        if count <= 1:
+            return []
+        boxes = stats[1:, :4].astype(np.float32)  # Skip the background component; x, y, width, height
+        boxes *= np.array([shape[1] / mask.shape[1], shape[0] / mask.shape[0]] * 2, dtype=np.float32)
+        return [tuple(box) for box in boxes.astype(np.int32).tolist()]
@@ -0,0 +1,139 @@
+import asyncio
+import bisect
+import logging
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+OFF_HOURS_MODES = ("low_fps", "motion", "off")
+
+
+@dataclass
+class ScheduleConfig:
+    """How cameras are throttled outside an organization's scheduled hours."""
+
+    enabled: bool = False
+    off_hours_mode: str = "low_fps"  # low_fps, motion (motion-gated frames only) or off
+    off_hours_fps: float = 0.2  # Frames per second and camera in low_fps mode
+    refresh_interval: float = 300.0  # Seconds between reloads of the Schedule table
+
+    def __post_init__(self):
+        if self.off_hours_mode not in OFF_HOURS_MODES:
+            raise ValueError(f"Unknown off-hours mode {self.off_hours_mode!r}, expected one of {OFF_HOURS_MODES}")
+        if self.off_hours_fps <= 0:
+            raise ValueError(
+                f"off_hours_fps must be positive, got {self.off_hours_fps}; use off_hours_mode: off to drop all frames"
+            )
+
+
+class ScheduleIndex:
+    """
+    Opening hours as sorted, non-overlapping intervals, answering "is it open at t" with one binary search.
+
+    Entries without a start or end are open-ended. An empty schedule is treated as always open, so an
+    organization that has not configured hours is never throttled; so is a schedule whose intervals all end
+    before they start, with a warning.
+    """
+
+    def __init__(self, intervals):
+        intervals = sorted(
+            (-math.inf if start is None else start, math.inf if end is None else end) for start, end in intervals
+        )
+        starts, ends = [], []
+        for start, end in intervals:
+            if end <= start:
+                continue
+            if starts and start <= ends[-1]:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        self.starts = starts
+        self.ends = ends
+        self.always_open = not starts
+        if intervals and self.always_open:
+            logging.getLogger("schedule").warning(
+                f"All {len(intervals)} schedule intervals end before they start, treating the schedule as always open."
+            )
+
+    @classmethod
+    def from_schedules(cls, schedules):
+        """Build the index from Schedule rows, e.g. from get_schedules_by_org."""
+        return cls(
+            (
+                None if row.start_time is None else row.start_time.timestamp(),
+                None if row.end_time is None else row.end_time.timestamp(),
+            )
+            for row in schedules
+        )
+
+    def __len__(self):
+        return len(self.starts)
+
+    def is_open(self, timestamp):
+        """True if `timestamp` (seconds) falls inside a scheduled interval."""
+        if self.always_open:
+            return True
+        position = bisect.bisect_right(self.starts, timestamp) - 1
+        return position >= 0 and timestamp < self.ends[position]
+
+
+def load_schedule(db_config, org_id):
+    """Read an organization's Schedule rows from the database into a ScheduleIndex."""
+    # Imported here so capture and config do not require the async database driver
+    from notification_app.repository import AsyncNotificationRepository
+
+    async def fetch():
+        repository = AsyncNotificationRepository(db_config)
+        try:
+            return await repository.get_schedules_by_org(org_id)
+        finally:
+            await repository.get_engine().dispose()
+
+    return ScheduleIndex.from_schedules(asyncio.run(fetch()))
+
+
+class ScheduleThrottle:
+    """
+    Applies an organization's schedule to captured frames.
+
+    The schedule is loaded once and reloaded every `refresh_interval` seconds by `refresh`, called from a
+    housekeeping loop rather than the capture threads; a failed reload keeps the previous index. Outside
+    scheduled hours `off_hours_mode` says whether cameras drop to `off_hours_fps`, pass only motion-gated
+    frames, or stop sending frames altogether.
+    """
+
+    def __init__(self, config: ScheduleConfig, loader, logger=None):
+        self.config = config
+        self.loader = loader  # Callable returning a fresh ScheduleIndex
+        self.logger = logger or logging.getLogger("schedule")
+        self.index = ScheduleIndex([])
+        self.next_refresh = 0.0
+        self.last_emitted = {}  # camera id -> timestamp of the last frame let through off hours
+
+    def refresh(self, force=False):
+        """Reload the schedule if it is due."""
+        now = time.monotonic()
+        if not force and now < self.next_refresh:
+            return
+        self.next_refresh = now + self.config.refresh_interval
+        try:
+            self.index = self.loader()
+        except Exception as error:
+            self.logger.warning(f"Could not load schedule, keeping the previous one: {error}")
+            return
+        self.logger.info(f"Loaded schedule with {len(self.index)} intervals.")
+
+    def off_hours_mode(self, timestamp: datetime):
+        """Return None during scheduled hours, otherwise the configured off-hours mode."""
+        return None if self.index.is_open(timestamp.timestamp()) else self.config.off_hours_mode
+
+    def admit_low_fps(self, camera_id, timestamp: datetime):
+        """True if an off-hours frame of the camera is due at off_hours_fps."""
+        seconds = timestamp.timestamp()
+        last = self.last_emitted.get(camera_id)
+        if last is not None and seconds - last < 1.0 / self.config.off_hours_fps:
+            return False
+        self.last_emitted[camera_id] = seconds
+        return True
@@ -0,0 +1,168 @@
+import functools
+import multiprocessing
+import queue
+import threading
+import time
+from dataclasses import replace
+
+from common.service import ServiceBase
+
+from .motion import MotionConfig, MotionGate
+from .schedule import ScheduleThrottle, load_schedule
+from .source import CameraSource
+
+
+class CaptureService(ServiceBase):
+    """
+    Feeds frames from every configured camera to pose estimation.
+
+    Each source runs in its own CameraSource thread, so a slow or reconnecting RTSP camera never delays the
+    others. Frames are copied into `frame_ring` when one is given, so only slot references cross the process
+    boundary, and are dropped rather than queued up when the ring or the output queue is full; frames larger
+    than the ring's slots are sent as pickled copies instead. With motion
+    gating enabled, frames of still scenes are skipped before they are copied or sent anywhere, and frames
+    let through carry their moving regions in FrameData.rois. With a schedule, cameras run in a low-cost mode
+    outside the organization's hours.
+    """
+
+    def __init__(
+        self,
+        name,
+        camera_sources,
+        output_queue,
+        fps=5.0,
+        frame_ring=None,
+        backoff_initial=0.5,
+        backoff_max=30.0,
+        report_interval=10.0,
+        motion_config=None,
+        schedule_config=None,
+        db_config=None,
+        org_id=None,
+    ):
+        super().__init__(name)
+        self.camera_sources = camera_sources  # Config.camera_sources; each entry is also the frame's camera_id
+        self.output_queue = output_queue
+        self.fps = fps  # Frames decoded per second and camera
+        self.frame_ring = frame_ring
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.report_interval = report_interval
+        self.motion_config = motion_config  # MotionConfig; frames without motion are skipped when enabled
+        self.schedule_config = schedule_config  # ScheduleConfig; throttles cameras outside the org's hours
+        self.db_config = db_config  # Where the org's Schedule table is read from
+        self.org_id = org_id
+
+        # Shared with the parent process so capture health can be read while the service runs
+        self.captured_frames = multiprocessing.Value("i", 0)
+        self.dropped_frames = multiprocessing.Value("i", 0)
+        self.reconnects = multiprocessing.Value("i", 0)
+        self.motion_skipped_frames = multiprocessing.Value("i", 0)
+        self.schedule_skipped_frames = multiprocessing.Value("i", 0)
+
+    def run(self):
+        self.stop_event = threading.Event()
+        # One gate per camera, so each source thread only touches its own state
+        gating = self.motion_config is not None and self.motion_config.enabled
+        self.gates = {source: MotionGate(self.motion_config) for source in self.camera_sources} if gating else {}
+        self.throttle = None
+        self.off_hours_gates = self.gates
+        self.oversized_sources = set()  # Cameras already warned about frames too large for the ring
+        if self.schedule_config is not None and self.schedule_config.enabled:
+            loader = functools.partial(load_schedule, self.db_config, self.org_id)
+            self.throttle = ScheduleThrottle(self.schedule_config, loader, self.logger)
+            self.throttle.refresh(force=True)
+            if self.schedule_config.off_hours_mode == "motion" and not gating:
+                motion_config = replace(self.motion_config or MotionConfig(), enabled=True)
+                self.off_hours_gates = {source: MotionGate(motion_config) for source in self.camera_sources}
+        self.sources = [
+            CameraSource(
+                source,
+                source,
+                self.emit,
+                fps=self.fps,
+                backoff_initial=self.backoff_initial,
+                backoff_max=self.backoff_max,
+                logger=self.logger,
+                stop_event=self.stop_event,
+            )
+            for source in self.camera_sources
+        ]
+        for source in self.sources:
+            source.start()
+        self.logger.info(f"Starting capture service for {len(self.sources)} cameras.")
+
+        next_report = time.monotonic() + self.report_interval
+        while self.running.is_set():
+            self.stop_event.wait(0.5)
+            self.reconnects.value = sum(source.reconnects for source in self.sources)
+            if self.throttle is not None:
+                self.throttle.refresh()
+            if time.monotonic() < next_report:
+                continue
+            next_report += self.report_interval
+            for source in self.sources:
+                self.logger.info(
+                    f"Camera {source.camera_id}: grabbed {source.grabbed}, decoded {source.decoded}, "
+                    f"reconnects {source.reconnects}."
+                )
+            if self.gates:
+                self.logger.info(f"Frames skipped without motion: {self.motion_skipped_frames.value}.")
+            if self.throttle is not None:
+                self.logger.info(f"Frames skipped outside scheduled hours: {self.schedule_skipped_frames.value}.")
+
+        self.stop_event.set()
+        for source in self.sources:
+            source.join(timeout=5.0)
+        self.logger.info("Capture service stopped gracefully.")
+
+    def emit(self, frame_data):
+        """Hand a decoded frame to the next stage, dropping it if the stage is not keeping up."""
+        gates = self.gates
+        if self.throttle is not None:
+            mode = self.throttle.off_hours_mode(frame_data.timestamp)
+            if mode == "off" or (
+                mode == "low_fps" and not self.throttle.admit_low_fps(frame_data.camera_id, frame_data.timestamp)
+            ):
+                self._count(self.schedule_skipped_frames)
+                return
+            if mode == "motion":
+                gates = self.off_hours_gates
+
+        gate = gates.get(frame_data.camera_id)
+        if gate is not None:
+            analyze, regions = gate.check(frame_data.camera_id, frame_data.image, frame_data.timestamp.timestamp())
+            if not analyze:
+                self._count(self.motion_skipped_frames)
+                return
+            frame_data.rois = regions
+
+        if self.frame_ring is not None and not self.frame_ring.fits(frame_data.image):
+            if frame_data.camera_id not in self.oversized_sources:
+                self.oversized_sources.add(frame_data.camera_id)
+                self.logger.warning(
+                    f"Camera {frame_data.camera_id}: frames of shape {frame_data.image.shape} exceed the frame ring's "
+                    f"{self.frame_ring.max_shape} slots and are copied through the queue; raise frame_ring max_width "
+                    "and max_height to avoid the copies."
+                )
+        elif self.frame_ring is not None:
+            ring_frame = self.frame_ring.put(frame_data.image, frame_data.index, frame_data.timestamp, timeout=0)
+            if ring_frame is None:
+                self._count(self.dropped_frames)
+                return
+            ring_frame.camera_id = frame_data.camera_id
+            ring_frame.rois = frame_data.rois
+            frame_data = ring_frame
+        try:
+            self.output_queue.put_nowait(frame_data)
+        except queue.Full:
+            if self.frame_ring is not None:
+                self.frame_ring.release(frame_data)  # No-op for frames sent as copies
+            self._count(self.dropped_frames)
+            return
+        self._count(self.captured_frames)
+
+    @staticmethod
+    def _count(value):
+        with value.get_lock():
+            value.value += 1
@@ -0,0 +1,78 @@
+import logging
+import threading
+import time
+from datetime import datetime
+
+import cv2
+from common.frame_data import FrameData
+
+
+class CameraSource(threading.Thread):
+    """
+    Reads one camera in a dedicated thread.
+
+    The thread grabs every frame as soon as the driver or stream delivers it, so the capture buffer never
+    fills up and the newest frame is always the one decoded. Frames are only decoded (`retrieve`) when they
+    are due at `fps`; the rest are grabbed and discarded without decoding. Decoded frames are stamped with
+    their grab count and capture time and handed to `emit`. When the source fails to open or stops
+    delivering frames it is reopened after an exponentially growing delay.
+    """
+
+    def __init__(
+        self, camera_id, source, emit, fps=5.0, backoff_initial=0.5, backoff_max=30.0, logger=None, stop_event=None
+    ):
+        super().__init__(name=f"capture-{camera_id}", daemon=True)
+        self.camera_id = camera_id
+        self.source = source  # Device index or stream URL, as listed in Config.camera_sources
+        self.emit = emit  # Called with each decoded FrameData; must not block for long
+        self.interval = 1.0 / fps if fps else 0.0
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.logger = logger or logging.getLogger(self.name)
+        self.stop_event = stop_event or threading.Event()
+        self.grabbed = 0  # Frames read from the source, the index stamped on FrameData
+        self.decoded = 0
+        self.reconnects = 0
+
+    def run(self):
+        delay = self.backoff_initial
+        while not self.stop_event.is_set():
+            capture = cv2.VideoCapture(self.source)
+            if capture.isOpened():
+                self.logger.info(f"Camera {self.camera_id} opened.")
+                if self._read(capture):
+                    delay = self.backoff_initial  # The stream delivered frames, start over with a short delay
+            capture.release()
+            if self.stop_event.is_set():
+                break
+
+            self.reconnects += 1
+            self.logger.warning(f"Camera {self.camera_id} lost, reconnecting in {delay:.1f} seconds.")
+            self.stop_event.wait(delay)
+            delay = min(delay * 2, self.backoff_max)
+
+    def _read(self, capture):
+        """Grab frames until the stream fails or the source is stopped. Returns True if any frame was read."""
+        read_any = False
+        next_due = time.monotonic()
+        while not self.stop_event.is_set():
+            if not capture.grab():
+                return read_any
+            read_any = True
+            self.grabbed += 1
+            now = time.monotonic()
+            if now < next_due:
+                continue
+
+            timestamp = datetime.now()
+            ok, image = capture.retrieve()
+            if not ok:
+                return read_any
+            self.decoded += 1
+            # Stay on the fps grid without drifting when decoding runs late
+            next_due = max(next_due + self.interval, now)
+            self.emit(FrameData(image=image, index=self.grabbed, camera_id=self.camera_id, timestamp=timestamp))
+        return read_any
+
+    def stop(self):
+        self.stop_event.set()
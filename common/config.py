@@ -1,12 +1,20 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import yaml  # type: ignore
+from capture.motion import MotionConfig
+from capture.schedule import ScheduleConfig
+from pose_estimation.config import SessionConfig, variant_model_path
+from pose_estimation.frame_policy import QueuePolicy
+from pose_estimation.roi import RoiConfig
+from pose_estimation.scheduler import SchedulerConfig
 
 from kit.dbx import DBConfig
 from kit.mqx import RabbitMQConfig
 
+from .frame_buffer import FrameRingConfig
+
 
 @dataclass
 class Config:
@@ -16,12 +24,49 @@ class Config:
     model_path: str
     org_id: str
     message_queue: RabbitMQConfig
+    capture_fps: float = 5.0  # Frames decoded per second and camera
+    motion: MotionConfig = field(default_factory=MotionConfig)
+    schedule: ScheduleConfig = field(default_factory=ScheduleConfig)
+    pose_queue: QueuePolicy = field(default_factory=QueuePolicy)
+    pose_session: SessionConfig = field(default_factory=SessionConfig)
+    pose_roi: RoiConfig = field(default_factory=RoiConfig)
+    frame_scheduler: SchedulerConfig = field(default_factory=SchedulerConfig)
+    model_precision: str = "fp32"  # fp32, fp16 or int8 variant of model_path
+    pose_workers: int = 1  # Pose estimation processes; more than one runs a PoseEstimationPool
+    frame_ring: FrameRingConfig = field(default_factory=FrameRingConfig)
+    face_model_path: str | None = None  # Face embedding model; enables recognition against the org's encodings
 
     def __post_init__(self):
         if isinstance(self.db, dict):
             self.db = DBConfig(**self.db)
         if isinstance(self.message_queue, dict):
             self.message_queue = RabbitMQConfig(**self.message_queue)
+        if isinstance(self.motion, dict):
+            self.motion = MotionConfig(**self.motion)
+        if isinstance(self.schedule, dict):
+            self.schedule = ScheduleConfig(**self.schedule)
+        if isinstance(self.pose_queue, dict):
+            self.pose_queue = QueuePolicy(**self.pose_queue)
+        if isinstance(self.pose_session, dict):
+            self.pose_session = SessionConfig(**self.pose_session)
+        if isinstance(self.pose_roi, dict):
+            self.pose_roi = RoiConfig(**self.pose_roi)
+        if isinstance(self.frame_scheduler, dict):
+            self.frame_scheduler = SchedulerConfig(**self.frame_scheduler)
+        if isinstance(self.frame_ring, dict):
+            self.frame_ring = FrameRingConfig(**self.frame_ring)
+
+        # The scheduler only thins out frames capture already decoded, it cannot ask for more
+        scheduler = self.frame_scheduler
+        if scheduler.enabled and self.capture_fps and scheduler.max_fps > self.capture_fps:
+            raise ValueError(
+                f"frame_scheduler.max_fps ({scheduler.max_fps}) exceeds capture_fps ({self.capture_fps}); cameras "
+                "are decoded at capture_fps, so the scheduler cannot raise them above it"
+            )
+
+    def pose_model_path(self) -> str:
+        """Path of the pose model variant selected by model_precision."""
+        return variant_model_path(self.model_path, self.model_precision)
 
 
 def read_config(path: str) -> Config:
@@ -0,0 +1,131 @@
+import multiprocessing
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .frame_data import FrameData
+
+
+@dataclass
+class FrameRingConfig:
+    """Shared-memory ring between capture and the stages that read pixels."""
+
+    enabled: bool = True
+    num_slots: int = 32  # Frames in flight across all cameras; capture drops frames while all are in use
+    max_width: int = 1920  # Largest frame the slots can hold
+    max_height: int = 1080
+
+    def max_shape(self) -> tuple[int, int, int]:
+        return self.max_height, self.max_width, 3
+
+
+@dataclass
+class FrameSlot:
+    """Location of a frame's pixels inside a SharedFrameRing."""
+
+    slot: int
+    shape: tuple[int, ...]
+
+
+class SharedFrameRing:
+    """
+    Fixed ring of frame slots in shared memory.
+
+    The producer copies each captured image into a free slot once and sends a FrameData whose pixels are
+    not pickled (see FrameData.__getstate__); consumers map the slot back into an ndarray without copying.
+    A slot stays reserved until `release` is called, so when consumers fall behind the producer blocks or
+    drops frames instead of overwriting unread ones.
+
+    Every slot is released exactly once: by the last stage that reads the frame's pixels, before it forwards
+    the frame (PoseEstimationService, or FaceRecognitionService when pose estimation runs with
+    `release_frames=False`), or by whichever stage discards the frame first. Frames forwarded after their
+    slot was released carry no image.
+    """
+
+    def __init__(self, num_slots, max_shape, name=None):
+        self.num_slots = num_slots
+        self.max_shape = tuple(max_shape)
+        self.slot_size = int(np.prod(self.max_shape))
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=self.slot_size * num_slots)
+        # A semaphore counting free slots plus a flag per slot, so a slot released by one process is
+        # immediately visible to the others (a Queue hands items over through a background feeder thread)
+        self.available = multiprocessing.Semaphore(num_slots)
+        self.in_use = multiprocessing.Array("b", num_slots)
+        self.dropped = multiprocessing.Value("i", 0)
+        self._owner = True
+        self._buffer = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["shm"] = self.shm.name
+        state["_owner"] = False
+        state["_buffer"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.shm = shared_memory.SharedMemory(name=state["shm"])
+
+    @property
+    def buffer(self):
+        if self._buffer is None:
+            self._buffer = np.ndarray((self.num_slots, self.slot_size), dtype=np.uint8, buffer=self.shm.buf)
+        return self._buffer
+
+    def fits(self, image) -> bool:
+        """True if `image` fits in a slot."""
+        return image.size <= self.slot_size
+
+    def put(self, image, index, timestamp=None, timeout=None):
+        """
+        Copy an image into a free slot.
+        Parameters:
+            image (np.array): uint8 image no larger than max_shape.
+            index (int): Frame index.
+            timestamp (datetime): Capture time, defaults to now.
+            timeout (float): Seconds to wait for a free slot; None blocks, 0 drops immediately.
+        Returns:
+            FrameData | None: Frame backed by the slot, or None if no slot freed up in time.
+        """
+        if not self.fits(image):
+            raise ValueError(f"Frame of shape {image.shape} does not fit in slots of shape {self.max_shape}")
+        if not self.available.acquire(block=timeout != 0, timeout=timeout or None):
+            with self.dropped.get_lock():
+                self.dropped.value += 1
+            return None
+        with self.in_use.get_lock():
+            slot = self.in_use[:].index(0)
+            self.in_use[slot] = 1
+
+        view = self.buffer[slot, : image.size].reshape(image.shape)
+        np.copyto(view, image)
+        frame_data = FrameData(image=view, index=index, frame_slot=FrameSlot(slot, image.shape))
+        if timestamp is not None:
+            frame_data.timestamp = timestamp
+        return frame_data
+
+    def attach(self, frame_data: FrameData) -> FrameData:
+        """Point a received FrameData's image back at its slot, without copying."""
+        frame_slot = frame_data.frame_slot
+        if frame_slot is not None and frame_data.image is None:
+            size = int(np.prod(frame_slot.shape))
+            frame_data.image = self.buffer[frame_slot.slot, :size].reshape(frame_slot.shape)
+        return frame_data
+
+    def release(self, frame_data: FrameData):
+        """Return a frame's slot to the ring. The frame's image must not be used afterwards."""
+        frame_slot = frame_data.frame_slot
+        if frame_slot is not None:
+            frame_data.image = None
+            frame_data.frame_slot = None
+            with self.in_use.get_lock():
+                self.in_use[frame_slot.slot] = 0
+            self.available.release()
+
+    def close(self):
+        """Detach from the shared memory; the creating process also frees it."""
+        self._buffer = None
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
@@ -1,13 +1,17 @@
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
-import cv2
 import numpy as np
 from constants import PoseEstimationServiceConstants
-from pose_estimation.pose_connections import POSE_CONNECTIONS
 
-from .person import Person
+from .person import Person, PersonBatch
+from .renderer import OverlayRenderer
+
+if TYPE_CHECKING:
+    from .frame_buffer import FrameSlot
+
+_RENDERERS: dict[float, OverlayRenderer] = {}
 
 
 @dataclass
@@ -15,13 +19,45 @@ class FrameData:
     image: np.ndarray
     index: int
     timestamp: datetime = field(default_factory=datetime.now)
-    persons: list[Person] = field(default_factory=list)
-    rois: list[tuple[int, int, int, int]] = field(default_factory=list)
+    people: PersonBatch = field(default_factory=PersonBatch)  # Columnar data of every detected person
+    rois: list[tuple[int, int, int, int]] = field(default_factory=list)  # (x, y, width, height), e.g. motion
     key_conf_th: float = PoseEstimationServiceConstants.KEYPOINT_CONF_THRESHOLD
+    frame_slot: "FrameSlot | None" = None  # Set when the image lives in a SharedFrameRing
+    camera_id: int | str | None = None  # Entry of Config.camera_sources the frame came from
+    sequence: int | None = None  # Per-camera dispatch order, set by PoseEstimationPool
+
+    def __getstate__(self):
+        """Leave shared-memory pixels out of the pickle; the receiver re-attaches them from the ring."""
+        state = self.__dict__.copy()
+        if self.frame_slot is not None:
+            state["image"] = None
+        return state
+
+    @property
+    def persons(self) -> list[Person]:
+        """
+        Per-person views over `people`. Edits to a person (e.g. `person.track_id = 3`) are stored in the batch,
+        but the list itself is rebuilt on every access, so appending to or removing from it changes nothing: use
+        add_person, or assign a new list to `persons`.
+        """
+        return list(self.people)
+
+    @persons.setter
+    def persons(self, persons: list[Person]):
+        """Replace all persons of the frame. The persons become views into the frame's new batch."""
+        self.people = PersonBatch()
+        for person in persons:
+            self.add_person(person)
 
     def add_person(self, person: Person):
-        """Add a detected person to the frame."""
-        self.persons.append(person)
+        """Add a detected person to the frame. The person becomes a view into the frame's batch."""
+        index = len(self.people)
+        self.people.extend(person.batch.take([person.index]))
+        person.batch, person.index = self.people, index
+
+    def set_people(self, people: PersonBatch):
+        """Replace all persons of the frame at once."""
+        self.people = people
 
     def draw_persons(self, scale_x=1, scale_y=1):
         """
@@ -32,130 +68,30 @@ class FrameData:
         Returns:
             np.array: The image with bounding boxes and keypoints drawn.
         """
-        frame = self.image.copy()
-
-        for person in self.persons:
-            bbox = person.bbox
-            face_bbox = person.face_bbox
-            user = person.user
-            iou_track_id = person.track_id
-            confidence = person.confidence
-            keypoints = person.keypoints
-
-            # Draw bounding box
-            x_min, y_min, x_max, y_max = bbox
-            x_min, x_max = int(x_min * scale_x), int(x_max * scale_x)
-            y_min, y_max = int(y_min * scale_y), int(y_max * scale_y)
-            cv2.rectangle(frame, (x_min, y_min), (x_max, y_max), (0, 255, 0), 4)
-            cv2.putText(
-                frame, str(iou_track_id), (x_min + 6, y_min + 29), cv2.FONT_HERSHEY_DUPLEX, 0.7, (255, 255, 255), 1
-            )
-
-            # Draw keypoints
-            if person.head_bbox:
-                x_min, y_min, x_max, y_max = person.head_bbox
-                orientation = person.head_orientation
-                cv2.rectangle(frame, (x_min, y_min), (x_max, y_max), (0, 0, 255), 4)
-                cv2.putText(
-                    frame, orientation, (x_min + 6, y_min + 29), cv2.FONT_HERSHEY_DUPLEX, 0.7, (255, 255, 255), 1
-                )
-
-            for x, y, keypoint_confidence in keypoints:
-                if keypoint_confidence > self.key_conf_th:  # Only draw keypoints with high confidence
-                    x, y = int(x * scale_x), int(y * scale_y)
-                    cv2.circle(frame, (x, y), 3, (0, 0, 255), -1)
-
-            # Draw connections
-            for start, end in POSE_CONNECTIONS:
-                if keypoints[start][2] > self.key_conf_th and keypoints[end][2] > self.key_conf_th:
-                    pt1 = (int(keypoints[start][0] * scale_x), int(keypoints[start][1] * scale_y))
-                    pt2 = (int(keypoints[end][0] * scale_x), int(keypoints[end][1] * scale_y))
-                    cv2.line(frame, pt1, pt2, (255, 0, 0), 4)
-            if face_bbox:
-                x_min, y_min, x_max, y_max = face_bbox
-                cv2.rectangle(frame, (x_min, y_min), (x_max, y_max), (255, 0, 0), 4)
-                if person.user:
-                    cv2.putText(
-                        frame,
-                        user.user_name + " " + str(confidence),
-                        (x_min + 6, y_min + 29),
-                        cv2.FONT_HERSHEY_DUPLEX,
-                        0.7,
-                        (255, 255, 255),
-                        1,
-                    )
-
-        return frame
+        return self.renderer().render(self, coord_scale=(scale_x, scale_y), reuse=False)
 
     def draw_person(self, user_id, scale_x=1, scale_y=1):
         """
-        Draw bounding boxes and keypoints on the frame.
+        Draw bounding boxes and keypoints of the person identified as `user_id` on the frame.
         Parameters:
+            user_id (str): Id of the user to draw.
             scale_x (float): Scale factor for x coordinates.
             scale_y (float): Scale factor for y coordinates.
         Returns:
             np.array: The image with bounding boxes and keypoints drawn.
         """
-        frame = self.image.copy()
-
-        for person in self.persons:
-            person_user_id = ""
-            if person.user:
-                person_user_id = person.user.id
-            if person_user_id == user_id:
-                bbox = person.bbox
-                face_bbox = person.face_bbox
-                iou_track_id = person.track_id
-                confidence = person.confidence
-                keypoints = person.keypoints
-                # Draw bounding box
-                x_min, y_min, x_max, y_max = bbox
-                x_min, x_max = int(x_min * scale_x), int(x_max * scale_x)
-                y_min, y_max = int(y_min * scale_y), int(y_max * scale_y)
-                cv2.rectangle(frame, (x_min, y_min), (x_max, y_max), (0, 255, 0), 4)
-                cv2.putText(
-                    frame, str(iou_track_id), (x_min + 6, y_min + 29), cv2.FONT_HERSHEY_DUPLEX, 0.7, (255, 255, 255), 1
-                )
-
-                # Draw keypoints
-                if person.head_bbox:
-                    x_min, y_min, x_max, y_max = person.head_bbox
-                    orientation = person.head_orientation
-                    cv2.rectangle(frame, (x_min, y_min), (x_max, y_max), (0, 0, 255), 4)
-                    cv2.putText(
-                        frame, orientation, (x_min + 6, y_min + 29), cv2.FONT_HERSHEY_DUPLEX, 0.7, (255, 255, 255), 1
-                    )
-
-                for x, y, keypoint_confidence in keypoints:
-                    if keypoint_confidence > self.key_conf_th:  # Only draw keypoints with high confidence
-                        x, y = int(x * scale_x), int(y * scale_y)
-                        cv2.circle(frame, (x, y), 3, (0, 0, 255), -1)
-
-                # Draw connections
-                for start, end in POSE_CONNECTIONS:
-                    if keypoints[start][2] > self.key_conf_th and keypoints[end][2] > self.key_conf_th:
-                        pt1 = (int(keypoints[start][0] * scale_x), int(keypoints[start][1] * scale_y))
-                        pt2 = (int(keypoints[end][0] * scale_x), int(keypoints[end][1] * scale_y))
-                        cv2.line(frame, pt1, pt2, (255, 0, 0), 4)
-                if face_bbox:
-                    x_min, y_min, x_max, y_max = face_bbox
-                    cv2.rectangle(frame, (x_min, y_min), (x_max, y_max), (255, 0, 0), 4)
-                    if person.user:
-                        cv2.putText(
-                            frame,
-                            person.user.user_name + " " + str(confidence),
-                            (x_min + 6, y_min + 29),
-                            cv2.FONT_HERSHEY_DUPLEX,
-                            0.7,
-                            (255, 255, 255),
-                            1,
-                        )
-
-        return frame
+        return self.renderer().render(self, user_id=user_id, coord_scale=(scale_x, scale_y), reuse=False)
+
+    def renderer(self) -> OverlayRenderer:
+        """Shared renderer for this frame's keypoint confidence threshold."""
+        renderer = _RENDERERS.get(self.key_conf_th)
+        if renderer is None:
+            renderer = _RENDERERS[self.key_conf_th] = OverlayRenderer(self.key_conf_th)
+        return renderer
 
     def get_image(self):
         """Return the image from the frame data."""
         return self.image
 
     def __repr__(self):
-        return f"FrameData(timestamp={self.timestamp}, num_persons={len(self.persons)})"
+        return f"FrameData(timestamp={self.timestamp}, num_persons={len(self.people)})"
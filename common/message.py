@@ -11,3 +11,4 @@ class NotificationMessage:
     actor_ids: list[str] | None = None
     image: str | None = None
     timestamp: str | None = None
+    camera_id: str | None = None
@@ -1,19 +1,178 @@
 from dataclasses import dataclass, field
 
+import numpy as np
+
 from .models import UserAccount
 
+NUM_KEYPOINTS = 17
+
 
 @dataclass
+class PersonBatch:
+    """
+    Columnar storage for all persons detected in a frame.
+
+    Numeric detection data lives in contiguous arrays so detectors can run vectorized over every person and
+    a frame pickles as a few buffers. Sparse per-person annotations (identity, face, head) are plain lists.
+    """
+
+    bboxes: np.ndarray = field(default_factory=lambda: np.zeros((0, 4), dtype=np.int32))  # (P, 4) xyxy
+    keypoints: np.ndarray = field(
+        default_factory=lambda: np.zeros((0, NUM_KEYPOINTS, 3), dtype=np.float32)
+    )  # (P, 17, 3) x, y, confidence
+    confidences: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float32))  # (P,)
+    track_ids: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))  # (P,), -1 if untracked
+    users: list[UserAccount | None] = field(default_factory=list)
+    face_bboxes: list[tuple[int, int, int, int] | None] = field(default_factory=list)
+    face_confidences: list[float | None] = field(default_factory=list)
+    head_bboxes: list[tuple[int, int, int, int] | None] = field(default_factory=list)
+    head_orientations: list[str | None] = field(default_factory=list)
+
+    @classmethod
+    def from_arrays(cls, bboxes, keypoints, confidences, track_ids=None):
+        """Build a batch from (P, 4) boxes, (P, 17, 3) keypoints and (P,) confidences."""
+        count = len(confidences)
+        return cls(
+            bboxes=np.asarray(bboxes, dtype=np.int32).reshape(count, 4),
+            keypoints=np.asarray(keypoints, dtype=np.float32).reshape(count, -1, 3),
+            confidences=np.asarray(confidences, dtype=np.float32).reshape(count),
+            track_ids=np.full(count, -1, dtype=np.int64) if track_ids is None else np.asarray(track_ids, np.int64),
+            users=[None] * count,
+            face_bboxes=[None] * count,
+            face_confidences=[None] * count,
+            head_bboxes=[None] * count,
+            head_orientations=[None] * count,
+        )
+
+    @classmethod
+    def from_detections(cls, detections):
+        """Build a batch from the (bbox, keypoints, confidence) tuples returned by PoseModel.get_poses."""
+        if not detections:
+            return cls()
+        bboxes, keypoints, confidences = zip(*detections)
+        return cls.from_arrays(np.array(bboxes), np.stack(keypoints), np.array(confidences))
+
+    def __len__(self):
+        return len(self.confidences)
+
+    def __getitem__(self, index):
+        return Person.view(self, index)
+
+    def __iter__(self):
+        return (Person.view(self, index) for index in range(len(self)))
+
+    def take(self, indices) -> "PersonBatch":
+        """Return a new batch holding copies of the selected persons."""
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+        picked = indices.tolist()
+        return PersonBatch(
+            bboxes=self.bboxes[indices],
+            keypoints=self.keypoints[indices],
+            confidences=self.confidences[indices],
+            track_ids=self.track_ids[indices],
+            users=[self.users[i] for i in picked],
+            face_bboxes=[self.face_bboxes[i] for i in picked],
+            face_confidences=[self.face_confidences[i] for i in picked],
+            head_bboxes=[self.head_bboxes[i] for i in picked],
+            head_orientations=[self.head_orientations[i] for i in picked],
+        )
+
+    def extend(self, other: "PersonBatch"):
+        """Append every person of another batch."""
+        self.bboxes = np.concatenate((self.bboxes, other.bboxes))
+        self.keypoints = np.concatenate((self.keypoints, other.keypoints))
+        self.confidences = np.concatenate((self.confidences, other.confidences))
+        self.track_ids = np.concatenate((self.track_ids, other.track_ids))
+        self.users.extend(other.users)
+        self.face_bboxes.extend(other.face_bboxes)
+        self.face_confidences.extend(other.face_confidences)
+        self.head_bboxes.extend(other.head_bboxes)
+        self.head_orientations.extend(other.head_orientations)
+
+
 class Person:
-    bbox: tuple[int, int, int, int]
-    confidence: float
-    keypoints: list[tuple[int, int, float]]
-    track_id: int | None = None
-    user: UserAccount | None = None
-    face_bbox: tuple[int, int, int, int] | None = None
-    face_confidence: float | None = None
-    head_bbox: tuple[int, int, int, int] | None = None
-    head_orientation: str | None = None
+    """Lightweight view of one person in a PersonBatch. Reads and writes go straight to the batch."""
+
+    __slots__ = ("batch", "index")
+
+    def __init__(
+        self,
+        bbox: tuple[int, int, int, int],
+        confidence: float,
+        keypoints: list[tuple[int, int, float]],
+        track_id: int | None = None,
+        user: UserAccount | None = None,
+        face_bbox: tuple[int, int, int, int] | None = None,
+        face_confidence: float | None = None,
+        head_bbox: tuple[int, int, int, int] | None = None,
+        head_orientation: str | None = None,
+    ):
+        # A standalone person is backed by its own one-row batch until added to a frame
+        self.batch = PersonBatch.from_arrays([bbox], [keypoints], [confidence])
+        self.index = 0
+        self.track_id = track_id
+        self.set_face(user, face_bbox, face_confidence)
+        self.set_head(head_orientation, head_bbox)
+
+    @classmethod
+    def view(cls, batch: PersonBatch, index: int) -> "Person":
+        person = cls.__new__(cls)
+        person.batch = batch
+        person.index = index
+        return person
+
+    @property
+    def bbox(self) -> tuple[int, int, int, int]:
+        return tuple(self.batch.bboxes[self.index].tolist())
+
+    @bbox.setter
+    def bbox(self, bbox):
+        self.batch.bboxes[self.index] = bbox
+
+    @property
+    def confidence(self) -> float:
+        return float(self.batch.confidences[self.index])
+
+    @confidence.setter
+    def confidence(self, confidence):
+        self.batch.confidences[self.index] = confidence
+
+    @property
+    def keypoints(self) -> np.ndarray:
+        return self.batch.keypoints[self.index]
+
+    @keypoints.setter
+    def keypoints(self, keypoints):
+        self.batch.keypoints[self.index] = keypoints
+
+    @property
+    def track_id(self) -> int | None:
+        track_id = int(self.batch.track_ids[self.index])
+        return track_id if track_id >= 0 else None
+
+    @track_id.setter
+    def track_id(self, track_id):
+        self.batch.track_ids[self.index] = -1 if track_id is None else track_id
+
+    @property
+    def user(self) -> UserAccount | None:
+        return self.batch.users[self.index]
+
+    @property
+    def face_bbox(self) -> tuple[int, int, int, int] | None:
+        return self.batch.face_bboxes[self.index]
+
+    @property
+    def face_confidence(self) -> float | None:
+        return self.batch.face_confidences[self.index]
+
+    @property
+    def head_bbox(self) -> tuple[int, int, int, int] | None:
+        return self.batch.head_bboxes[self.index]
+
+    @property
+    def head_orientation(self) -> str | None:
+        return self.batch.head_orientations[self.index]
 
     def set_face(self, user: UserAccount, face_bbox: tuple[int, int, int, int], face_confidence: float):
         """
@@ -23,9 +182,9 @@ class Person:
             face_bbox (tuple): Bounding box of the face in the frame (x_min, y_min, x_max, y_max).
             face_confidence (float): Confidence score of the face detection.
         """
-        self.user = user
-        self.face_bbox = face_bbox
-        self.face_confidence = face_confidence
+        self.batch.users[self.index] = user
+        self.batch.face_bboxes[self.index] = face_bbox
+        self.batch.face_confidences[self.index] = face_confidence
 
     def set_head(self, head_orientation: str, head_bbox: tuple[int, int, int, int]):
         """
@@ -34,11 +193,12 @@ class Person:
             orientation (str): Face orientation.
             head_bbox (tuple): Bounding box of the head in the frame (x_min, y_min, x_max, y_max).
         """
-        self.head_orientation = head_orientation
-        self.head_bbox = head_bbox
+        self.batch.head_orientations[self.index] = head_orientation
+        self.batch.head_bboxes[self.index] = head_bbox
 
     def __repr__(self):
+        user_name = self.user.user_name if self.user else None
         return (
             f"Person(bbox={self.bbox}, confidence={self.confidence}, track_id={self.track_id}, "
-            f"user_name={self.user.user_name}, face_bbox={self.face_bbox}, face_confidence={self.face_confidence})"
+            f"user_name={user_name}, face_bbox={self.face_bbox}, face_confidence={self.face_confidence})"
         )
@@ -0,0 +1,130 @@
+import cv2
+import numpy as np
+from pose_estimation.pose_connections import POSE_CONNECTIONS
+
+from .person import PersonBatch
+
+BBOX_COLOR = (0, 255, 0)
+HEAD_COLOR = (0, 0, 255)
+FACE_COLOR = (255, 0, 0)
+KEYPOINT_COLOR = (0, 0, 255)
+SKELETON_COLOR = (255, 0, 0)
+TEXT_COLOR = (255, 255, 255)
+
+
+class OverlayRenderer:
+    """
+    Draws person overlays (boxes, skeletons, head/face boxes and labels) onto frames.
+
+    The output image is written into a reusable buffer per output size, skeleton edges of a person are drawn
+    with one cv2.polylines call from a precomputed connection index array, and all keypoints of a frame are
+    drawn with one more call. Frames can be rendered downscaled, e.g. for notification thumbnails.
+    """
+
+    def __init__(self, key_conf_th, connections=POSE_CONNECTIONS, thickness=4, keypoint_radius=3):
+        self.key_conf_th = key_conf_th
+        self.thickness = thickness
+        self.keypoint_radius = keypoint_radius
+        connections = np.asarray(connections, dtype=np.int64)
+        self.edge_starts = connections[:, 0]
+        self.edge_ends = connections[:, 1]
+        self.buffers = {}
+
+    def _output(self, image, size, reuse):
+        """Copy or resize the image into the output buffer for `size` (width, height)."""
+        height, width = size[1], size[0]
+        if reuse:
+            out = self.buffers.get((height, width, image.dtype))
+            if out is None:
+                out = self.buffers[(height, width, image.dtype)] = np.empty((height, width, 3), dtype=image.dtype)
+        else:
+            out = np.empty((height, width, 3), dtype=image.dtype)
+        if (height, width) == image.shape[:2]:
+            np.copyto(out, image)
+        else:
+            cv2.resize(image, (width, height), dst=out, interpolation=cv2.INTER_AREA)
+        return out
+
+    def select(self, people: PersonBatch, user_id=None, track_ids=None):
+        """Indices of the persons matching a user id and/or a collection of track ids."""
+        mask = np.ones(len(people), dtype=bool)
+        if user_id is not None:
+            mask &= np.array([user is not None and user.id == user_id for user in people.users], dtype=bool)
+        if track_ids is not None:
+            mask &= np.isin(people.track_ids, np.asarray(list(track_ids), dtype=np.int64))
+        return np.flatnonzero(mask)
+
+    def render(self, frame_data, user_id=None, track_ids=None, scale=1.0, coord_scale=(1, 1), reuse=True):
+        """
+        Draw persons of a frame.
+        Parameters:
+            frame_data (FrameData): Frame to draw.
+            user_id (str): Only draw the person identified as this user.
+            track_ids (list): Only draw persons with these track ids.
+            scale (float): Output size relative to the frame, e.g. 0.25 for thumbnails.
+            coord_scale (tuple): Extra (x, y) factors for coordinates stored at a different resolution.
+            reuse (bool): Write into the renderer's buffer, which the next call overwrites.
+        Returns:
+            np.array: The image with overlays drawn.
+        """
+        image = frame_data.image
+        size = (round(image.shape[1] * scale), round(image.shape[0] * scale))
+        out = self._output(image, size, reuse)
+
+        people = frame_data.people
+        selected = self.select(people, user_id, track_ids)
+        if selected.size == 0:
+            return out
+        factors = np.array([coord_scale[0] * scale, coord_scale[1] * scale], dtype=np.float32)
+        bboxes = (people.bboxes[selected].reshape(-1, 2, 2) * factors).astype(np.int32).reshape(-1, 4)
+        keypoints = people.keypoints[selected]
+        points = (keypoints[:, :, :2] * factors).astype(np.int32)
+        visible = keypoints[:, :, 2] > self.key_conf_th
+
+        # Skeleton: one polylines call per person over its visible edges
+        edge_visible = visible[:, self.edge_starts] & visible[:, self.edge_ends]
+        edges = np.stack((points[:, self.edge_starts], points[:, self.edge_ends]), axis=2)  # (P, E, 2, 2)
+        for person_edges, person_visible in zip(edges, edge_visible):
+            if person_visible.any():
+                cv2.polylines(out, list(person_edges[person_visible]), False, SKELETON_COLOR, self.thickness)
+
+        # Keypoints: zero-length round-capped segments render as filled dots, all in one call
+        dots = points[visible]
+        if dots.size:
+            cv2.polylines(
+                out, list(np.repeat(dots[:, None, :], 2, axis=1)), False, KEYPOINT_COLOR, 2 * self.keypoint_radius
+            )
+
+        for row, (x_min, y_min, x_max, y_max) in zip(selected.tolist(), bboxes.tolist()):
+            cv2.rectangle(out, (x_min, y_min), (x_max, y_max), BBOX_COLOR, self.thickness)
+            track_id = int(people.track_ids[row])
+            self._label(out, str(track_id if track_id >= 0 else None), x_min, y_min)
+
+            head_bbox = people.head_bboxes[row]
+            if head_bbox:
+                x_min, y_min, x_max, y_max = self._scale_box(head_bbox, factors)
+                cv2.rectangle(out, (x_min, y_min), (x_max, y_max), HEAD_COLOR, self.thickness)
+                self._label(out, people.head_orientations[row], x_min, y_min)
+
+            face_bbox = people.face_bboxes[row]
+            if face_bbox:
+                x_min, y_min, x_max, y_max = self._scale_box(face_bbox, factors)
+                cv2.rectangle(out, (x_min, y_min), (x_max, y_max), FACE_COLOR, self.thickness)
+                user = people.users[row]
+                if user:
+                    self._label(out, user.user_name + " " + str(float(people.confidences[row])), x_min, y_min)
+        return out
+
+    @staticmethod
+    def _scale_box(box, factors):
+        x_min, y_min, x_max, y_max = box
+        return (
+            int(x_min * factors[0]),
+            int(y_min * factors[1]),
+            int(x_max * factors[0]),
+            int(y_max * factors[1]),
+        )
+
+    @staticmethod
+    def _label(out, text, x, y):
+        cv2.putText(out, str(text), (x + 6, y + 29), cv2.FONT_HERSHEY_DUPLEX, 0.7, TEXT_COLOR, 1)
@@ -1,6 +1,9 @@
 import logging
 import multiprocessing
 
+# Put on a service's input queue to make it exit its loop right away
+STOP_SENTINEL = None
+
 
 class ServiceBase(multiprocessing.Process):
     def __init__(self, name, *args, **kwargs):
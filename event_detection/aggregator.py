@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .events import DetectionEvent
+
+
+@dataclass
+class Incident:
+    """State of one (camera, event type, actors) key in an EventAggregator."""
+
+    last_seen: float  # Timestamp of the last qualifying event
+    hits: int = 0  # Consecutive qualifying events since the incident started rising
+    active: bool = False  # Rose above the hit threshold and has not fallen yet
+    notified_at: float | None = None  # When the last message for this key was let through
+
+
+class EventAggregator:
+    """
+    Turns a stream of per-frame DetectionEvents into one notification per incident.
+
+    Events are keyed by camera, event type and the set of track ids involved. A key rises, and its event is
+    let through, after `rise_hits` events scoring at least `rise_score`. While active, events scoring at least
+    the lower `fall_score` keep it alive; it falls once no such event arrived for `fall_seconds`. A fallen key
+    only notifies again after `cooldown_seconds` since its last notification, so a flickering detection does
+    not produce a message per flicker. At most `max_entries` keys are kept, least recently seen evicted first.
+
+    The default scores bracket the 0.6 threshold at which the lying and fighting detectors emit: an incident
+    needs confident events to start, then any event the detectors still emit keeps it alive.
+    """
+
+    def __init__(
+        self, rise_hits=3, rise_score=0.7, fall_score=0.6, fall_seconds=2.0, cooldown_seconds=60.0, max_entries=4096
+    ):
+        self.rise_hits = rise_hits
+        self.rise_score = rise_score
+        self.fall_score = min(fall_score, rise_score)
+        self.fall_seconds = fall_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.max_entries = max_entries
+        self.incidents: OrderedDict[tuple, Incident] = OrderedDict()
+        self.received = 0
+        self.suppressed = 0
+        self.evicted = 0
+
+    @staticmethod
+    def key(event: DetectionEvent) -> tuple:
+        return event.camera_id, event.event_type, frozenset(event.track_ids)
+
+    def push(self, event: DetectionEvent) -> DetectionEvent | None:
+        """
+        Fold one event into the incident table.
+        Returns:
+            DetectionEvent | None: The event when it starts a new incident and should be notified, else None.
+        """
+        self.received += 1
+        now = event.timestamp.timestamp()
+        key = self.key(event)
+        incident = self.incidents.get(key)
+        if incident is None:
+            incident = self.incidents[key] = Incident(last_seen=now)
+            self._evict()
+        else:
+            self.incidents.move_to_end(key)
+            self._fall(incident, now)
+
+        if event.score >= (self.fall_score if incident.active else self.rise_score):
+            incident.hits += 1
+            incident.last_seen = now
+        elif not incident.active:
+            incident.hits = 0  # A weak event breaks a rising streak
+
+        if incident.active or incident.hits < self.rise_hits:
+            self.suppressed += 1
+            return None
+        incident.active = True
+        if incident.notified_at is not None and now - incident.notified_at < self.cooldown_seconds:
+            self.suppressed += 1
+            return None
+        incident.notified_at = now
+        return event
+
+    def _fall(self, incident: Incident, now: float):
+        """Reset an incident that has not seen a qualifying event for fall_seconds."""
+        if now - incident.last_seen > self.fall_seconds:
+            incident.active = False
+            incident.hits = 0
+
+    def _evict(self):
+        while len(self.incidents) > self.max_entries:
+            self.incidents.popitem(last=False)
+            self.evicted += 1
+
+    def expire(self, now: float):
+        """Drop keys that have fallen and are past their cooldown, e.g. from a periodic housekeeping call."""
+        horizon = max(self.fall_seconds, self.cooldown_seconds)
+        stale = [key for key, incident in self.incidents.items() if now - incident.last_seen > horizon]
+        for key in stale:
+            del self.incidents[key]
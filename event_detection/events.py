@@ -0,0 +1,24 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from common.models import EventType
+
+
+@dataclass
+class DetectionEvent:
+    """A detector's claim that an event is happening in a frame."""
+
+    event_type: EventType
+    camera_id: int | str | None
+    frame_index: int
+    timestamp: datetime
+    track_ids: list[int] = field(default_factory=list)  # Persons involved, main actor first
+    score: float = 1.0
+    user_ids: list[str | None] = field(default_factory=list)  # UserAccount id of each track, None if unknown
+
+    def identify(self, people):
+        """Fill `user_ids` from the users face recognition attached to the frame's persons."""
+        users = {
+            track_id: user.id for track_id, user in zip(people.track_ids.tolist(), people.users) if user is not None
+        }
+        self.user_ids = [users.get(track_id) for track_id in self.track_ids]
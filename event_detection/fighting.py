@@ -0,0 +1,174 @@
+from collections import deque
+
+import numpy as np
+from common.models import EventType
+from constants import PoseEstimationServiceConstants
+from pose_estimation.pose_connections import (
+    LEFT_ANKLE,
+    LEFT_ELBOW,
+    LEFT_HIP,
+    LEFT_KNEE,
+    LEFT_SHOULDER,
+    LEFT_WRIST,
+    RIGHT_ANKLE,
+    RIGHT_ELBOW,
+    RIGHT_HIP,
+    RIGHT_KNEE,
+    RIGHT_SHOULDER,
+    RIGHT_WRIST,
+)
+
+from .events import DetectionEvent
+from .keypoints import visible_mean
+from .smoothing import TrackSmoother
+
+LIMBS = [LEFT_WRIST, RIGHT_WRIST, LEFT_ELBOW, RIGHT_ELBOW, LEFT_ANKLE, RIGHT_ANKLE, LEFT_KNEE, RIGHT_KNEE]
+WRISTS = [LEFT_WRIST, RIGHT_WRIST]
+TORSO = [LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP]
+
+
+def limb_speeds(window, present, heights, conf_threshold=PoseEstimationServiceConstants.KEYPOINT_CONF_THRESHOLD):
+    """
+    Mean frame-to-frame limb speed of each person relative to their own torso, in body heights per frame.
+
+    Speeds are averaged over consecutive frame pairs rather than taken between the ends of the window, so
+    limbs swinging back and forth count as fast even when they end up where they started.
+    Parameters:
+        window (np.array): (W, P, 17, 3) keypoints of the same P persons over the last W frames, oldest first.
+        present (np.array): (W, P) bool whether each person was seen in each frame.
+        heights (np.array): (P,) body heights used for normalization.
+        conf_threshold (float): Minimum keypoint confidence to count as visible.
+    Returns:
+        np.array: (P,) speeds, 0 for persons without visible limbs in two consecutive frames.
+    """
+    frames, num_people = present.shape
+    torso, has_torso = visible_mean(window.reshape(frames * num_people, -1, 3), TORSO, conf_threshold)
+    torso, has_torso = torso.reshape(frames, num_people, 2), has_torso.reshape(frames, num_people)
+
+    steps = present[1:] & present[:-1]  # (W - 1, P)
+    torso_motion = np.where((steps & has_torso[1:] & has_torso[:-1])[..., None], torso[1:] - torso[:-1], 0)
+    limbs = window[:, :, LIMBS]
+    visible = (limbs[1:, :, :, 2] > conf_threshold) & (limbs[:-1, :, :, 2] > conf_threshold) & steps[..., None]
+    motion = limbs[1:, :, :, :2] - limbs[:-1, :, :, :2] - torso_motion[:, :, None, :]
+    distance = np.linalg.norm(motion, axis=3) * visible
+    return distance.sum(axis=(0, 2)) / np.maximum(visible.sum(axis=(0, 2)), 1) / heights
+
+
+def pair_scores(
+    keypoints,
+    bboxes,
+    speeds,
+    conf_threshold=PoseEstimationServiceConstants.KEYPOINT_CONF_THRESHOLD,
+    proximity=1.2,
+    speed_threshold=0.08,
+):
+    """
+    Fighting score of every pair of persons.
+
+    Pairs score high when they stand within half a body height of each other, both move their limbs fast
+    relative to their torso, and a wrist reaches towards the other's torso. A fast person next to a still one
+    only gets half the motion score, so someone waving near a bystander does not trigger.
+    Parameters:
+        keypoints (np.array): (P, 17, 3) keypoints.
+        bboxes (np.array): (P, 4) xyxy boxes.
+        speeds (np.array): (P,) limb speeds from `limb_speeds`.
+        conf_threshold (float): Minimum keypoint confidence to count as visible.
+        proximity (float): Center distance, in mean body heights of the pair, at which proximity scores 0.
+        speed_threshold (float): Limb speed, in body heights per frame, at which motion scores 1.
+    Returns:
+        tuple: ((K,) first person indices, (K,) second person indices, (K,) scores) over all pairs i < j.
+    """
+    bboxes = bboxes.astype(np.float32)
+    heights = np.maximum(bboxes[:, 3] - bboxes[:, 1], 1)
+    centers = (bboxes[:, :2] + bboxes[:, 2:]) / 2
+    first, second = np.triu_indices(len(bboxes), k=1)
+
+    scale = (heights[first] + heights[second]) / 2
+    distance = np.linalg.norm(centers[first] - centers[second], axis=1)
+    proximity_score = np.clip((proximity - distance / scale) / (proximity - 0.5), 0, 1)
+
+    moving = np.clip(speeds / speed_threshold, 0, 1)
+    motion_score = (moving[first] + moving[second]) / 2
+
+    # Closest visible wrist of either person to the other's torso, in body heights
+    torso, has_torso = visible_mean(keypoints, TORSO, conf_threshold)
+    wrists = keypoints[:, WRISTS]
+    wrist_visible = wrists[:, :, 2] > conf_threshold
+    to_second = np.linalg.norm(wrists[first, :, :2] - torso[second, None, :], axis=2)
+    to_first = np.linalg.norm(wrists[second, :, :2] - torso[first, None, :], axis=2)
+    reach = np.minimum(
+        np.where(wrist_visible[first] & has_torso[second, None], to_second, np.inf).min(axis=1),
+        np.where(wrist_visible[second] & has_torso[first, None], to_first, np.inf).min(axis=1),
+    )
+    reach_score = np.clip(1 - reach / (0.5 * scale), 0, 1)
+
+    return first, second, proximity_score * motion_score * (0.6 + 0.4 * reach_score)
+
+
+class FightingDetector:
+    """
+    Emits FIGHTING events for pairs of tracked persons that stay close while moving their limbs fast.
+
+    Each camera keeps a sliding window of the last `window` frames of track ids and keypoints. Limb speeds
+    of all persons and features of all person pairs are computed as batched array operations, and pair scores
+    are smoothed per pair of tracks.
+    """
+
+    def __init__(self, window=5, threshold=0.6, min_frames=5, alpha=0.3, max_age=25, proximity=1.2, speed=0.08):
+        self.window = window
+        self.threshold = threshold
+        self.min_frames = min_frames
+        self.alpha = alpha
+        self.max_age = max_age
+        self.proximity = proximity
+        self.speed = speed
+        self.history = {}  # camera_id -> deque of (sorted track ids, keypoints in that order)
+        self.smoothers = {}  # camera_id -> TrackSmoother over pair keys
+
+    def process(self, frame_data):
+        """Return a DetectionEvent for every pair of persons detected fighting in the frame."""
+        people = frame_data.people
+        tracked = np.flatnonzero(people.track_ids >= 0)
+        camera_id = frame_data.camera_id
+        history = self.history.get(camera_id)
+        if history is None:
+            history = self.history[camera_id] = deque(maxlen=self.window)
+            self.smoothers[camera_id] = TrackSmoother(self.alpha, self.max_age)
+
+        order = tracked[np.argsort(people.track_ids[tracked])]
+        track_ids = people.track_ids[order]
+        keypoints = people.keypoints[order]
+        bboxes = people.bboxes[order]
+        history.append((track_ids, keypoints))
+        if track_ids.size < 2 or len(history) < 2:
+            return []
+
+        # Align every frame of the window to the current persons with one sorted lookup per frame
+        window = np.zeros((len(history),) + keypoints.shape, dtype=np.float32)
+        present = np.zeros((len(history), track_ids.size), dtype=bool)
+        for step, (past_ids, past_keypoints) in enumerate(history):
+            if past_ids.size:
+                position = np.minimum(np.searchsorted(past_ids, track_ids), past_ids.size - 1)
+                matched = past_ids[position] == track_ids
+                window[step, matched] = past_keypoints[position[matched]]
+                present[step] = matched
+
+        conf_threshold = frame_data.key_conf_th
+        heights = np.maximum(bboxes[:, 3] - bboxes[:, 1], 1).astype(np.float32)
+        speeds = limb_speeds(window, present, heights, conf_threshold)
+        first, second, scores = pair_scores(keypoints, bboxes, speeds, conf_threshold, self.proximity, self.speed)
+
+        pair_keys = (track_ids[first] << 32) | track_ids[second]
+        smoothed, counts = self.smoothers[camera_id].update(pair_keys, scores)
+        fighting = np.flatnonzero((smoothed >= self.threshold) & (counts >= self.min_frames))
+        return [
+            DetectionEvent(
+                event_type=EventType.FIGHTING,
+                camera_id=camera_id,
+                frame_index=frame_data.index,
+                timestamp=frame_data.timestamp,
+                track_ids=[int(track_ids[first[k]]), int(track_ids[second[k]])],
+                score=float(smoothed[k]),
+            )
+            for k in fighting.tolist()
+        ]
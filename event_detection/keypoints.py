@@ -0,0 +1,19 @@
+import numpy as np
+
+
+def visible_mean(keypoints, indices, conf_threshold):
+    """
+    Mean position of the visible keypoints among `indices`, for every person at once.
+    Parameters:
+        keypoints (np.array): (P, 17, 3) keypoints.
+        indices (list): Keypoint indices to average, e.g. both shoulders.
+        conf_threshold (float): Minimum keypoint confidence to count as visible.
+    Returns:
+        tuple: ((P, 2) mean positions, (P,) bool whether any of the keypoints was visible).
+    """
+    selected = keypoints[:, indices]
+    visible = selected[:, :, 2] > conf_threshold
+    count = visible.sum(axis=1)
+    total = (selected[:, :, :2] * visible[:, :, None]).sum(axis=1)
+    mean = total / np.maximum(count, 1)[:, None]
+    return mean, count > 0
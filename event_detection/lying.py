@@ -0,0 +1,81 @@
+import numpy as np
+from common.models import EventType
+from constants import PoseEstimationServiceConstants
+from pose_estimation.pose_connections import LEFT_HIP, LEFT_SHOULDER, RIGHT_HIP, RIGHT_SHOULDER
+
+from .events import DetectionEvent
+from .keypoints import visible_mean
+from .smoothing import TrackSmoother
+
+
+def lying_scores(keypoints, bboxes, conf_threshold=PoseEstimationServiceConstants.KEYPOINT_CONF_THRESHOLD):
+    """
+    Score how much each person looks like they are lying down, in [0, 1].
+
+    Combines the torso angle from vertical, how flat the shoulders and hips are relative to the body height,
+    and the bounding box aspect ratio. Persons without visible torso keypoints are scored on aspect ratio only.
+    Parameters:
+        keypoints (np.array): (P, 17, 3) keypoints.
+        bboxes (np.array): (P, 4) xyxy boxes.
+        conf_threshold (float): Minimum keypoint confidence to count as visible.
+    Returns:
+        np.array: (P,) scores.
+    """
+    bboxes = bboxes.astype(np.float32)
+    width = np.maximum(bboxes[:, 2] - bboxes[:, 0], 1)
+    height = np.maximum(bboxes[:, 3] - bboxes[:, 1], 1)
+    aspect_score = np.clip((width / height - 0.8) / 0.7, 0, 1)
+
+    shoulders, has_shoulders = visible_mean(keypoints, [LEFT_SHOULDER, RIGHT_SHOULDER], conf_threshold)
+    hips, has_hips = visible_mean(keypoints, [LEFT_HIP, RIGHT_HIP], conf_threshold)
+    torso = shoulders - hips
+    has_torso = has_shoulders & has_hips
+
+    # 0 degrees is upright, 90 degrees is horizontal
+    angle = np.degrees(np.arctan2(np.abs(torso[:, 0]), np.abs(torso[:, 1])))
+    angle_score = np.clip((angle - 45) / 30, 0, 1)
+    flat_score = np.clip(1 - np.abs(torso[:, 1]) / (0.2 * height), 0, 1)
+
+    torso_score = 0.5 * angle_score + 0.2 * flat_score + 0.3 * aspect_score
+    return np.where(has_torso, torso_score, aspect_score).astype(np.float32)
+
+
+class LyingDetector:
+    """
+    Emits LYING_MAN events for persons whose smoothed lying score stays high.
+
+    Scores are averaged per track and camera, so one odd frame (a person bending down, a bad pose estimate)
+    does not trigger an event.
+    """
+
+    def __init__(self, threshold=0.6, min_frames=5, alpha=0.3, max_age=30):
+        self.threshold = threshold
+        self.min_frames = min_frames  # Observations of a track required before it can trigger
+        self.alpha = alpha
+        self.max_age = max_age
+        self.smoothers = {}
+
+    def process(self, frame_data):
+        """Return a DetectionEvent for every person detected lying in the frame."""
+        people = frame_data.people
+        if not len(people):
+            return []
+
+        smoother = self.smoothers.get(frame_data.camera_id)
+        if smoother is None:
+            smoother = self.smoothers[frame_data.camera_id] = TrackSmoother(self.alpha, self.max_age)
+        scores = lying_scores(people.keypoints, people.bboxes, frame_data.key_conf_th)
+        smoothed, counts = smoother.update(people.track_ids, scores)
+
+        lying = np.flatnonzero((smoothed >= self.threshold) & (counts >= self.min_frames))
+        return [
+            DetectionEvent(
+                event_type=EventType.LYING_MAN,
+                camera_id=frame_data.camera_id,
+                frame_index=frame_data.index,
+                timestamp=frame_data.timestamp,
+                track_ids=[int(people.track_ids[i])],
+                score=float(smoothed[i]),
+            )
+            for i in lying.tolist()
+        ]
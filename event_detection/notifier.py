@@ -0,0 +1,130 @@
+import queue
+import time
+
+from common.message import NotificationMessage
+from common.service import STOP_SENTINEL, ServiceBase
+from notification_app.service import MessageSender
+from pika.exceptions import AMQPError  # type: ignore
+
+from .aggregator import EventAggregator
+from .events import DetectionEvent
+
+
+class NotificationService(ServiceBase):
+    """
+    Debounces detector events and publishes one NotificationMessage per incident through MessageSender.
+
+    Reads DetectionEvents from `event_queue`, typically filled by EventDetectionService, and passes them
+    through an EventAggregator so the message queue, database and Telegram only see new incidents. The
+    aggregator runs on event timestamps, so stale incidents are expired relative to the latest event rather
+    than the wall clock, and replays of recorded footage age incidents as the footage does.
+
+    The RabbitMQ connection is serviced on every loop tick so heartbeats keep it open between incidents. A
+    lost connection is reopened, and a message that fails to send is retried once on a new connection.
+    """
+
+    def __init__(
+        self, name, event_queue, mq_config, org_id, get_timeout=0.5, expire_interval=60.0, **aggregator_kwargs
+    ):
+        super().__init__(name)
+        self.event_queue = event_queue
+        self.mq_config = mq_config
+        self.org_id = org_id
+        self.get_timeout = get_timeout
+        self.expire_interval = expire_interval
+        self.aggregator_kwargs = aggregator_kwargs
+
+    def run(self):
+        self.aggregator = EventAggregator(**self.aggregator_kwargs)
+        self.sender = None
+        self.connect()
+        self.logger.info("Starting notification service.")
+        next_expire = time.monotonic() + self.expire_interval
+        latest = None  # Timestamp of the newest event seen, the aggregator's notion of now
+
+        while self.running.is_set():
+            try:
+                event = self.event_queue.get(timeout=self.get_timeout)
+            except queue.Empty:
+                event = None
+            else:
+                if event is STOP_SENTINEL:
+                    break
+                latest = max(latest or 0.0, event.timestamp.timestamp())
+                if self.aggregator.push(event) is not None:
+                    self.send(self.message(event))
+            self.keep_alive()
+
+            if time.monotonic() >= next_expire:
+                if latest is not None:
+                    self.aggregator.expire(latest)
+                next_expire = time.monotonic() + self.expire_interval
+                self.logger.info(
+                    f"Events received: {self.aggregator.received}, suppressed: {self.aggregator.suppressed}, "
+                    f"tracked incidents: {len(self.aggregator.incidents)}."
+                )
+
+        self.close_sender()
+        self.logger.info("Notification service stopped gracefully.")
+
+    def keep_alive(self):
+        """Answer broker heartbeats, reconnecting when the connection is gone."""
+        if self.sender is None:
+            self.connect()
+            return
+        try:
+            self.sender.mq_connection.process_data_events(0)
+        except AMQPError as error:
+            self.logger.warning(f"Message queue connection lost, reconnecting: {error!r}")
+            self.connect()
+
+    def send(self, message: NotificationMessage):
+        """Publish a message, retrying once on a fresh connection."""
+        for attempt in range(2):
+            if self.sender is None and not self.connect():
+                continue
+            try:
+                self.sender.send_message(message)
+                return True
+            except AMQPError as error:
+                self.logger.warning(f"Could not send notification (attempt {attempt + 1}): {error!r}")
+                self.close_sender()
+        self.logger.error(f"Dropped notification {message}.")
+        return False
+
+    def connect(self):
+        """Replace the current connection with a new one. Returns False if the broker is unreachable."""
+        self.close_sender()
+        try:
+            self.sender = MessageSender(self.mq_config)
+        except AMQPError as error:
+            self.logger.warning(f"Could not connect to the message queue: {error!r}")
+            return False
+        return True
+
+    def close_sender(self):
+        if self.sender is None:
+            return
+        try:
+            self.sender.close()
+        except AMQPError:
+            pass  # Already closed by the broker
+        self.sender = None
+
+    def message(self, event: DetectionEvent) -> NotificationMessage:
+        """Build the message published for an incident."""
+        actor_ids = [user_id for user_id in event.user_ids if user_id is not None]
+        return NotificationMessage(
+            event_type=event.event_type,
+            org_id=self.org_id,
+            main_actor_id=event.user_ids[0] if event.user_ids else None,
+            actor_ids=actor_ids or None,
+            timestamp=event.timestamp.strftime("%Y-%m-%d %H:%M:%S"),  # The format the notification worker parses
+            camera_id=None if event.camera_id is None else str(event.camera_id),
+        )
+
+    def stop(self):
+        """Wake the service with a stop sentinel, then wait for it to finish."""
+        if self.running.is_set():
+            self.event_queue.put(STOP_SENTINEL)
+        super().stop()
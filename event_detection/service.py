@@ -0,0 +1,84 @@
+import queue
+import time
+
+from common.service import STOP_SENTINEL, ServiceBase
+
+
+class EventDetectionService(ServiceBase):
+    """
+    Runs event detectors over tracked frames.
+
+    Every detector exposes `process(frame_data) -> list[DetectionEvent]`; events get the user ids of their
+    tracks and go to `event_queue` and, when `output_queue` is given, frames are passed on unchanged for
+    further stages.
+
+    `activity_queue` is only drained by a PoseEstimationPool running the frame rate scheduler, so it should
+    only be given in that setup, and bounded: when it is full the oldest report is dropped for the newest.
+    """
+
+    def __init__(
+        self,
+        name,
+        input_queue,
+        event_queue,
+        detector_factories,
+        output_queue=None,
+        get_timeout=0.5,
+        activity_queue=None,
+    ):
+        super().__init__(name)
+        self.input_queue = input_queue
+        self.event_queue = event_queue
+        self.output_queue = output_queue
+        self.detector_factories = detector_factories  # Callables building detectors inside the service process
+        self.get_timeout = get_timeout
+        self.activity_queue = activity_queue  # Receives (camera id, events in frame) for the frame rate scheduler
+        self.dropped_reports = 0
+
+    def run(self):
+        self.detectors = [factory() for factory in self.detector_factories]
+        self.logger.info("Starting event detection service.")
+
+        while self.running.is_set():
+            try:
+                frame_data = self.input_queue.get(timeout=self.get_timeout)
+            except queue.Empty:
+                continue
+            if frame_data is STOP_SENTINEL:
+                break
+
+            start_time = time.perf_counter()
+            open_events = 0
+            for detector in self.detectors:
+                for event in detector.process(frame_data):
+                    event.identify(frame_data.people)
+                    self.event_queue.put(event)
+                    open_events += 1
+            if self.activity_queue is not None:
+                self.report_activity(frame_data.camera_id, open_events)
+            if self.output_queue is not None:
+                self.output_queue.put(frame_data)
+            self.logger.info(f"Event detection processed in {time.perf_counter() - start_time:.4f} seconds.")
+
+        self.logger.info("Event detection service stopped gracefully.")
+
+    def report_activity(self, camera_id, open_events):
+        """Send an activity report without blocking, dropping the oldest pending report when the queue is full."""
+        try:
+            self.activity_queue.put_nowait((camera_id, open_events))
+        except queue.Full:
+            try:
+                self.activity_queue.get_nowait()
+                self.dropped_reports += 1
+            except queue.Empty:
+                pass  # The scheduler drained it in between
+            try:
+                self.activity_queue.put_nowait((camera_id, open_events))
+            except queue.Full:
+                self.dropped_reports += 1
+
+    def stop(self):
+        """Wake the service with a stop sentinel, then wait for it to finish."""
+        if self.running.is_set():
+            self.input_queue.put(STOP_SENTINEL)
+        super().stop()
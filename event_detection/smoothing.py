@@ -0,0 +1,76 @@
+import numpy as np
+
+
+class TrackSmoother:
+    """
+    Exponential moving average of a per-person score, keyed by track id.
+
+    State is kept as sorted id and value arrays so a whole frame of tracks is updated with one lookup.
+    Tracks not seen for `max_age` updates are forgotten.
+    """
+
+    def __init__(self, alpha=0.3, max_age=30):
+        self.alpha = alpha
+        self.max_age = max_age
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.values = np.zeros(0, dtype=np.float32)
+        self.counts = np.zeros(0, dtype=np.int64)  # Updates received by each track
+        self.ages = np.zeros(0, dtype=np.int64)  # Updates since each track was last seen
+
+    def update(self, track_ids, scores):
+        """
+        Fold new scores into the averages.
+        Parameters:
+            track_ids (np.array): (P,) track ids, negative for untracked persons.
+            scores (np.array): (P,) raw scores.
+        Returns:
+            tuple: ((P,) smoothed scores, (P,) number of updates seen per track). Untracked persons get their
+            raw score and a count of 1.
+        """
+        track_ids = np.asarray(track_ids, dtype=np.int64)
+        scores = np.asarray(scores, dtype=np.float32)
+        smoothed = scores.copy()
+        counts = np.ones(scores.shape, dtype=np.int64)
+        tracked = np.flatnonzero(track_ids >= 0)
+        self.ages += 1
+
+        if tracked.size:
+            ids, first = np.unique(track_ids[tracked], return_index=True)
+            rows = tracked[first]
+            position = np.searchsorted(self.ids, ids)
+            known = position < self.ids.size
+            known[known] = self.ids[position[known]] == ids[known]
+
+            # Known tracks: blend into the running average
+            slots = position[known]
+            self.values[slots] = self.alpha * scores[rows[known]] + (1 - self.alpha) * self.values[slots]
+            self.counts[slots] += 1
+            self.ages[slots] = 0
+
+            # New tracks start at their first score
+            new = ~known
+            self.ids = np.concatenate((self.ids, ids[new]))
+            self.values = np.concatenate((self.values, scores[rows[new]]))
+            self.counts = np.concatenate((self.counts, np.ones(new.sum(), dtype=np.int64)))
+            self.ages = np.concatenate((self.ages, np.zeros(new.sum(), dtype=np.int64)))
+            order = np.argsort(self.ids)
+            self.ids, self.values, self.counts, self.ages = (
+                self.ids[order],
+                self.values[order],
+                self.counts[order],
+                self.ages[order],
+            )
+
+            slots = np.searchsorted(self.ids, track_ids[tracked])
+            smoothed[tracked] = self.values[slots]
+            counts[tracked] = self.counts[slots]
+
+        keep = self.ages <= self.max_age
+        if not keep.all():
+            self.ids, self.values, self.counts, self.ages = (
+                self.ids[keep],
+                self.values[keep],
+                self.counts[keep],
+                self.ages[keep],
+            )
+        return smoothed, counts
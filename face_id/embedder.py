@@ -0,0 +1,71 @@
+import time
+
+import cv2
+import numpy as np
+from constants import PoseEstimationServiceConstants
+from pose_estimation.config import SessionConfig
+
+
+class FaceEmbedder:
+    """
+    Computes L2-normalized face embeddings for all face crops of a frame with one inference call.
+
+    Crops are resized straight into a preallocated float32 NCHW buffer, normalized as ArcFace-style models
+    expect ((pixel - 127.5) / 128, RGB). The embedding model must be the one used to enroll FaceEncodings.
+    """
+
+    def __init__(self, model_path, input_size=112, session_config=None, max_batch_size=32):
+        self.session_config = session_config or SessionConfig()
+        start_time = time.perf_counter()
+        self.session = self.session_config.create_session(
+            model_path, PoseEstimationServiceConstants.EXECUTION_PROVIDERS
+        )
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.output_names = [self.session.get_outputs()[0].name]
+        self.fixed_batch = isinstance(model_input.shape[0], int)  # Exported with a fixed batch axis
+        self.max_batch_size = model_input.shape[0] if self.fixed_batch else max_batch_size
+        self.input_size = input_size
+        self.buffer = np.zeros((self.max_batch_size, 3, input_size, input_size), dtype=np.float32)
+        self.crop = np.empty((input_size, input_size, 3), dtype=np.uint8)
+        self.startup_time = time.perf_counter() - start_time
+
+    def fill(self, image, bbox, slot):
+        """Resize one face crop of a BGR image into the input buffer."""
+        x_min, y_min, x_max, y_max = bbox
+        face = image[y_min:y_max, x_min:x_max]
+        if face.size == 0:
+            self.buffer[slot] = 0
+            return
+        cv2.resize(face, (self.input_size, self.input_size), dst=self.crop, interpolation=cv2.INTER_LINEAR)
+        for channel in range(3):
+            # BGR -> RGB while normalizing into the CHW slot
+            np.subtract(self.crop[:, :, 2 - channel], 127.5, out=self.buffer[slot, channel])
+        self.buffer[slot] *= np.float32(1 / 128)
+
+    def embed(self, image, bboxes):
+        """
+        Embed face crops of one frame.
+        Parameters:
+            image (np.array): BGR frame.
+            bboxes (np.array): (N, 4) xyxy face boxes in frame coordinates.
+        Returns:
+            np.array: (N, D) float32 unit-length embeddings.
+        """
+        bboxes = np.asarray(bboxes, dtype=np.int64).reshape(-1, 4)
+        height, width = image.shape[:2]
+        bboxes = np.clip(bboxes, 0, [width, height, width, height])
+        outputs = []
+        for start in range(0, len(bboxes), self.max_batch_size):
+            chunk = bboxes[start : start + self.max_batch_size]
+            for slot, bbox in enumerate(chunk.tolist()):
+                self.fill(image, bbox, slot)
+            # Fixed-batch models always run on the full buffer
+            count = self.max_batch_size if self.fixed_batch else len(chunk)
+            output = self.session.run(self.output_names, {self.input_name: self.buffer[:count]})[0]
+            outputs.append(output[: len(chunk)])
+        if not outputs:
+            return np.zeros((0, 0), dtype=np.float32)
+        embeddings = np.concatenate(outputs).astype(np.float32, copy=False)
+        embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings
@@ -0,0 +1,208 @@
+import asyncio
+
+import numpy as np
+
+
+def normalize(embeddings):
+    """Return float32 copies of (N, D) embeddings scaled to unit length."""
+    embeddings = np.array(embeddings, dtype=np.float32, ndmin=2)
+    embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+    return embeddings
+
+
+def _decode(face_encodings):
+    """(N, D) float64 embeddings, user ids and ids of FaceEncoding rows, decoded with one frombuffer call."""
+    raw = np.frombuffer(b"".join(row.face_encoding for row in face_encodings), dtype=np.float64)
+    return (
+        raw.reshape(len(face_encodings), -1),
+        [row.user_id for row in face_encodings],
+        [row.id for row in face_encodings],
+    )
+
+
+class FaceGallery:
+    """
+    In-memory index of an organization's face embeddings for cosine matching.
+
+    Embeddings live unit-normalized in one contiguous float32 matrix, with parallel arrays of user ids and
+    FaceEncoding ids, so a batch of probes is scored against the whole gallery with a single matmul. Rows are
+    stored in a buffer with spare capacity and removed by moving the last rows into the gaps, so adding or
+    removing encodings never rebuilds the index. Galleries save to a .npy matrix plus an .npz of ids and load
+    memory-mapped, so startup does not depend on the number of encodings.
+    """
+
+    def __init__(self, embeddings, user_ids, encoding_ids=None):
+        embeddings = normalize(embeddings)
+        self.buffer = embeddings.reshape(len(user_ids), embeddings.shape[-1])
+        self.count = len(user_ids)
+        self.user_ids = np.asarray(user_ids, dtype=object).reshape(-1)
+        self.encoding_ids = np.asarray(
+            encoding_ids if encoding_ids is not None else [None] * self.count, dtype=object
+        ).reshape(-1)
+
+    @property
+    def embeddings(self):
+        """(N, D) view of the stored unit-length embeddings."""
+        return self.buffer[: self.count]
+
+    @classmethod
+    def from_face_encodings(cls, face_encodings, dim=None):
+        """
+        Build a gallery from FaceEncoding rows, e.g. from get_face_encodings_by_org.
+
+        The raw float64 bytes of all rows are decoded together instead of through each row's `embedding`.
+        """
+        if not face_encodings:
+            return cls(np.zeros((0, dim or 0), dtype=np.float32), [])
+        return cls(*_decode(face_encodings))
+
+    @classmethod
+    def from_encodings_file(cls, filename):
+        """Build a gallery from an .npz written by kit.utils.save_encodings, keyed by the stored names."""
+        data = np.load(filename)
+        return cls(data["encodings"], data["names"].tolist())
+
+    def __len__(self):
+        return self.count
+
+    def search(self, probes, k=1):
+        """
+        Top-k gallery entries for each probe embedding.
+        Parameters:
+            probes (np.array): (N, D) unit-length embeddings.
+            k (int): Number of matches per probe.
+        Returns:
+            tuple: ((N, k) user ids, (N, k) cosine similarities, (N, k) row indices), best first. When the
+            gallery holds fewer than k entries the missing columns get None ids, similarity -1 and row -1.
+        """
+        probes = np.asarray(probes, dtype=np.float32)
+        if probes.ndim == 1:
+            probes = probes[None]
+        num_probes, available = len(probes), min(k, self.count)
+        user_ids = np.full((num_probes, k), None, dtype=object)
+        similarities = np.full((num_probes, k), -1.0, dtype=np.float32)
+        rows = np.full((num_probes, k), -1, dtype=np.int64)
+        if not num_probes or not available:
+            return user_ids, similarities, rows
+
+        scores = probes @ self.embeddings.T
+        if available < self.count:
+            top = np.argpartition(-scores, available - 1, axis=1)[:, :available]
+        else:
+            top = np.broadcast_to(np.arange(self.count), (num_probes, self.count))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        rows[:, :available] = np.take_along_axis(top, order, axis=1)
+        similarities[:, :available] = np.take_along_axis(top_scores, order, axis=1)
+        user_ids[:, :available] = self.user_ids[rows[:, :available]]
+        return user_ids, similarities, rows
+
+    def match(self, probes):
+        """
+        Best gallery entry for each probe embedding.
+        Returns:
+            tuple: ((N,) user ids, (N,) cosine similarities). Empty galleries give None ids and similarity -1.
+        """
+        user_ids, similarities, _ = self.search(probes, k=1)
+        return user_ids[:, 0], similarities[:, 0]
+
+    def add(self, embeddings, user_ids, encoding_ids=None):
+        """Append encodings, growing the buffer geometrically when it is full."""
+        embeddings = normalize(embeddings)
+        embeddings = embeddings.reshape(len(user_ids), embeddings.shape[-1])
+        count = self.count + len(embeddings)
+        if not self.count and self.buffer.shape[1] != embeddings.shape[1]:
+            self.buffer = np.zeros((0, embeddings.shape[1]), dtype=np.float32)
+        if count > len(self.buffer) or not self.buffer.flags.writeable:
+            buffer = np.empty((max(count, 2 * len(self.buffer), 16), embeddings.shape[1]), dtype=np.float32)
+            buffer[: self.count] = self.embeddings
+            self.buffer = buffer
+        self.buffer[self.count : count] = embeddings
+        if encoding_ids is None:
+            encoding_ids = [None] * len(embeddings)
+        self.user_ids = np.concatenate((self.user_ids[: self.count], np.asarray(user_ids, dtype=object)))
+        self.encoding_ids = np.concatenate((self.encoding_ids[: self.count], np.asarray(encoding_ids, dtype=object)))
+        self.count = count
+
+    def add_face_encodings(self, face_encodings):
+        """Append FaceEncoding rows, e.g. after create_face_encoding."""
+        if face_encodings:
+            self.add(*_decode(face_encodings))
+
+    def remove(self, user_ids=None, encoding_ids=None):
+        """
+        Remove every encoding of the given users and/or with the given FaceEncoding ids.
+        Returns:
+            int: Number of rows removed.
+        """
+        drop = np.zeros(self.count, dtype=bool)
+        if user_ids is not None:
+            drop |= np.isin(self.user_ids[: self.count], np.asarray(list(user_ids), dtype=object))
+        if encoding_ids is not None:
+            drop |= np.isin(self.encoding_ids[: self.count], np.asarray(list(encoding_ids), dtype=object))
+        removed = int(drop.sum())
+        if not removed:
+            return 0
+        if not self.buffer.flags.writeable:
+            self.buffer = self.embeddings.copy()
+
+        # Fill the gaps left in the kept part with the kept rows from the tail
+        count = self.count - removed
+        gaps = np.flatnonzero(drop[:count])
+        movers = count + np.flatnonzero(~drop[count:])
+        self.buffer[gaps] = self.buffer[movers]
+        self.user_ids[gaps] = self.user_ids[movers]
+        self.encoding_ids[gaps] = self.encoding_ids[movers]
+        self.count = count
+        self.user_ids = self.user_ids[:count]
+        self.encoding_ids = self.encoding_ids[:count]
+        return removed
+
+    def save(self, path):
+        """Write the gallery as `<path>.npy` (embeddings) and `<path>.ids.npz` (user and encoding ids)."""
+        np.save(f"{path}.npy", self.embeddings)
+        encoding_ids = np.array(["" if value is None else str(value) for value in self.encoding_ids.tolist()])
+        np.savez(
+            f"{path}.ids.npz",
+            user_ids=np.array([str(value) for value in self.user_ids.tolist()]),
+            encoding_ids=encoding_ids,
+        )
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Load a gallery written by `save`.
+
+        With `mmap` the embedding matrix is memory-mapped read-only and paged in on first search; the first
+        add or remove copies it into memory.
+        """
+        embeddings = np.load(f"{path}.npy", mmap_mode="r" if mmap else None)
+        ids = np.load(f"{path}.ids.npz")
+        gallery = cls.__new__(cls)
+        gallery.buffer = embeddings
+        gallery.count = len(embeddings)
+        gallery.user_ids = np.asarray(ids["user_ids"].tolist(), dtype=object)
+        gallery.encoding_ids = np.asarray([value or None for value in ids["encoding_ids"].tolist()], dtype=object)
+        return gallery
+
+
+def load_face_gallery(db_config, org_id):
+    """
+    Read an organization's face encodings and user accounts from the database.
+    Returns:
+        tuple: (FaceGallery, dict of user id -> UserAccount), as FaceRecognitionService takes them.
+    """
+    # Imported here so face recognition does not require the async database driver
+    from notification_app.repository import AsyncNotificationRepository
+
+    async def fetch():
+        repository = AsyncNotificationRepository(db_config)
+        try:
+            face_encodings = await repository.get_face_encodings_by_org(org_id)
+            users = await repository.get_user_accounts_by_org(org_id)
+            return face_encodings, users
+        finally:
+            await repository.get_engine().dispose()
+
+    face_encodings, users = asyncio.run(fetch())
+    return FaceGallery.from_face_encodings(face_encodings), {user.id: user for user in users}
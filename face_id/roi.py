@@ -0,0 +1,48 @@
+import numpy as np
+from constants import PoseEstimationServiceConstants
+from pose_estimation.pose_connections import LEFT_EAR, LEFT_EYE, NOSE, RIGHT_EAR, RIGHT_EYE
+
+
+def face_rois(
+    keypoints,
+    conf_threshold=PoseEstimationServiceConstants.KEYPOINT_CONF_THRESHOLD,
+    min_size=16,
+    target_size=112,
+):
+    """
+    Square face crops and their quality for every person, from the nose, eye and ear keypoints alone.
+
+    The crop is centred between the eyes and the nose and sized from the ear distance, or the eye distance
+    when an ear is hidden, so no face detector has to run on the frame. Quality in [0, 1] multiplies how
+    frontal the face is (nose between the eyes), the crop size relative to `target_size` pixels and the mean
+    confidence of the nose and eyes; faces without a visible nose and both eyes score 0.
+    Parameters:
+        keypoints (np.array): (P, 17, 3) keypoints.
+        conf_threshold (float): Minimum keypoint confidence to count as visible.
+        min_size (int): Faces smaller than this many pixels score 0.
+        target_size (int): Crop size at which the size factor of the quality reaches 1.
+    Returns:
+        tuple: ((P, 4) int32 xyxy face boxes, (P,) float32 qualities).
+    """
+    nose, left_eye, right_eye = keypoints[:, NOSE], keypoints[:, LEFT_EYE], keypoints[:, RIGHT_EYE]
+    left_ear, right_ear = keypoints[:, LEFT_EAR], keypoints[:, RIGHT_EAR]
+    visible = (nose[:, 2] > conf_threshold) & (left_eye[:, 2] > conf_threshold) & (right_eye[:, 2] > conf_threshold)
+    ears = (left_ear[:, 2] > conf_threshold) & (right_ear[:, 2] > conf_threshold)
+
+    eye_distance = np.linalg.norm(left_eye[:, :2] - right_eye[:, :2], axis=1)
+    ear_distance = np.linalg.norm(left_ear[:, :2] - right_ear[:, :2], axis=1)
+    size = np.where(ears, np.maximum(1.2 * ear_distance, 2.0 * eye_distance), 2.5 * eye_distance)
+    center = (nose[:, :2] + left_eye[:, :2] + right_eye[:, :2]) / 3
+    half = size[:, None] / 2
+    face_bboxes = np.concatenate((center - half, center + half), axis=1)
+    face_bboxes = np.clip(face_bboxes, 0, None).astype(np.int32)
+
+    # Frontal when the nose projects halfway between the eyes
+    eye_mid = (left_eye[:, 0] + right_eye[:, 0]) / 2
+    yaw = np.divide(np.abs(nose[:, 0] - eye_mid), eye_distance / 2, out=np.ones_like(eye_mid), where=eye_distance > 0)
+    frontal = np.clip(1 - yaw, 0, 1)
+    size_factor = np.clip(size / target_size, 0, 1)
+    confidence = (nose[:, 2] + left_eye[:, 2] + right_eye[:, 2]) / 3
+    quality = frontal * size_factor * confidence
+    quality = np.where(visible & (size >= min_size), quality, 0).astype(np.float32)
+    return face_bboxes, quality
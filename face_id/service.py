@@ -0,0 +1,161 @@
+import queue
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from common.service import STOP_SENTINEL, ServiceBase
+
+from .embedder import FaceEmbedder
+from .gallery import FaceGallery
+from .roi import face_rois
+
+
+@dataclass
+class TrackIdentity:
+    """Best face seen so far for one track and who it was matched to."""
+
+    quality: float
+    user_id: str | None
+    similarity: float
+    last_seen: int  # Frame index
+
+
+class FaceRecognitionService(ServiceBase):
+    """
+    Identifies tracked persons by their face and fills Person.set_face.
+
+    Face ROIs come from the head keypoints, so no face detector runs. All faces of a frame that need
+    recognition are embedded in one inference call, and a track is only re-identified when its face quality
+    beats the best quality it was recognized at by `quality_margin`. Recognition cost therefore scales with new
+    tracks and better views instead of with persons per frame. Untracked persons are recognized every frame.
+
+    With a SharedFrameRing, frames arrive as slot references: the service maps the pixels back before
+    embedding and, as the last stage reading them, releases the slot before forwarding the frame. The pose
+    stage in front of it must then keep its slots (PoseEstimationService with `release_frames=False`).
+    """
+
+    def __init__(
+        self,
+        name,
+        input_queue,
+        output_queue,
+        model_path,
+        gallery: FaceGallery,
+        users,
+        session_config=None,
+        similarity_threshold=0.5,
+        min_quality=0.3,
+        quality_margin=0.1,
+        max_age=250,
+        get_timeout=0.5,
+        frame_ring=None,
+        release_frames=True,
+    ):
+        super().__init__(name)
+        self.input_queue = input_queue
+        self.output_queue = output_queue
+        self.model_path = model_path
+        self.gallery = gallery
+        self.users = users  # user id -> UserAccount
+        self.session_config = session_config
+        self.similarity_threshold = similarity_threshold  # Cosine similarity required to accept a match
+        self.min_quality = min_quality  # Faces below this quality are never embedded
+        self.quality_margin = quality_margin
+        self.max_age = max_age  # Frames after which an unseen track's identity is forgotten
+        self.get_timeout = get_timeout
+        self.frame_ring = frame_ring  # SharedFrameRing the frames' pixels live in, if any
+        self.release_frames = release_frames  # Free ring slots after recognition; off when a later stage reads pixels
+
+    def run(self):
+        self.embedder = FaceEmbedder(self.model_path, session_config=self.session_config)
+        self.identities = {}  # camera id -> {track id: TrackIdentity}
+        self.logger.info(f"Starting face recognition service, model ready in {self.embedder.startup_time:.3f} seconds.")
+
+        while self.running.is_set():
+            try:
+                frame_data = self.input_queue.get(timeout=self.get_timeout)
+            except queue.Empty:
+                continue
+            if frame_data is STOP_SENTINEL:
+                break
+
+            start_time = time.perf_counter()
+            embedded = self.process_frame(frame_data)
+            self.output_queue.put(frame_data)
+            self.logger.info(
+                f"Embedded {embedded} of {len(frame_data.people)} faces in {time.perf_counter() - start_time:.4f} "
+                "seconds."
+            )
+
+        self.logger.info("Face recognition service stopped gracefully.")
+
+    def process_frame(self, frame_data):
+        """Recognize the persons of a received frame, mapping its pixels from the ring and releasing them after."""
+        if self.frame_ring is not None:
+            self.frame_ring.attach(frame_data)
+        try:
+            if frame_data.image is None:
+                self.logger.warning(f"Frame {frame_data.index} of camera {frame_data.camera_id} has no image.")
+                return 0
+            return self.recognize(frame_data)
+        finally:
+            # Done with the pixels: free the slot before the frame is pickled onto the output queue
+            if self.frame_ring is not None and self.release_frames:
+                self.frame_ring.release(frame_data)
+
+    def recognize(self, frame_data):
+        """Identify the persons of a frame in place. Returns the number of faces embedded."""
+        people = frame_data.people
+        if not len(people):
+            return 0
+        face_bboxes, quality = face_rois(people.keypoints, frame_data.key_conf_th)
+        identities = self.identities.setdefault(frame_data.camera_id, {})
+        keys = people.track_ids.tolist()
+        tracked = people.track_ids >= 0
+
+        # Faces worth embedding: good enough, and better than what the track was last recognized at
+        best_quality = np.array(
+            [identities[key].quality if key in identities else -np.inf for key in keys], dtype=np.float32
+        )
+        candidates = quality >= self.min_quality
+        candidates &= ~tracked | (quality > best_quality + self.quality_margin)
+        rows = np.flatnonzero(candidates)
+
+        matches = {}
+        if rows.size:
+            embeddings = self.embedder.embed(frame_data.image, face_bboxes[rows])
+            user_ids, similarities = self.gallery.match(embeddings)
+            for row, user_id, similarity in zip(rows.tolist(), user_ids.tolist(), similarities.tolist()):
+                accepted = user_id if similarity >= self.similarity_threshold else None
+                matches[row] = (accepted, similarity)
+                if tracked[row]:
+                    previous = identities.get(keys[row])
+                    if accepted is None and previous is not None and previous.user_id is not None:
+                        # Keep the earlier identity, but do not retry at this quality again
+                        previous.quality = float(quality[row])
+                        continue
+                    identities[keys[row]] = TrackIdentity(float(quality[row]), accepted, similarity, frame_data.index)
+
+        for row, key in enumerate(keys):
+            identity = identities.get(key) if tracked[row] else None
+            if identity is not None:
+                identity.last_seen = frame_data.index
+                user_id, similarity = identity.user_id, identity.similarity
+            elif row in matches:
+                user_id, similarity = matches[row]
+            else:
+                continue
+            if user_id is not None:
+                face_bbox = tuple(face_bboxes[row].tolist()) if quality[row] > 0 else None
+                people[row].set_face(self.users.get(user_id), face_bbox, similarity)
+
+        stale = [key for key, identity in identities.items() if frame_data.index - identity.last_seen > self.max_age]
+        for key in stale:
+            del identities[key]
+        return int(rows.size)
+
+    def stop(self):
+        """Wake the service with a stop sentinel, then wait for it to finish."""
+        if self.running.is_set():
+            self.input_queue.put(STOP_SENTINEL)
+        super().stop()
@@ -0,0 +1,202 @@
+import numpy as np
+
+# Supported box layouts for (N, 4) arrays:
+#   "xyxy"   - x_min, y_min, x_max, y_max
+#   "xywh"   - x_min, y_min, width, height
+#   "cxcywh" - center x, center y, width, height (raw YOLO output)
+BOX_FORMATS = ("xyxy", "xywh", "cxcywh")
+
+
+def to_xyxy(boxes, fmt="xyxy"):
+    """Convert an (N, 4) array of boxes in `fmt` to float xyxy."""
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    if fmt == "xyxy":
+        return boxes
+    if fmt == "xywh":
+        return np.concatenate((boxes[:, :2], boxes[:, :2] + boxes[:, 2:]), axis=1)
+    if fmt == "cxcywh":
+        half_wh = boxes[:, 2:] / 2
+        return np.concatenate((boxes[:, :2] - half_wh, boxes[:, :2] + half_wh), axis=1)
+    raise ValueError(f"Unknown box format {fmt!r}, expected one of {BOX_FORMATS}")
+
+
+def from_xyxy(boxes, fmt="xyxy"):
+    """Convert an (N, 4) array of xyxy boxes to `fmt`."""
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    if fmt == "xyxy":
+        return boxes
+    wh = boxes[:, 2:] - boxes[:, :2]
+    if fmt == "xywh":
+        return np.concatenate((boxes[:, :2], wh), axis=1)
+    if fmt == "cxcywh":
+        return np.concatenate((boxes[:, :2] + wh / 2, wh), axis=1)
+    raise ValueError(f"Unknown box format {fmt!r}, expected one of {BOX_FORMATS}")
+
+
+def convert(boxes, src_fmt, dst_fmt):
+    """Convert an (N, 4) array of boxes between formats."""
+    return from_xyxy(to_xyxy(boxes, src_fmt), dst_fmt)
+
+
+def box_area(boxes):
+    """Areas of an (N, 4) array of xyxy boxes."""
+    return np.clip(boxes[:, 2] - boxes[:, 0], 0, None) * np.clip(boxes[:, 3] - boxes[:, 1], 0, None)
+
+
+def box_centers(boxes):
+    """Centers of an (N, 4) array of xyxy boxes as an (N, 2) array."""
+    return (boxes[:, :2] + boxes[:, 2:]) / 2
+
+
+def pairwise_iou(boxes1, boxes2, fmt="xyxy"):
+    """
+    Intersection over Union between every pair of boxes.
+    Parameters:
+        boxes1 (np.array): (N, 4) boxes.
+        boxes2 (np.array): (M, 4) boxes.
+        fmt (str): Format of both arrays.
+    Returns:
+        np.array: (N, M) IoU matrix.
+    """
+    boxes1, boxes2 = to_xyxy(boxes1, fmt), to_xyxy(boxes2, fmt)
+    top_left = np.maximum(boxes1[:, None, :2], boxes2[None, :, :2])
+    bottom_right = np.minimum(boxes1[:, None, 2:], boxes2[None, :, 2:])
+    inter_wh = np.clip(bottom_right - top_left, 0, None)
+    inter = inter_wh[..., 0] * inter_wh[..., 1]
+    union = box_area(boxes1)[:, None] + box_area(boxes2)[None, :] - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+
+def pairwise_center_distance(boxes1, boxes2, fmt="xyxy"):
+    """(N, M) Euclidean distances between the centers of every pair of boxes."""
+    centers1, centers2 = box_centers(to_xyxy(boxes1, fmt)), box_centers(to_xyxy(boxes2, fmt))
+    return np.linalg.norm(centers1[:, None, :] - centers2[None, :, :], axis=2)
+
+
+def nms(boxes, scores, iou_threshold=0.8, score_threshold=0.0, fmt="xyxy"):
+    """
+    Greedy Non-Maximum Suppression.
+    Parameters:
+        boxes (np.array): (N, 4) boxes in `fmt`.
+        scores (np.array): (N,) confidence scores.
+        iou_threshold (float): Boxes overlapping a kept box by more than this are suppressed.
+        score_threshold (float): Boxes scoring at or below this are ignored.
+        fmt (str): Format of `boxes`.
+    Returns:
+        np.array: Indices of the kept boxes, highest score first.
+    """
+    scores = np.asarray(scores, dtype=np.float32).reshape(-1)
+    candidates = np.flatnonzero(scores > score_threshold)
+    if candidates.size == 0:
+        return candidates
+    order = candidates[np.argsort(-scores[candidates], kind="stable")]
+    ordered = to_xyxy(boxes, fmt)[order]
+    areas = box_area(ordered)
+
+    # One iteration per kept box: drop everything it overlaps from the remaining candidates. Only the kept
+    # box's IoU row is computed, so memory stays linear in the number of candidates
+    keep = []
+    remaining = np.arange(order.size)
+    while remaining.size:
+        best, rest = remaining[0], remaining[1:]
+        keep.append(best)
+        inter_wh = np.clip(
+            np.minimum(ordered[best, 2:], ordered[rest, 2:]) - np.maximum(ordered[best, :2], ordered[rest, :2]), 0, None
+        )
+        inter = inter_wh[:, 0] * inter_wh[:, 1]
+        union = areas[best] + areas[rest] - inter
+        iou = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+        remaining = rest[iou <= iou_threshold]
+    return order[keep]
+
+
+def connected_components(num_nodes, edges_i, edges_j):
+    """
+    Label connected components of an undirected graph given as edge arrays.
+
+    Vectorized union-find: every round hooks the larger root of each edge under the smaller one, then
+    compresses paths by pointer jumping, until both ends of every edge share a root.
+    Returns:
+        np.array: (num_nodes,) component label of each node, labels are 0..K-1.
+    """
+    parent = np.arange(num_nodes)
+    while True:
+        root_i, root_j = parent[edges_i], parent[edges_j]
+        if np.array_equal(root_i, root_j):
+            break
+        np.minimum.at(parent, np.maximum(root_i, root_j), np.minimum(root_i, root_j))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+    return np.unique(parent, return_inverse=True)[1]
+
+
+def candidate_pairs(boxes, margins):
+    """
+    Find pairs of xyxy boxes whose boxes grown by `margins` overlap, using a sorted sweep along x.
+    Returns:
+        tuple: (i, j) index arrays with i != j.
+    """
+    grown = boxes + margins[:, None] * np.array([-1, -1, 1, 1], dtype=boxes.dtype)
+    order = np.argsort(grown[:, 0], kind="stable")
+    starts = grown[order, 0]
+
+    # Boxes starting after box k's start but before its end overlap it along x. Boxes ending before they
+    # start (negative width) overlap nothing
+    ends = np.searchsorted(starts, grown[order, 2], side="right")
+    counts = np.maximum(ends - np.arange(order.size) - 1, 0)
+    first = np.repeat(np.arange(order.size), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    second = first + 1 + offsets
+    i, j = order[first], order[second]
+
+    # Keep the pairs that also overlap along y
+    overlap_y = (grown[i, 1] <= grown[j, 3]) & (grown[j, 1] <= grown[i, 3])
+    return i[overlap_y], j[overlap_y]
+
+
+def merge_boxes(boxes, distance_thresh=0.2, fmt="xywh"):
+    """
+    Merge overlapping or close boxes into their enclosing boxes.
+
+    Two boxes are linked when they overlap or their centers are closer than `distance_thresh` times the
+    larger side of either box. Linked boxes are merged transitively, and merged boxes are merged again until
+    none are linked, so the result does not depend on input order. Boxes with a negative width or height are
+    clipped to zero size at their top-left corner.
+
+    Merged boxes are not bounded in size: because linking is transitive and a merged box links to everything
+    near its larger extent, dense inputs can chain into a few boxes spanning most of the area (5000 clustered
+    boxes on a 3840x2160 canvas merge into 2). Callers that need small regions must check the result, as
+    pose_estimation.roi.plan_regions does with RoiConfig.max_area_fraction.
+    Parameters:
+        boxes (np.array): (N, 4) boxes in `fmt`.
+        distance_thresh (float): Center distance threshold relative to box size.
+        fmt (str): Format of `boxes` and of the result.
+    Returns:
+        np.array: (K, 4) merged boxes in `fmt`.
+    """
+    merged = to_xyxy(boxes, fmt).copy()
+    merged[:, 2:] = np.maximum(merged[:, 2:], merged[:, :2])
+    while merged.shape[0] > 1:
+        sides = (merged[:, 2:] - merged[:, :2]).max(axis=1)
+        margins = distance_thresh * sides
+        i, j = candidate_pairs(merged, margins)
+
+        # Exact test on the candidates: positive-area overlap or close centers
+        inter_wh = np.minimum(merged[i, 2:], merged[j, 2:]) - np.maximum(merged[i, :2], merged[j, :2])
+        overlapping = (inter_wh > 0).all(axis=1)
+        distance = np.linalg.norm(box_centers(merged[i]) - box_centers(merged[j]), axis=1)
+        linked = overlapping | (distance < np.maximum(margins[i], margins[j]))
+        if not linked.any():
+            break
+
+        labels = connected_components(merged.shape[0], i[linked], j[linked])
+        grouped = np.empty((labels.max() + 1, 4), dtype=merged.dtype)
+        grouped[:, :2] = np.inf
+        grouped[:, 2:] = -np.inf
+        np.minimum.at(grouped[:, :2], labels, merged[:, :2])
+        np.maximum.at(grouped[:, 2:], labels, merged[:, 2:])
+        merged = grouped
+    return from_xyxy(merged, fmt)
@@ -1,6 +1,8 @@
 import cv2
 import numpy as np
 
+from .box_ops import merge_boxes
+
 
 def non_max_suppression(bboxes, confidences, threshold=0.8):
     """
@@ -66,7 +68,25 @@ def combine_boxes(box1, box2):
 
 def merge_bboxes(bboxes, distance_thresh=0.2):
     """
-    Merge overlapping or close bounding boxes.
+    Merge overlapping or close bounding boxes, transitively and independently of their order.
+
+    Parameters:
+    - bboxes: List of bounding boxes in [x, y, w, h] format.
+    - distance_thresh: The threshold distance proportional to the bbox size
+      to consider two bboxes as close.
+
+    Returns:
+    - merged_bboxes: List of merged bounding boxes in [x, y, w, h] format.
+    """
+    if not len(bboxes):
+        return []
+    bboxes = np.asarray(bboxes)
+    return merge_boxes(bboxes, distance_thresh, fmt="xywh").astype(bboxes.dtype).tolist()
+
+
+def merge_bboxes_sequential(bboxes, distance_thresh=0.2):
+    """
+    Reference single-pass merge, kept for benchmarking. Consumes `bboxes`.
 
     Parameters:
     - bboxes: List of bounding boxes in [x, y, w, h] format.
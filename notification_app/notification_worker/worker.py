@@ -42,10 +42,9 @@ class NotificationWorker:
                 student_id=notification_message.main_actor_id,
             )
             print(subs)
-            image_binary = base64.b64decode(notification_message.image)
             # Handle image if provided
-
             if notification_message.image:
+                image_binary = base64.b64decode(notification_message.image)
                 await self.bot.send_photo(DEBUG_GROUP_CHAT_ID, photo=image_binary, caption=text)
 
                 for sub in subs:
@@ -62,6 +61,7 @@ class NotificationWorker:
                 event_type=notification_message.event_type,
                 timestamp=datetime.strptime(notification_message.timestamp, "%Y-%m-%d %H:%M:%S"),
                 student_id=notification_message.main_actor_id,
+                camera_id=notification_message.camera_id,
             )
             print(" [x] Done")
 
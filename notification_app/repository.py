@@ -4,7 +4,17 @@ from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import TYPE_CHECKING, AsyncContextManager, AsyncGenerator, ContextManager, Coroutine, Protocol
 
-from common.models import Base, Event, EventType, FaceEncoding, Organization, Subscription, UserAccount, UserRole
+from common.models import (
+    Base,
+    Event,
+    EventType,
+    FaceEncoding,
+    Organization,
+    Schedule,
+    Subscription,
+    UserAccount,
+    UserRole,
+)
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
@@ -100,6 +110,10 @@ class INotificationRepository(Protocol):
         """Deletes a face encoding by its ID."""
         ...
 
+    async def get_schedules_by_org(self, org_id: str, session: AsyncSession | None = None) -> list[Schedule]:
+        """Fetches the schedule entries of a specific organization."""
+        ...
+
 
 class AsyncNotificationRepository:
     def __init__(self, config_db: DBConfig) -> None:
@@ -530,6 +544,17 @@ class AsyncNotificationRepository:
             await session.commit()
             return
 
+    async def get_schedules_by_org(self, org_id: str, session: AsyncSession | None = None) -> list[Schedule]:
+        if session is not None:
+            stmt = select(Schedule).filter(Schedule.organization_id == org_id)
+            result = await session.execute(stmt)
+            return list(result.scalars().all())
+
+        async with self._sessionmaker() as session:
+            stmt = select(Schedule).filter(Schedule.organization_id == org_id)
+            result = await session.execute(stmt)
+            return list(result.scalars().all())
+
     async def create_event(
         self,
         org_id: str,
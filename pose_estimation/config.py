@@ -0,0 +1,90 @@
+import os
+from dataclasses import dataclass
+
+import onnxruntime as ort  # type: ignore
+
+GRAPH_OPTIMIZATION_LEVELS = {
+    "disabled": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+EXECUTION_MODES = {
+    "sequential": ort.ExecutionMode.ORT_SEQUENTIAL,
+    "parallel": ort.ExecutionMode.ORT_PARALLEL,
+}
+
+MODEL_PRECISIONS = ("fp32", "fp16", "int8")
+
+
+def variant_model_path(model_path: str, precision: str) -> str:
+    """Return the file of a model's precision variant, e.g. models/yolov8n-pose.int8.onnx."""
+    if precision not in MODEL_PRECISIONS:
+        raise ValueError(f"Unknown model precision {precision!r}, expected one of {MODEL_PRECISIONS}")
+    if precision == "fp32":
+        return model_path
+    root, ext = os.path.splitext(model_path)
+    return f"{root}.{precision}{ext}"
+
+
+@dataclass
+class SessionConfig:
+    """ONNX Runtime session settings for PoseModel."""
+
+    graph_optimization_level: str = "all"
+    optimized_model_dir: str | None = None  # Optimized graphs are cached here, one per model file, and reused
+    intra_op_num_threads: int = 0  # 0 lets ONNX Runtime decide
+    inter_op_num_threads: int = 0
+    execution_mode: str = "sequential"
+    warmup_runs: int = 1
+
+    def session_options(self, model_path: str) -> tuple[ort.SessionOptions, str]:
+        """
+        Build session options for a model.
+        Returns:
+            tuple: (SessionOptions, path of the model file to load).
+        """
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.intra_op_num_threads
+        options.inter_op_num_threads = self.inter_op_num_threads
+        options.execution_mode = EXECUTION_MODES[self.execution_mode]
+
+        cache_path = self.optimized_model_path(model_path)
+        if cache_path and _is_fresh(cache_path, model_path):
+            # The cached graph is already optimized, skip optimizing it again
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+            return options, cache_path
+
+        options.graph_optimization_level = GRAPH_OPTIMIZATION_LEVELS[self.graph_optimization_level]
+        if cache_path:
+            # Written under a per-process name and moved into place by create_session, so workers starting
+            # together never read a half-written cache
+            root, ext = os.path.splitext(cache_path)
+            options.optimized_model_filepath = f"{root}.{os.getpid()}.tmp{ext}"
+        return options, model_path
+
+    def optimized_model_path(self, model_path: str) -> str | None:
+        """
+        Cache file of a model's optimized graph, e.g. models/yolov8n-pose.int8.opt.onnx.
+
+        Named after the model file itself, so precision variants and other models sharing this config never
+        load each other's graphs.
+        """
+        if not self.optimized_model_dir:
+            return None
+        root, ext = os.path.splitext(os.path.basename(model_path))
+        return os.path.join(self.optimized_model_dir, f"{root}.opt{ext}")
+
+    def create_session(self, model_path: str, providers) -> ort.InferenceSession:
+        """Create an inference session for a model, publishing its optimized graph to the cache if one was built."""
+        options, load_path = self.session_options(model_path)
+        session = ort.InferenceSession(load_path, sess_options=options, providers=providers)
+        if options.optimized_model_filepath and os.path.exists(options.optimized_model_filepath):
+            os.replace(options.optimized_model_filepath, self.optimized_model_path(model_path))
+        return session
+
+
+def _is_fresh(cache_path: str, source_path: str) -> bool:
+    """True when the cache file exists and is newer than the model it was built from."""
+    return os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(source_path)
@@ -0,0 +1,73 @@
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+
+from common.frame_data import FrameData
+
+
+@dataclass
+class QueuePolicy:
+    """How the pose service buffers frames when inference falls behind capture."""
+
+    max_size: int = 0  # Max frames held before the oldest is dropped, 0 means unbounded
+    latest_per_camera: bool = False  # Keep only the newest pending frame of each camera
+    frame_skip: int = 1  # Analyze only every Nth frame of each camera
+
+
+class FrameBuffer:
+    """
+    Local buffer between the service's input queue and the model, applying a QueuePolicy.
+
+    Frames are returned oldest first. Dropped and skipped frames are counted and handed to `on_drop`
+    so their resources (e.g. shared-memory slots) can be released.
+    """
+
+    def __init__(self, policy: QueuePolicy, on_drop=None):
+        self.policy = policy
+        self.on_drop = on_drop
+        self.frames: OrderedDict = OrderedDict()
+        self.seen = defaultdict(int)  # Frames received per camera, for frame skipping
+        self.sequence = 0
+        self.dropped = 0
+        self.skipped = 0
+
+    def __len__(self):
+        return len(self.frames)
+
+    def push(self, frame_data: FrameData):
+        """Add a frame, dropping or skipping frames as the policy requires."""
+        camera_id = frame_data.camera_id
+        seen = self.seen[camera_id]
+        self.seen[camera_id] = seen + 1
+        if seen % max(self.policy.frame_skip, 1):
+            self.skipped += 1
+            self._discard(frame_data)
+            return
+
+        if self.policy.latest_per_camera:
+            key = camera_id
+            stale = self.frames.pop(key, None)
+            if stale is not None:
+                self.dropped += 1
+                self._discard(stale)
+        else:
+            key = self.sequence
+            self.sequence += 1
+        self.frames[key] = frame_data
+
+        # Drop the oldest frames once the buffer is over its bound
+        while self.policy.max_size and len(self.frames) > self.policy.max_size:
+            _, oldest = self.frames.popitem(last=False)
+            self.dropped += 1
+            self._discard(oldest)
+
+    def pop(self, count):
+        """Remove and return up to `count` of the oldest buffered frames."""
+        batch = []
+        while self.frames and len(batch) < count:
+            _, frame_data = self.frames.popitem(last=False)
+            batch.append(frame_data)
+        return batch
+
+    def _discard(self, frame_data: FrameData):
+        if self.on_drop is not None:
+            self.on_drop(frame_data)
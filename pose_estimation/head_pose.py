@@ -0,0 +1,91 @@
+import numpy as np
+from common.person import PersonBatch
+from constants import PoseEstimationServiceConstants
+
+from .pose_connections import LEFT_EAR, LEFT_EYE, LEFT_SHOULDER, NOSE, RIGHT_EAR, RIGHT_EYE, RIGHT_SHOULDER
+
+# Head orientations as seen by the camera: "left" means the face is turned towards the left of the image
+FRONT, LEFT, RIGHT, AWAY = "front", "left", "right", "away"
+ORIENTATIONS = (FRONT, LEFT, RIGHT, AWAY)
+
+HEAD = [NOSE, LEFT_EYE, RIGHT_EYE, LEFT_EAR, RIGHT_EAR]
+
+
+def head_poses(
+    keypoints,
+    bboxes,
+    conf_threshold=PoseEstimationServiceConstants.KEYPOINT_CONF_THRESHOLD,
+    front_yaw=0.35,
+):
+    """
+    Head box and orientation of every person, from nose, eye and ear keypoints.
+
+    The nose offset from the middle of the ears (or eyes), relative to their half distance, gives the yaw.
+    With one ear hidden the nose side of the visible ear tells the direction. A head with ears but no visible
+    nose or eyes faces away.
+    Parameters:
+        keypoints (np.array): (P, 17, 3) keypoints.
+        bboxes (np.array): (P, 4) xyxy person boxes, used to size heads with few visible keypoints.
+        conf_threshold (float): Minimum keypoint confidence to count as visible.
+        front_yaw (float): Largest absolute yaw still considered facing the camera.
+    Returns:
+        tuple: ((P, 4) int32 xyxy head boxes, (P,) orientation index into ORIENTATIONS or -1, (P,) bool whether
+        the person has any visible head keypoint).
+    """
+    head = keypoints[:, HEAD]
+    visible = head[:, :, 2] > conf_threshold
+    has_head = visible.any(axis=1)
+    x, y = head[:, :, 0], head[:, :, 1]
+    nose, left_eye, right_eye, left_ear, right_ear = visible.T
+
+    # Head box: around the visible head keypoints, at least a fraction of the shoulders and the person height
+    x_min = np.where(has_head, np.where(visible, x, np.inf).min(axis=1), 0)
+    x_max = np.where(has_head, np.where(visible, x, -np.inf).max(axis=1), 0)
+    y_mean = (y * visible).sum(axis=1) / np.maximum(visible.sum(axis=1), 1)
+    shoulders = keypoints[:, [LEFT_SHOULDER, RIGHT_SHOULDER]]
+    has_shoulders = (shoulders[:, :, 2] > conf_threshold).all(axis=1)
+    shoulder_width = np.where(has_shoulders, np.abs(shoulders[:, 0, 0] - shoulders[:, 1, 0]), 0)
+    person_height = (bboxes[:, 3] - bboxes[:, 1]).astype(np.float32)
+    width = np.maximum.reduce([(x_max - x_min) * 1.4, shoulder_width * 0.6, person_height * 0.12])
+    width = np.where(has_head, width, 0)
+    center_x = (x_min + x_max) / 2
+    height = width * 1.25
+    head_bboxes = np.stack(
+        (center_x - width / 2, y_mean - 0.55 * height, center_x + width / 2, y_mean + 0.45 * height), axis=1
+    )
+    head_bboxes = np.clip(head_bboxes, 0, None).astype(np.int32)
+
+    # Yaw from the nose offset to the middle of the ears, or of the eyes when an ear is hidden
+    ears, eyes = left_ear & right_ear, left_eye & right_eye
+    mid = np.where(ears, (x[:, 3] + x[:, 4]) / 2, (x[:, 1] + x[:, 2]) / 2)
+    half = np.where(ears, np.abs(x[:, 3] - x[:, 4]), np.abs(x[:, 1] - x[:, 2])) / 2
+    yaw = np.divide(x[:, 0] - mid, half, out=np.zeros_like(mid), where=half > 0)
+    single_ear_x = np.where(left_ear, x[:, 3], x[:, 4])
+
+    orientation = np.select(
+        [
+            ~has_head,
+            ~nose & ~left_eye & ~right_eye & (left_ear | right_ear),
+            nose & (ears | eyes) & (np.abs(yaw) <= front_yaw),
+            nose & (ears | eyes),
+            nose & (left_ear ^ right_ear),
+        ],
+        [
+            -1,
+            ORIENTATIONS.index(AWAY),
+            ORIENTATIONS.index(FRONT),
+            np.where(yaw < 0, ORIENTATIONS.index(LEFT), ORIENTATIONS.index(RIGHT)),
+            np.where(x[:, 0] < single_ear_x, ORIENTATIONS.index(LEFT), ORIENTATIONS.index(RIGHT)),
+        ],
+        default=-1,
+    )
+    return head_bboxes, orientation, has_head
+
+
+def annotate_heads(people: PersonBatch, conf_threshold=PoseEstimationServiceConstants.KEYPOINT_CONF_THRESHOLD):
+    """Fill the head boxes and orientations of every person in a batch, as Person.set_head would."""
+    if not len(people):
+        return
+    head_bboxes, orientation, has_head = head_poses(people.keypoints, people.bboxes, conf_threshold)
+    people.head_bboxes = [tuple(box) if found else None for box, found in zip(head_bboxes.tolist(), has_head.tolist())]
+    people.head_orientations = [ORIENTATIONS[index] if index >= 0 else None for index in orientation.tolist()]
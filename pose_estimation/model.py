@@ -1,92 +1,212 @@
-import cv2
+import time
+
 import numpy as np
-import onnxruntime as ort  # type: ignore
 from constants import PoseEstimationServiceConstants
 
-from kit.box_utils import non_max_suppression
+from kit.box_ops import nms
+
+from .config import SessionConfig
+from .preprocess import LetterboxPreprocessor
+from .roi import merge_region_detections
+
+# Overlap above which two decoded boxes are taken for the same person. YOLO-pose post-processing uses 0.45-0.7;
+# at 0.5 a cluster of anchors on one person decodes to one box, while two people must overlap by more than
+# half before one of them is suppressed
+NMS_IOU_THRESHOLD = 0.5
 
 
 class PoseModel:
-    def __init__(self, model_path):
-        self.session = ort.InferenceSession(model_path, providers=PoseEstimationServiceConstants.EXECUTION_PROVIDERS)
+    def __init__(self, model_path, vectorized=True, session_config=None, metrics=None):
+        self.session_config = session_config or SessionConfig()
+        start_time = time.perf_counter()
+        self.session = self.session_config.create_session(
+            model_path, PoseEstimationServiceConstants.EXECUTION_PROVIDERS
+        )
+        self.session_init_time = time.perf_counter() - start_time
+
+        # Resolve model I/O once instead of on every frame
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.output_names = [output.name for output in self.session.get_outputs()]
+        self.max_batch_size = model_input.shape[0] if isinstance(model_input.shape[0], int) else None
+
         self.input_w = PoseEstimationServiceConstants.INPUT_W  # Model input width
         self.input_h = PoseEstimationServiceConstants.INPUT_H  # Model input height
+        self.vectorized = vectorized  # Use the NumPy decode path instead of the per-anchor loop
+        self.preprocessor = LetterboxPreprocessor(self.input_w, self.input_h)
+
+        self.warmup_time = self.warmup(self.session_config.warmup_runs)
+        self.startup_time = self.session_init_time + self.warmup_time
+        if metrics is not None:
+            for metric_name in ("session_init_time", "warmup_time", "startup_time"):
+                metrics.add_gauge("pose_model", metric_name)
+                metrics.get_metric("pose_model", metric_name).set_value(getattr(self, metric_name))
+
+    def warmup(self, runs=1):
+        """Run the model on blank input so graph initialization is paid before the first real frame."""
+        start_time = time.perf_counter()
+        blank = np.zeros((self.max_batch_size or 1, 3, self.input_h, self.input_w), dtype=np.float32)
+        for _ in range(runs):
+            self.predict_batch(blank)
+        return time.perf_counter() - start_time
 
     def preprocess(self, frame):
         """Resize image to model input size, keeping the aspect ratio."""
-        original_h, original_w = frame.shape[:2]
-
-        # Compute the scaling factor to fit the image within input_w x input_h
-        scale_w = self.input_w / original_w
-        scale_h = self.input_h / original_h
-        scale = min(scale_w, scale_h)
-
-        # Resize the image while maintaining aspect ratio
-        new_w = round(original_w * scale)
-        new_h = round(original_h * scale)
-        resized_frame = cv2.resize(frame, (new_w, new_h))
-
-        # Pad the resized image to match the exact input size
-        pad_w = (self.input_w - new_w) // 2
-        pad_h = (self.input_h - new_h) // 2
-        padded_frame = cv2.copyMakeBorder(
-            resized_frame, pad_h, pad_h, pad_w, pad_w, cv2.BORDER_CONSTANT, value=(0, 0, 0)
-        )
+        input_data, (letterbox,) = self.preprocessor([frame])
 
         # Keep scaling and padding info for bounding box adjustment
-        self.scale = scale
-        self.pad_w = pad_w
-        self.pad_h = pad_h
-
-        # Normalize and prepare for model input
-        rgb_img = cv2.cvtColor(padded_frame, cv2.COLOR_BGR2RGB)
-        normalized_img = rgb_img.astype(np.float32) / 255.0
-        chw_img = np.transpose(normalized_img, (2, 0, 1))
-        input_data = np.expand_dims(chw_img, axis=0)
+        self.scale = letterbox.scale
+        self.pad_w = letterbox.pad_w
+        self.pad_h = letterbox.pad_h
         return input_data
 
     def predict(self, input_data):
-        input_name = self.session.get_inputs()[0].name
-        outputs = self.session.run(None, {input_name: input_data})
+        outputs = self.session.run(self.output_names, {self.input_name: input_data})
         return outputs[0][0]
 
+    def predict_batch(self, input_data):
+        """Run the model on an NCHW batch and return the (N, 56, anchors) output."""
+        outputs = self.session.run(self.output_names, {self.input_name: input_data})
+        return outputs[0]
+
+    def _predict_chunk(self, input_data, size):
+        """Run a chunk of up to `size` frames, zero-padding the last partial chunk of a fixed-batch model."""
+        count = len(input_data)
+        if count < size and self.max_batch_size:
+            padding = np.zeros((size - count,) + input_data.shape[1:], dtype=input_data.dtype)
+            input_data = np.concatenate((input_data, padding))
+        return self.predict_batch(input_data)[:count]
+
     def get_poses(self, frame):
         preprocessed_frame = self.preprocess(frame)
         output = self.predict(preprocessed_frame)
+        return self.decode(output, self.scale, self.pad_w, self.pad_h)
+
+    def get_poses_batch(self, frames):
+        """
+        Estimate poses for several frames (e.g. one per camera) with a single inference call.
+        Parameters:
+            frames (list): BGR images, any size.
+        Returns:
+            tuple: (list of per-frame detections as returned by get_poses, list of Letterbox per frame).
+        """
+        if not frames:
+            return [], []
+
+        batch, letterboxes = self.preprocessor(frames)
+
+        # Models exported with a fixed batch axis are run in chunks of that size
+        chunk = self.max_batch_size or len(frames)
+        outputs = np.concatenate(
+            [self._predict_chunk(batch[i : i + chunk], chunk) for i in range(0, len(frames), chunk)]
+        )
 
-        bboxes = []
-        confidences = []
-        all_keypoints = []
-
-        # Collect all bounding boxes and keypoints
-        for i in range(output.shape[1]):
-            detection = output[:, i]
-            confidence = detection[4]
-            if confidence > PoseEstimationServiceConstants.BBOX_CONF_THRESHOLD:
-                xywh = detection[:4]
-                x, y, w, h = xywh
-
-                # Adjust bounding box back to the original image scale
-                x_min = (x - w / 2 - self.pad_w) / self.scale
-                y_min = (y - h / 2 - self.pad_h) / self.scale
-                x_max = (x + w / 2 - self.pad_w) / self.scale
-                y_max = (y + h / 2 - self.pad_h) / self.scale
-                bbox = [int(x_min), int(y_min), int(x_max), int(y_max)]
-
-                # Collect bounding boxes and confidences for NMS
-                bboxes.append(bbox)
-                confidences.append(float(confidence))
-
-                # Adjust keypoints back to the original image scale
-                keypoints = detection[5:56].reshape(-1, 3)
-                for keypoint in keypoints:
-                    keypoint[0] = (keypoint[0] - self.pad_w) / self.scale
-                    keypoint[1] = (keypoint[1] - self.pad_h) / self.scale
-
-                all_keypoints.append((bbox, keypoints, float(confidence)))
-
-        # Apply NMS
-        indices = non_max_suppression(bboxes, confidences)
-        filtered_keypoints = [all_keypoints[i] for i in indices]
-
-        return filtered_keypoints
+        poses = [
+            self.decode(output, letterbox.scale, letterbox.pad_w, letterbox.pad_h)
+            for output, letterbox in zip(outputs, letterboxes)
+        ]
+        return poses, letterboxes
+
+    def get_poses_regions(self, frames, regions, iou_threshold=0.5):
+        """
+        Estimate poses on crops of several frames with a single inference call.
+        Parameters:
+            frames (list): BGR images, any size.
+            regions (list): Per frame, a (K, 4) xyxy array of crops, e.g. from roi.plan_regions.
+            iou_threshold (float): Overlap above which a person detected in two crops is kept once.
+        Returns:
+            list: Per-frame detections in frame coordinates, as returned by get_poses.
+        """
+        crops, counts = [], []
+        for frame, frame_regions in zip(frames, regions):
+            crops.extend(frame[y_min:y_max, x_min:x_max] for x_min, y_min, x_max, y_max in frame_regions.tolist())
+            counts.append(len(frame_regions))
+        crop_poses, _ = self.get_poses_batch(crops)
+
+        poses, start = [], 0
+        for frame_regions, count in zip(regions, counts):
+            poses.append(merge_region_detections(crop_poses[start : start + count], frame_regions, iou_threshold))
+            start += count
+        return poses
+
+    def decode(self, output, scale, pad_w, pad_h):
+        """
+        Turn a raw model output into (bbox, keypoints, confidence) tuples in original image coordinates.
+        Parameters:
+            output (np.array): Model output of shape (56, num_anchors).
+            scale (float): Letterbox scale factor used in preprocessing.
+            pad_w (int): Horizontal letterbox padding.
+            pad_h (int): Vertical letterbox padding.
+        Returns:
+            list: Detections that survived confidence filtering and NMS.
+        """
+        if self.vectorized:
+            return decode_poses(output, scale, pad_w, pad_h)
+        return decode_poses_loop(output, scale, pad_w, pad_h)
+
+
+def decode_poses(output, scale, pad_w, pad_h, conf_threshold=None, iou_threshold=NMS_IOU_THRESHOLD):
+    """Vectorized equivalent of `decode_poses_loop`."""
+    if conf_threshold is None:
+        conf_threshold = PoseEstimationServiceConstants.BBOX_CONF_THRESHOLD
+
+    # Keep only the anchors above the confidence threshold, as (K, 56) rows
+    candidates = output[:, output[4] > conf_threshold].T
+    if candidates.shape[0] == 0:
+        return []
+
+    # Convert xywh to xyxy and undo the letterbox for all boxes at once
+    xy, half_wh = candidates[:, :2], candidates[:, 2:4] / 2
+    pad = np.array([pad_w, pad_h], dtype=candidates.dtype)
+    xyxy = np.concatenate(((xy - half_wh - pad) / scale, (xy + half_wh - pad) / scale), axis=1)
+    bboxes = xyxy.astype(np.int64).tolist()
+    confidences = candidates[:, 4].tolist()
+
+    # Rescale every keypoint of every candidate through broadcasting
+    keypoints = candidates[:, 5:56].reshape(-1, 17, 3).copy()
+    keypoints[:, :, :2] = (keypoints[:, :, :2] - pad) / scale
+
+    indices = nms(xyxy, candidates[:, 4], iou_threshold=iou_threshold, fmt="xyxy")
+    return [(bboxes[i], keypoints[i], confidences[i]) for i in indices]
+
+
+def decode_poses_loop(output, scale, pad_w, pad_h, conf_threshold=None, iou_threshold=NMS_IOU_THRESHOLD):
+    """Reference per-anchor decode, kept for benchmarking and verification."""
+    if conf_threshold is None:
+        conf_threshold = PoseEstimationServiceConstants.BBOX_CONF_THRESHOLD
+
+    bboxes = []
+    confidences = []
+    all_keypoints = []
+
+    # Collect all bounding boxes and keypoints
+    for i in range(output.shape[1]):
+        detection = output[:, i]
+        confidence = detection[4]
+        if confidence > conf_threshold:
+            xywh = detection[:4]
+            x, y, w, h = xywh
+
+            # Adjust bounding box back to the original image scale
+            x_min = (x - w / 2 - pad_w) / scale
+            y_min = (y - h / 2 - pad_h) / scale
+            x_max = (x + w / 2 - pad_w) / scale
+            y_max = (y + h / 2 - pad_h) / scale
+            bbox = [int(x_min), int(y_min), int(x_max), int(y_max)]
+
+            # Collect bounding boxes and confidences for NMS
+            bboxes.append(bbox)
+            confidences.append(float(confidence))
+
+            # Adjust keypoints back to the original image scale
+            keypoints = detection[5:56].reshape(-1, 3).copy()
+            keypoints[:, 0] = (keypoints[:, 0] - pad_w) / scale
+            keypoints[:, 1] = (keypoints[:, 1] - pad_h) / scale
+
+            all_keypoints.append((bbox, keypoints, float(confidence)))
+
+    # Apply NMS
+    indices = nms(np.array(bboxes).reshape(-1, 4), confidences, iou_threshold=iou_threshold, fmt="xyxy")
+    filtered_keypoints = [all_keypoints[i] for i in indices]
+
+    return filtered_keypoints
@@ -0,0 +1,276 @@
+import heapq
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import zlib
+from collections import defaultdict
+from dataclasses import replace
+
+from common.metric_registry import MetricRegistry
+from common.service import STOP_SENTINEL
+
+from .config import SessionConfig
+from .scheduler import FrameRateScheduler
+from .service import PoseEstimationService
+
+
+class FrameResequencer:
+    """
+    Restores per-camera dispatch order for frames coming back from several workers.
+
+    Frames are ordered by FrameData.sequence, a gap-free per-camera counter assigned when a frame is
+    dispatched, rather than by FrameData.index, which has gaps wherever capture or scheduling dropped frames.
+    Frames a worker discards are reported with `skip` so they are not waited for. Frames wait in a per-camera
+    heap until they are next in line; a missing frame is still given up on once the waiting frame is older than
+    `max_delay` seconds or more than `window` frames are held. Frames that arrive after a later one was emitted
+    are discarded.
+    """
+
+    def __init__(self, window=32, max_delay=0.2, on_drop=None):
+        self.window = window
+        self.max_delay = max_delay
+        self.on_drop = on_drop
+        self.pending = defaultdict(list)  # camera_id -> heap of (sequence, arrival, tie, frame_data)
+        self.skipped = defaultdict(set)  # camera_id -> sequences discarded before reaching the resequencer
+        self.last_sequence = {}
+        self.counter = 0
+        self.late = 0
+
+    def push(self, frame_data):
+        """Add a processed frame and return the frames that can now be emitted, in order."""
+        camera_id = frame_data.camera_id
+        if frame_data.sequence <= self.last_sequence.get(camera_id, -1):
+            self.late += 1
+            if self.on_drop is not None:
+                self.on_drop(frame_data)
+            return []
+        self.counter += 1
+        heapq.heappush(self.pending[camera_id], (frame_data.sequence, time.monotonic(), self.counter, frame_data))
+        return self._ready(camera_id)
+
+    def skip(self, camera_id, sequence):
+        """Stop waiting for a frame that was discarded, and return the frames that can now be emitted."""
+        if sequence <= self.last_sequence.get(camera_id, -1):
+            return []
+        self.skipped[camera_id].add(sequence)
+        return self._ready(camera_id)
+
+    def flush(self, force=False):
+        """Emit frames that waited too long, or every pending frame when `force` is set."""
+        ready = []
+        for camera_id in list(self.pending):
+            ready.extend(self._ready(camera_id, force))
+        return ready
+
+    def _ready(self, camera_id, force=False):
+        heap = self.pending[camera_id]
+        skipped = self.skipped[camera_id]
+        last = self.last_sequence.get(camera_id, -1)
+        ready = []
+        now = time.monotonic()
+        while True:
+            while last + 1 in skipped:
+                skipped.discard(last + 1)
+                last += 1
+            if not heap:
+                break
+            sequence, arrival, _, frame_data = heap[0]
+            in_order = sequence == last + 1
+            if not (force or in_order or len(heap) > self.window or now - arrival > self.max_delay):
+                break
+            heapq.heappop(heap)
+            last = sequence
+            ready.append(frame_data)
+
+        self.last_sequence[camera_id] = last
+        if skipped:
+            # Forget discarded frames that were given up on anyway
+            skipped.difference_update([sequence for sequence in skipped if sequence <= last])
+        if not heap:
+            del self.pending[camera_id]
+        if not skipped:
+            del self.skipped[camera_id]
+        return ready
+
+
+class PoseEstimationPool:
+    """
+    Runs several PoseEstimationService workers, each with its own ONNX session.
+
+    Frames from `input_queue` are sharded by camera so each camera sticks to one worker, or spread over all
+    workers when `spread_cameras` is set (useful when there are fewer cameras than workers). Results are
+    re-sequenced per camera in dispatch order before being put on `output_queue`. With a scheduler, frames
+    beyond each camera's activity-based rate are dropped before dispatch.
+    """
+
+    def __init__(
+        self,
+        name,
+        input_queue,
+        output_queue,
+        model_path,
+        num_workers=2,
+        session_config=None,
+        spread_cameras=False,
+        resequencer=None,
+        scheduler_config=None,
+        activity_queue=None,
+        **service_kwargs,
+    ):
+        self.name = name
+        self.input_queue = input_queue
+        self.output_queue = output_queue
+        self.spread_cameras = spread_cameras
+        self.frame_ring = service_kwargs.get("frame_ring")
+        self.resequencer = resequencer or FrameResequencer(on_drop=self._release)
+        self.logger = logging.getLogger(self.name)
+        self.metrics = MetricRegistry()
+        scheduling = scheduler_config is not None and scheduler_config.enabled
+        self.scheduler = FrameRateScheduler(scheduler_config, self.metrics) if scheduling else None
+        self.activity_queue = activity_queue  # (camera id, open events) reports, e.g. from EventDetectionService
+
+        # Split the cores between sessions unless told otherwise
+        session_config = session_config or SessionConfig()
+        if not session_config.intra_op_num_threads:
+            session_config = replace(session_config, intra_op_num_threads=max(1, (os.cpu_count() or 1) // num_workers))
+
+        self.results_queue = multiprocessing.Queue()
+        self.drop_queue = multiprocessing.Queue()  # (camera id, sequence) of frames the workers discarded
+        self.worker_queues = [multiprocessing.Queue() for _ in range(num_workers)]
+        self.workers = [
+            PoseEstimationService(
+                f"{name}-{i}",
+                worker_queue,
+                self.results_queue,
+                model_path,
+                session_config=session_config,
+                drop_queue=self.drop_queue,
+                **service_kwargs,
+            )
+            for i, worker_queue in enumerate(self.worker_queues)
+        ]
+        self.running = threading.Event()
+        self.collecting = threading.Event()  # Cleared after the workers, so their results are read until they exit
+        self.threads = []
+        self.dispatched = 0
+        self.sequences = defaultdict(int)  # camera_id -> next dispatch sequence
+
+    def shard(self, frame_data):
+        """Return the worker index for a frame."""
+        if self.spread_cameras:
+            return self.dispatched % len(self.workers)
+        # crc32 rather than hash() so the mapping is stable across processes and runs
+        return zlib.crc32(str(frame_data.camera_id).encode()) % len(self.workers)
+
+    def start(self):
+        """Start the workers and the dispatch and collection threads."""
+        if self.running.is_set():
+            return
+        self.running.set()
+        self.collecting.set()
+        for worker in self.workers:
+            worker.start()
+        self.dispatch_thread = threading.Thread(target=self._dispatch, name=f"{self.name}-dispatch", daemon=True)
+        self.collect_thread = threading.Thread(target=self._collect, name=f"{self.name}-collect", daemon=True)
+        self.threads = [self.dispatch_thread, self.collect_thread]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        """
+        Stop the workers and flush every frame still waiting for re-sequencing.
+
+        Dispatching stops first. The workers then process every frame already dispatched to them while the
+        collector keeps reading their results: a worker only exits once the results it queued have been read,
+        so stopping the collector first would deadlock.
+        """
+        if not self.running.is_set():
+            return
+        self.running.clear()
+        self.dispatch_thread.join()
+        for worker in self.workers:
+            worker.stop(drain=True)
+        self.collecting.clear()
+        self.collect_thread.join()
+
+        # Collect results that arrived after the collector's last read
+        ready = []
+        while True:
+            try:
+                ready.extend(self.resequencer.push(self.results_queue.get(timeout=0.1)))
+            except queue.Empty:
+                break
+        ready.extend(self._drain_drops())
+        ready.extend(self.resequencer.flush(force=True))
+        for frame_data in ready:
+            self.output_queue.put(frame_data)
+        self.logger.info("Pose estimation pool stopped.")
+
+    def utilization(self):
+        """Return the busy fraction of each worker."""
+        return [worker.utilization()[2] for worker in self.workers]
+
+    def startup_times(self):
+        """Return the model startup time of each worker, 0 until it has loaded."""
+        return [worker.startup_time.value for worker in self.workers]
+
+    def _release(self, frame_data):
+        """Free the shared-memory slot of a frame that arrived too late to be emitted."""
+        if self.frame_ring is not None:
+            self.frame_ring.release(frame_data)
+
+    def _dispatch(self):
+        while self.running.is_set():
+            try:
+                frame_data = self.input_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if frame_data is STOP_SENTINEL:
+                break
+            if self.scheduler is not None and not self.scheduler.admit(
+                frame_data.camera_id, frame_data.timestamp.timestamp()
+            ):
+                self._release(frame_data)
+                continue
+            frame_data.sequence = self.sequences[frame_data.camera_id]
+            self.sequences[frame_data.camera_id] += 1
+            self.worker_queues[self.shard(frame_data)].put(frame_data)
+            self.dispatched += 1
+
+    def _collect(self):
+        while self.collecting.is_set():
+            try:
+                ready = self.resequencer.push(self.results_queue.get(timeout=self.resequencer.max_delay))
+            except queue.Empty:
+                ready = []
+            ready.extend(self._drain_drops())
+            ready.extend(self.resequencer.flush())
+            for frame_data in ready:
+                if self.scheduler is not None:
+                    self.scheduler.observe(frame_data.camera_id, len(frame_data.people))
+                self.output_queue.put(frame_data)
+            self._drain_activity()
+
+    def _drain_drops(self):
+        """Tell the resequencer about frames the workers discarded, returning the frames that became ready."""
+        ready = []
+        while True:
+            try:
+                camera_id, sequence = self.drop_queue.get_nowait()
+            except queue.Empty:
+                return ready
+            ready.extend(self.resequencer.skip(camera_id, sequence))
+
+    def _drain_activity(self):
+        """Feed open event reports into the scheduler."""
+        if self.activity_queue is None or self.scheduler is None:
+            return
+        while True:
+            try:
+                camera_id, open_events = self.activity_queue.get_nowait()
+            except queue.Empty:
+                return
+            self.scheduler.observe(camera_id, open_events=open_events)
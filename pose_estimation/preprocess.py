@@ -0,0 +1,126 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+
+@dataclass
+class Letterbox:
+    """Scaling and padding applied to a frame to fit the model input."""
+
+    scale: float
+    pad_w: int
+    pad_h: int
+
+
+@dataclass
+class _Layout:
+    """Precomputed letterbox geometry and padded canvas for one source frame size."""
+
+    letterbox: Letterbox
+    new_w: int
+    new_h: int
+    canvas: np.ndarray  # uint8 HWC image of model input size, padding stays black
+    resized: np.ndarray  # View of the canvas the resized frame is written into
+
+
+def compute_letterbox(original_w, original_h, input_w, input_h):
+    """Return (Letterbox, new_w, new_h) for fitting a frame into the model input."""
+    # Compute the scaling factor to fit the image within input_w x input_h
+    scale = min(input_w / original_w, input_h / original_h)
+
+    # Resize the image while maintaining aspect ratio
+    new_w = round(original_w * scale)
+    new_h = round(original_h * scale)
+
+    # Pad the resized image to match the exact input size
+    pad_w = (input_w - new_w) // 2
+    pad_h = (input_h - new_h) // 2
+    return Letterbox(scale, pad_w, pad_h), new_w, new_h
+
+
+class LetterboxPreprocessor:
+    """
+    Letterboxes frames into a preallocated float32 NCHW buffer.
+
+    Each source frame size gets a cached padded uint8 canvas that the resized frame is written into
+    directly, and BGR->RGB, normalization and HWC->CHW are fused into one pass per channel straight
+    into the input buffer. After warm-up no per-frame arrays are allocated.
+
+    The returned tensors are views into the shared buffer and are overwritten by the next call.
+    """
+
+    def __init__(self, input_w, input_h, batch_size=1, max_layouts=64):
+        self.input_w = input_w
+        self.input_h = input_h
+        self.layouts = OrderedDict()  # Least recently used source sizes are evicted beyond max_layouts
+        self.max_layouts = max_layouts
+        self.buffer = np.zeros((batch_size, 3, input_h, input_w), dtype=np.float32)
+        self.norm = np.float32(1.0 / 255.0)
+
+    def _layout(self, frame):
+        original_h, original_w = frame.shape[:2]
+        layout = self.layouts.get((original_h, original_w))
+        if layout is not None:
+            self.layouts.move_to_end((original_h, original_w))
+        else:
+            letterbox, new_w, new_h = compute_letterbox(original_w, original_h, self.input_w, self.input_h)
+            canvas = np.zeros((self.input_h, self.input_w, 3), dtype=np.uint8)
+            resized = canvas[letterbox.pad_h : letterbox.pad_h + new_h, letterbox.pad_w : letterbox.pad_w + new_w]
+            layout = _Layout(letterbox, new_w, new_h, canvas, resized)
+            self.layouts[(original_h, original_w)] = layout
+            if len(self.layouts) > self.max_layouts:
+                self.layouts.popitem(last=False)
+        return layout
+
+    def _ensure_batch(self, batch_size):
+        if batch_size > self.buffer.shape[0]:
+            self.buffer = np.zeros((batch_size, 3, self.input_h, self.input_w), dtype=np.float32)
+
+    def fill(self, frame, slot=0):
+        """
+        Letterbox one frame into a slot of the input buffer.
+        Parameters:
+            frame (np.array): BGR uint8 image.
+            slot (int): Batch index to write into.
+        Returns:
+            Letterbox: Geometry needed to map detections back to the frame.
+        """
+        self._ensure_batch(slot + 1)
+        layout = self._layout(frame)
+        cv2.resize(frame, (layout.new_w, layout.new_h), dst=layout.resized)
+
+        # BGR->RGB, /255 and HWC->CHW in one strided pass per channel
+        out = self.buffer[slot]
+        for channel in range(3):
+            np.multiply(layout.canvas[:, :, 2 - channel], self.norm, out=out[channel], dtype=np.float32)
+        return layout.letterbox
+
+    def __call__(self, frames):
+        """Letterbox frames into the buffer and return (NCHW view, list of Letterbox)."""
+        self._ensure_batch(len(frames))
+        letterboxes = [self.fill(frame, slot) for slot, frame in enumerate(frames)]
+        return self.buffer[: len(frames)], letterboxes
+
+
+def letterbox_copy(frame, input_w, input_h):
+    """Reference allocating letterbox, kept for benchmarking. Returns (CHW float32 image, Letterbox)."""
+    original_h, original_w = frame.shape[:2]
+    letterbox, new_w, new_h = compute_letterbox(original_w, original_h, input_w, input_h)
+    resized_frame = cv2.resize(frame, (new_w, new_h))
+    padded_frame = cv2.copyMakeBorder(
+        resized_frame,
+        letterbox.pad_h,
+        input_h - new_h - letterbox.pad_h,
+        letterbox.pad_w,
+        input_w - new_w - letterbox.pad_w,
+        cv2.BORDER_CONSTANT,
+        value=(0, 0, 0),
+    )
+
+    # Normalize and prepare for model input
+    rgb_img = cv2.cvtColor(padded_frame, cv2.COLOR_BGR2RGB)
+    normalized_img = rgb_img.astype(np.float32) / 255.0
+    chw_img = np.transpose(normalized_img, (2, 0, 1))
+    return chw_img, letterbox
@@ -0,0 +1,141 @@
+import argparse
+import glob
+import os
+
+import cv2
+import onnx  # type: ignore
+from constants import PoseEstimationServiceConstants
+from onnxruntime.quantization import (  # type: ignore
+    CalibrationDataReader,
+    CalibrationMethod,
+    QuantFormat,
+    QuantType,
+    quantize_static,
+)
+
+from .config import variant_model_path
+from .preprocess import LetterboxPreprocessor
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def load_frames(path, limit=None, stride=1):
+    """
+    Load recorded frames from a directory of images or a video file.
+    Parameters:
+        path (str): Directory of images or a video file.
+        limit (int): Max number of frames to return.
+        stride (int): Keep every Nth frame, so a short clip still covers varied scenes.
+    Returns:
+        list: BGR images.
+    """
+    frames = []
+    if os.path.isdir(path):
+        files = sorted(f for f in glob.glob(os.path.join(path, "*")) if f.lower().endswith(IMAGE_EXTENSIONS))
+        for file in files[::stride]:
+            frames.append(cv2.imread(file))
+            if limit and len(frames) >= limit:
+                break
+        return frames
+
+    capture = cv2.VideoCapture(path)
+    index = 0
+    while not limit or len(frames) < limit:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        if index % stride == 0:
+            frames.append(frame)
+        index += 1
+    capture.release()
+    return frames
+
+
+class FrameCalibrationReader(CalibrationDataReader):
+    """Feeds letterboxed recorded frames to the ONNX Runtime calibrator, one at a time."""
+
+    def __init__(self, frames, input_name="images"):
+        self.input_name = input_name
+        self.preprocessor = LetterboxPreprocessor(
+            PoseEstimationServiceConstants.INPUT_W, PoseEstimationServiceConstants.INPUT_H
+        )
+        self.frames = iter(frames)
+
+    def get_next(self):
+        frame = next(self.frames, None)
+        if frame is None:
+            return None
+        input_data, _ = self.preprocessor([frame])
+        # The preprocessor buffer is reused, so hand the calibrator its own copy
+        return {self.input_name: input_data.copy()}
+
+
+def quantize_int8(model_path, frames, output_path=None, per_channel=True, calibration_method="minmax"):
+    """
+    Build a static INT8 (QDQ) model calibrated on recorded frames.
+    Parameters:
+        model_path (str): FP32 model.
+        frames (list): Calibration images, ideally a few hundred covering day/night and crowded/empty scenes.
+        output_path (str): Where to write the model, defaults to the "int8" variant path.
+        per_channel (bool): Quantize weights per output channel, which keeps keypoint accuracy closer to FP32.
+        calibration_method (str): "minmax", "entropy" or "percentile".
+    Returns:
+        str: Path of the quantized model.
+    """
+    output_path = output_path or variant_model_path(model_path, "int8")
+    methods = {
+        "minmax": CalibrationMethod.MinMax,
+        "entropy": CalibrationMethod.Entropy,
+        "percentile": CalibrationMethod.Percentile,
+    }
+    quantize_static(
+        model_path,
+        output_path,
+        FrameCalibrationReader(frames, input_name=onnx.load(model_path).graph.input[0].name),
+        quant_format=QuantFormat.QDQ,
+        per_channel=per_channel,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        calibrate_method=methods[calibration_method],
+    )
+    return output_path
+
+
+def convert_fp16(model_path, output_path=None):
+    """Write an FP16 copy of the model that keeps FP32 inputs and outputs."""
+    try:
+        from onnxconverter_common import float16  # type: ignore
+    except ImportError as e:
+        raise ImportError("FP16 conversion requires the onnxconverter-common package") from e
+
+    output_path = output_path or variant_model_path(model_path, "fp16")
+    model = float16.convert_float_to_float16(onnx.load(model_path), keep_io_types=True)
+    onnx.save(model, output_path)
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="quantize pose model",
+        description="builds INT8 or FP16 variants of the pose model",
+    )
+    parser.add_argument("--model_path", type=str, required=True, help="path to the FP32 model")
+    parser.add_argument("--precision", type=str, choices=["int8", "fp16"], default="int8", help="variant to build")
+    parser.add_argument("--frames", type=str, help="directory of images or video used for INT8 calibration")
+    parser.add_argument("--limit", type=int, default=300, help="max calibration frames")
+    parser.add_argument("--stride", type=int, default=10, help="use every Nth recorded frame")
+    parser.add_argument("--output_path", type=str, default=None, help="where to write the variant")
+    args = parser.parse_args()
+
+    if args.precision == "fp16":
+        output_path = convert_fp16(args.model_path, args.output_path)
+    else:
+        if not args.frames:
+            parser.error("--frames is required for INT8 calibration")
+        frames = load_frames(args.frames, limit=args.limit, stride=args.stride)
+        output_path = quantize_int8(args.model_path, frames, args.output_path)
+    print(f"Saved {args.precision} model to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from kit.box_ops import merge_boxes, nms
+
+
+@dataclass
+class RoiConfig:
+    """Settings for running pose estimation on regions of interest instead of whole frames."""
+
+    enabled: bool = False
+    margin: float = 0.15  # Regions grow by this fraction of their larger side, so persons are not cut off
+    align: int = 64  # Region sides are rounded up to multiples of this, to limit distinct crop sizes
+    max_regions: int = 4  # More merged regions than this and the whole frame is inferred instead
+    max_area_fraction: float = 0.6  # Same when the regions cover more than this share of the frame
+    iou_threshold: float = 0.5  # Duplicates of a person found in two overlapping regions are suppressed
+    # Camera id (entry of Config.camera_sources) -> (x, y, width, height) zones inferred on every frame
+    zones: dict = field(default_factory=dict)
+
+    def camera_rois(self, camera_id, rois):
+        """A frame's regions of interest, e.g. from motion gating, plus the zones configured for its camera."""
+        return list(rois) + [tuple(zone) for zone in self.zones.get(camera_id, ())]
+
+
+def plan_regions(frame_shape, rois, input_w, input_h, config: RoiConfig):
+    """
+    Turn a frame's regions of interest into the crops to run pose estimation on.
+
+    Regions are merged with merge_boxes, grown by a margin, enlarged to at least the model input size so
+    crops are never upscaled, rounded up to `align`, shifted back inside the frame and merged again.
+    Parameters:
+        frame_shape (tuple): Shape of the frame.
+        rois (list): (x, y, width, height) regions, e.g. FrameData.rois from motion gating or configured zones.
+        input_w (int): Model input width.
+        input_h (int): Model input height.
+        config (RoiConfig): Planning settings.
+    Returns:
+        np.array: (K, 4) int xyxy crops. A single full-frame crop when there are no regions, too many, or
+        they cover most of the frame.
+    """
+    height, width = frame_shape[:2]
+    full_frame = np.array([[0, 0, width, height]], dtype=np.int64)
+    if not rois:
+        return full_frame
+
+    regions = merge_boxes(np.asarray(rois, dtype=np.float32), fmt="xywh")
+    sides = regions[:, 2:].max(axis=1, keepdims=True)
+    size = regions[:, 2:] + 2 * config.margin * sides
+    size = np.maximum(size, [min(input_w, width), min(input_h, height)])
+    size = np.minimum(np.ceil(size / config.align) * config.align, [width, height])
+    centers = regions[:, :2] + regions[:, 2:] / 2
+    top_left = np.clip(np.round(centers - size / 2), 0, [width, height] - size)
+    regions = merge_boxes(np.concatenate((top_left, size), axis=1), distance_thresh=0.0, fmt="xywh")
+
+    areas = regions[:, 2] * regions[:, 3]
+    if len(regions) > config.max_regions or areas.sum() > config.max_area_fraction * width * height:
+        return full_frame
+    crops = np.concatenate((regions[:, :2], regions[:, :2] + regions[:, 2:]), axis=1)
+    return np.clip(np.round(crops), 0, [width, height, width, height]).astype(np.int64)
+
+
+def merge_region_detections(region_detections, regions, iou_threshold=0.5):
+    """
+    Map detections made on crops back to frame coordinates and drop duplicates across crops.
+    Parameters:
+        region_detections (list): Per crop, the (bbox, keypoints, confidence) tuples returned by PoseModel.
+        regions (np.array): (K, 4) xyxy crops the detections were made on.
+        iou_threshold (float): Boxes overlapping a more confident one by more than this are dropped.
+    Returns:
+        list: (bbox, keypoints, confidence) tuples in frame coordinates.
+    """
+    detections = []
+    for (x_min, y_min, _, _), crop_detections in zip(regions.tolist(), region_detections):
+        for bbox, keypoints, confidence in crop_detections:
+            keypoints = keypoints.copy()
+            keypoints[:, 0] += x_min
+            keypoints[:, 1] += y_min
+            bbox = [bbox[0] + x_min, bbox[1] + y_min, bbox[2] + x_min, bbox[3] + y_min]
+            detections.append((bbox, keypoints, confidence))
+    if len(regions) < 2 or len(detections) < 2:
+        return detections
+    keep = nms(
+        np.array([bbox for bbox, _, _ in detections]),
+        [confidence for _, _, confidence in detections],
+        iou_threshold=iou_threshold,
+    )
+    return [detections[i] for i in keep]
@@ -0,0 +1,139 @@
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+from common.metric_registry import MetricRegistry
+
+
+@dataclass
+class SchedulerConfig:
+    """Settings for FrameRateScheduler."""
+
+    enabled: bool = False
+    budget_fps: float = 40.0  # Frames per second all cameras together may send to the pose workers
+    min_fps: float = 1.0  # Rate of idle cameras
+    max_fps: float = 10.0  # Rate cap of the busiest cameras, at most Config.capture_fps
+    alpha: float = 0.2  # Weight of the newest observation in a camera's activity average
+    event_weight: float = 5.0  # An open event counts as this many persons
+    idle_activity: float = 0.1  # Cameras averaging less activity than this are idle
+    update_interval: float = 1.0  # Seconds between rate reassignments
+
+
+class FrameRateScheduler:
+    """
+    Gives each camera an analysis rate from its recent activity, within a global frame budget.
+
+    Activity is a moving average of persons detected plus weighted open events per analyzed frame. Every
+    camera is guaranteed `min_fps`; the rest of the budget is split among active cameras in proportion to their
+    activity, capped at `max_fps`, with any excess handed on to the others. Frames arriving faster than their
+    camera's rate are not admitted. Target and effective rates are published as gauges in the
+    "frame_scheduler" group of the metric registry. Thread-safe: admission and observations may come from
+    different threads.
+    """
+
+    def __init__(self, config: SchedulerConfig, metrics: MetricRegistry | None = None):
+        self.config = config
+        self.metrics = metrics or MetricRegistry()
+        self.lock = threading.Lock()
+        self.people = {}  # camera id -> moving average of persons per analyzed frame
+        self.events = {}  # camera id -> moving average of open events per analyzed frame
+        self.rates = {}  # camera id -> frames per second currently assigned
+        self.last_admitted = {}  # camera id -> timestamp in seconds of the last admitted frame
+        self.admitted = {}  # camera id -> frames admitted since the last rate update
+        self.rejected = 0
+        self.last_update = None
+
+    def admit(self, camera_id, timestamp):
+        """
+        Decide whether a camera's frame goes to pose estimation.
+        Parameters:
+            camera_id: Camera the frame came from.
+            timestamp (float): Capture time in seconds.
+        Returns:
+            bool: True if the frame is due at the camera's current rate.
+        """
+        with self.lock:
+            if camera_id not in self.rates:
+                self.rates[camera_id] = self.config.min_fps
+                self.admitted[camera_id] = 0
+            if self.last_update is None:
+                self.last_update = timestamp
+            elif timestamp - self.last_update >= self.config.update_interval:
+                self._update(timestamp)
+
+            # 10% slack absorbs capture jitter so a camera sending exactly at its rate is not halved
+            last = self.last_admitted.get(camera_id)
+            if last is not None and timestamp - last < 0.9 / self.rates[camera_id]:
+                self.rejected += 1
+                return False
+            self.last_admitted[camera_id] = timestamp
+            self.admitted[camera_id] += 1
+            return True
+
+    def observe(self, camera_id, num_people=None, open_events=None):
+        """Fold the results of an analyzed frame into its camera activity, from pose estimation or event detection."""
+        alpha = self.config.alpha
+        with self.lock:
+            if num_people is not None:
+                self.people[camera_id] = alpha * num_people + (1 - alpha) * self.people.get(camera_id, 0.0)
+            if open_events is not None:
+                self.events[camera_id] = alpha * open_events + (1 - alpha) * self.events.get(camera_id, 0.0)
+
+    def activity(self, camera_id):
+        return self.people.get(camera_id, 0.0) + self.config.event_weight * self.events.get(camera_id, 0.0)
+
+    def assign(self, activity):
+        """
+        Split the budget over cameras.
+        Parameters:
+            activity (np.array): (C,) activity per camera.
+        Returns:
+            np.array: (C,) frames per second per camera.
+        """
+        config = self.config
+        count = len(activity)
+        if not count:
+            return np.zeros(0)
+        if config.budget_fps <= count * config.min_fps:
+            return np.full(count, config.budget_fps / count)
+
+        rates = np.full(count, config.min_fps)
+        weights = np.where(activity >= config.idle_activity, activity, 0.0)
+        remaining = config.budget_fps - rates.sum()
+        # Water-filling: cameras that hit max_fps pass their share on, at most one round per camera
+        while remaining > 1e-9 and weights.sum() > 0:
+            share = remaining * weights / weights.sum()
+            headroom = config.max_fps - rates
+            granted = np.minimum(share, headroom)
+            rates += granted
+            remaining -= granted.sum()
+            weights = np.where(rates < config.max_fps - 1e-9, weights, 0.0)
+        return rates
+
+    def _update(self, timestamp):
+        """Reassign rates and publish metrics. Called with the lock held."""
+        elapsed = timestamp - self.last_update
+        cameras = list(self.rates)
+        rates = self.assign(np.array([self.activity(camera_id) for camera_id in cameras]))
+        for camera_id, rate in zip(cameras, rates.tolist()):
+            self.rates[camera_id] = rate
+            self._gauge(f"{camera_id}.target_fps", rate)
+            self._gauge(f"{camera_id}.effective_fps", self.admitted[camera_id] / elapsed)
+            self._gauge(f"{camera_id}.activity", self.activity(camera_id))
+            self.admitted[camera_id] = 0
+        self.last_update = timestamp
+
+    def _gauge(self, metric_name, value):
+        metric = self.metrics.get_metric("frame_scheduler", metric_name)
+        if metric is None:
+            self.metrics.add_gauge("frame_scheduler", metric_name)
+            metric = self.metrics.get_metric("frame_scheduler", metric_name)
+        metric.set_value(value)
+
+    def effective_fps(self):
+        """Return {camera id: frames per second admitted over the last update interval}."""
+        return {
+            camera_id: self.metrics.get_metric("frame_scheduler", f"{camera_id}.effective_fps").get_value()
+            for camera_id in self.rates
+            if self.metrics.get_metric("frame_scheduler", f"{camera_id}.effective_fps") is not None
+        }
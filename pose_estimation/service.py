@@ -1,42 +1,163 @@
+import multiprocessing
 import queue
 import time
 
-from common.person import Person
-from common.service import ServiceBase
+from common.metric_registry import MetricRegistry
+from common.person import PersonBatch
+from common.service import STOP_SENTINEL, ServiceBase
 
+from .frame_policy import FrameBuffer, QueuePolicy
+from .head_pose import annotate_heads
 from .model import PoseModel
+from .roi import plan_regions
 
 
 class PoseEstimationService(ServiceBase):
-    def __init__(self, name, input_queue, output_queue, model_path):
+    def __init__(
+        self,
+        name,
+        input_queue,
+        output_queue,
+        model_path,
+        batch_size=1,
+        frame_ring=None,
+        get_timeout=0.5,
+        queue_policy=None,
+        session_config=None,
+        head_pose=True,
+        roi_config=None,
+        drop_queue=None,
+        release_frames=True,
+    ):
         super().__init__(name)
         self.input_queue = input_queue
         self.output_queue = output_queue
         self.model_path = model_path
+        self.batch_size = batch_size  # Max frames (e.g. one per camera) inferred together
+        self.frame_ring = frame_ring  # SharedFrameRing holding the pixels of incoming frames, if any
+        self.get_timeout = get_timeout  # Seconds to block on the input queue before re-checking the running flag
+        self.queue_policy = queue_policy or QueuePolicy()
+        self.session_config = session_config
+        self.head_pose = head_pose  # Fill head boxes and orientations from keypoints
+        self.roi_config = roi_config  # RoiConfig; when enabled only FrameData.rois and configured zones are inferred
+        self.drop_queue = drop_queue  # Receives (camera_id, sequence) of discarded frames, e.g. for a pool
+        self.release_frames = release_frames  # Free ring slots after inference; off when a later stage reads pixels
+
+        # Shared with the parent process so utilization can be read while the service runs
+        self.busy_time = multiprocessing.Value("d", 0.0)
+        self.idle_time = multiprocessing.Value("d", 0.0)
+        self.dropped_frames = multiprocessing.Value("i", 0)
+        self.skipped_frames = multiprocessing.Value("i", 0)
+        self.startup_time = multiprocessing.Value("d", 0.0)
 
     def run(self):
-        self.model = PoseModel(self.model_path)
-        self.logger.info("Starting pose estimation service.")
+        self.metrics = MetricRegistry()
+        self.model = PoseModel(self.model_path, session_config=self.session_config, metrics=self.metrics)
+        self.startup_time.value = self.model.startup_time
+        self.logger.info(f"Starting pose estimation service, model ready in {self.model.startup_time:.3f} seconds.")
+
+        self.frame_buffer = FrameBuffer(self.queue_policy, on_drop=self._release)
+        keep_running = True
 
         while self.running.is_set():  # Check the Event flag
-            start_time = time.time()
-
-            if not self.input_queue.empty():
-                # Run pose estimation model on the frame's image
-                frame_data = self.input_queue.get()
-                frame = frame_data.image
-                poses = self.model.get_poses(frame)
-
-                # Add detected poses to the FrameData
-                for bbox, keypoints, confidence in poses:
-                    person = Person(
-                        confidence=confidence, bbox=bbox, keypoints=keypoints
-                    )  # Assuming confidence is always 1.0 here
-                    frame_data.add_person(person)
-
-                # Push the processed FrameData with poses to the output queue
-                self.output_queue.put(frame_data)
-                end_time = time.time()
-                self.logger.info(f"Pose estimation processed in {end_time - start_time:.3f} seconds.")
+            # Block until a frame arrives unless frames are already buffered; after a stop sentinel only the
+            # frames already buffered are processed
+            idle_start = time.perf_counter()
+            keep_running = keep_running and self._receive(block=not self.frame_buffer)
+            start_time = time.perf_counter()
+            self._add_time(self.idle_time, start_time - idle_start)
+            self.dropped_frames.value = self.frame_buffer.dropped
+            self.skipped_frames.value = self.frame_buffer.skipped
+
+            batch = self.frame_buffer.pop(self.batch_size)
+            if batch:
+                self.process_batch(batch)
+                end_time = time.perf_counter()
+                self._add_time(self.busy_time, end_time - start_time)
+                self.logger.info(
+                    f"Pose estimation processed {len(batch)} frames in {end_time - start_time:.3f} seconds."
+                )
+            if not keep_running and not self.frame_buffer:
+                break
 
         self.logger.info("Pose estimation service stopped gracefully.")
+
+    def _receive(self, block, max_items=256):
+        """Move waiting frames from the input queue into the frame buffer. Returns False on a stop sentinel."""
+        try:
+            frame_data = self.input_queue.get(timeout=self.get_timeout) if block else self.input_queue.get_nowait()
+        except queue.Empty:
+            return True
+
+        received = 0
+        while frame_data is not STOP_SENTINEL:
+            self.frame_buffer.push(frame_data)
+            received += 1
+            if received >= max_items:
+                return True
+            try:
+                frame_data = self.input_queue.get_nowait()
+            except queue.Empty:
+                return True
+        return False
+
+    def _release(self, frame_data):
+        """Free resources held by a frame the queue policy discarded."""
+        if self.frame_ring is not None:
+            self.frame_ring.release(frame_data)
+        if self.drop_queue is not None and frame_data.sequence is not None:
+            self.drop_queue.put((frame_data.camera_id, frame_data.sequence))
+
+    def process_batch(self, batch):
+        """Run pose estimation on a batch of FrameData and push them to the output queue."""
+        # Map shared-memory frames back to their pixels without copying
+        if self.frame_ring is not None:
+            batch = [self.frame_ring.attach(frame_data) for frame_data in batch]
+
+        # Run pose estimation model on the frames' images, or on their regions of interest
+        images = [frame_data.image for frame_data in batch]
+        if self.roi_config is not None and self.roi_config.enabled:
+            for frame_data in batch:
+                frame_data.rois = self.roi_config.camera_rois(frame_data.camera_id, frame_data.rois)
+            regions = [
+                plan_regions(image.shape, frame_data.rois, self.model.input_w, self.model.input_h, self.roi_config)
+                for image, frame_data in zip(images, batch)
+            ]
+            poses_batch = self.model.get_poses_regions(images, regions, self.roi_config.iou_threshold)
+        else:
+            poses_batch, _ = self.model.get_poses_batch(images)
+
+        for frame_data, poses in zip(batch, poses_batch):
+            # Store detected poses on the FrameData as one columnar batch
+            frame_data.set_people(PersonBatch.from_detections(poses))
+            if self.head_pose:
+                annotate_heads(frame_data.people, frame_data.key_conf_th)
+
+            # Done with the pixels: free the slot before the frame is pickled onto the output queue
+            if self.frame_ring is not None and self.release_frames:
+                self.frame_ring.release(frame_data)
+
+            # Push the processed FrameData with poses to the output queue
+            self.output_queue.put(frame_data)
+
+    def stop(self, drain=False):
+        """
+        Wake the service with a stop sentinel, then wait for it to finish. With `drain`, every frame queued
+        before the sentinel is processed first.
+        """
+        if self.running.is_set():
+            self.input_queue.put(STOP_SENTINEL)
+            if drain:
+                self.join()
+        super().stop()
+
+    def utilization(self):
+        """Return (busy seconds, idle seconds, busy fraction) accumulated by the service loop."""
+        busy, idle = self.busy_time.value, self.idle_time.value
+        total = busy + idle
+        return busy, idle, busy / total if total > 0 else 0.0
+
+    @staticmethod
+    def _add_time(value, seconds):
+        with value.get_lock():
+            value.value += seconds
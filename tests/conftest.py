@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def empty_pose_model(tmp_path):
+    """Path of a tiny ONNX model with the pose model's input and output layout that never detects anyone."""
+    onnx = pytest.importorskip("onnx")
+    from onnx import TensorProto, helper
+
+    images = helper.make_tensor_value_info("images", TensorProto.FLOAT, ["batch", 3, 640, 640])
+    output = helper.make_tensor_value_info("output0", TensorProto.FLOAT, ["batch", 56, 8])
+    weights = helper.make_tensor("weights", TensorProto.FLOAT, [3, 56 * 8], np.zeros(3 * 56 * 8, np.float32))
+    shape = helper.make_tensor("shape", TensorProto.INT64, [3], [-1, 56, 8])
+    graph = helper.make_graph(
+        [
+            helper.make_node("ReduceMean", ["images"], ["pooled"], axes=[2, 3], keepdims=0),
+            helper.make_node("MatMul", ["pooled", "weights"], ["flat"]),
+            helper.make_node("Reshape", ["flat", "shape"], ["output0"]),
+        ],
+        "empty_pose",
+        [images],
+        [output],
+        [weights, shape],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)])
+    model.ir_version = 9
+    path = str(tmp_path / "empty_pose.onnx")
+    onnx.save(model, path)
+    return path
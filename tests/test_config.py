@@ -0,0 +1,27 @@
+import os
+
+import pytest
+import yaml
+from common.config import Config
+
+
+def example_config():
+    with open(os.path.join(os.path.dirname(__file__), os.pardir, "config.yaml.example")) as file:
+        return yaml.safe_load(file)
+
+
+def test_scheduler_cannot_exceed_capture_rate():
+    config = example_config()
+    config["frame_scheduler"].update(enabled=True, max_fps=2 * config["capture_fps"])
+    with pytest.raises(ValueError, match="capture_fps"):
+        Config(**config)
+
+    config["frame_scheduler"]["max_fps"] = config["capture_fps"]
+    assert Config(**config).frame_scheduler.enabled
+
+
+def test_off_hours_rate_must_be_positive():
+    config = example_config()
+    config["schedule"]["off_hours_fps"] = 0
+    with pytest.raises(ValueError, match="off_hours_fps"):
+        Config(**config)
@@ -0,0 +1,40 @@
+import sys
+from types import ModuleType, SimpleNamespace
+
+import numpy as np
+from face_id.gallery import load_face_gallery
+
+
+class FakeRepository:
+    """AsyncNotificationRepository over two enrolled users of one organization."""
+
+    def __init__(self, db_config):
+        self.users = [SimpleNamespace(id="ann"), SimpleNamespace(id="bob")]
+        self.face_encodings = [
+            SimpleNamespace(id=f"{user.id}-face", user_id=user.id, face_encoding=embedding.tobytes())
+            for user, embedding in zip(self.users, np.eye(2, 4))
+        ]
+
+    async def get_face_encodings_by_org(self, org_id):
+        return self.face_encodings if org_id == "org" else []
+
+    async def get_user_accounts_by_org(self, org_id):
+        return self.users if org_id == "org" else []
+
+    def get_engine(self):
+        async def dispose():
+            pass
+
+        return SimpleNamespace(dispose=dispose)
+
+
+def test_load_face_gallery_matches_enrolled_users(monkeypatch):
+    repository = ModuleType("notification_app.repository")
+    repository.AsyncNotificationRepository = FakeRepository
+    monkeypatch.setitem(sys.modules, "notification_app.repository", repository)
+
+    gallery, users = load_face_gallery(None, "org")
+
+    assert len(gallery) == 2 and sorted(users) == ["ann", "bob"]
+    user_ids, similarities = gallery.match(np.array([[0, 1, 0, 0]], np.float32))
+    assert users[user_ids[0]].id == "bob" and similarities[0] > 0.99
@@ -0,0 +1,24 @@
+import numpy as np
+from common.frame_data import FrameData
+from common.person import Person
+
+
+def make_person(x, track_id=None):
+    return Person((x, 0, x + 10, 20), 0.9, np.zeros((17, 3)), track_id=track_id)
+
+
+def test_persons_are_views_and_assignable():
+    frame_data = FrameData(image=None, index=0)
+    for x in (0, 20, 40):
+        frame_data.add_person(make_person(x))
+
+    # Edits through a view reach the batch
+    frame_data.persons[1].track_id = 7
+    assert frame_data.people.track_ids.tolist() == [-1, 7, -1]
+
+    # The list is rebuilt on access; mutations go through assignment
+    kept = [person for person in frame_data.persons if person.track_id is not None]
+    frame_data.persons = kept + [make_person(60, track_id=9)]
+    assert [person.bbox[0] for person in frame_data.persons] == [20, 60]
+    assert frame_data.people.track_ids.tolist() == [7, 9]
+    assert kept[0].batch is frame_data.people
@@ -0,0 +1,167 @@
+import multiprocessing
+import pickle
+import queue
+import time
+
+import cv2
+import numpy as np
+import pytest
+from capture.service import CaptureService
+from common.frame_buffer import SharedFrameRing
+from common.frame_data import FrameData
+from common.person import PersonBatch
+from common.service import STOP_SENTINEL
+from face_id.gallery import FaceGallery
+from face_id.service import FaceRecognitionService
+from pose_estimation.service import PoseEstimationService
+
+NUM_SLOTS = 4
+SHAPE = (48, 64, 3)
+
+
+class EmptyPoseModel:
+    """Stands in for PoseModel: reads every pixel like inference would and finds nobody."""
+
+    def get_poses_batch(self, images):
+        for image in images:
+            image.sum()
+        return [[] for _ in images], []
+
+
+class ConstantFaceEmbedder:
+    """Stands in for FaceEmbedder: reads every face crop and embeds it as the same unit vector."""
+
+    def embed(self, image, bboxes):
+        for x_min, y_min, x_max, y_max in bboxes.tolist():
+            image[y_min:y_max, x_min:x_max].sum()
+        return np.ones((len(bboxes), 4), np.float32) / 2
+
+
+def frontal_face_people():
+    """One untracked person whose nose, eyes and ears are visible and face the camera."""
+    keypoints = np.zeros((1, 17, 3), np.float32)
+    keypoints[0, :5] = [[32, 24, 0.9], [26, 20, 0.9], [38, 20, 0.9], [20, 22, 0.9], [44, 22, 0.9]]
+    return PersonBatch.from_arrays([[10, 5, 54, 48]], keypoints, [0.9])
+
+
+def write_video(path, num_frames):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 25, (SHAPE[1], SHAPE[0]))
+    for index in range(num_frames):
+        writer.write(np.full(SHAPE, index * 8 % 256, np.uint8))
+    writer.release()
+    return path
+
+
+@pytest.fixture
+def ring():
+    ring = SharedFrameRing(NUM_SLOTS, SHAPE)
+    yield ring
+    ring.close()
+
+
+def test_pose_service_releases_slots_after_inference(ring):
+    output_queue = queue.Queue()
+    service = PoseEstimationService("pose", queue.Queue(), output_queue, "unused.onnx", frame_ring=ring)
+    service.model = EmptyPoseModel()
+
+    for index in range(5 * NUM_SLOTS):
+        frame_data = ring.put(np.full(SHAPE, index, np.uint8), index, timeout=0)
+        assert frame_data is not None, f"no free slot for frame {index}"
+
+        # Only the slot reference crosses the process boundary
+        received = pickle.loads(pickle.dumps(frame_data))
+        assert received.image is None
+        service.process_batch([received])
+
+        processed = output_queue.get_nowait()
+        assert processed.frame_slot is None
+        assert processed.image is None
+    assert ring.dropped.value == 0
+
+
+def test_pose_service_keeps_slots_for_later_stages(ring):
+    output_queue = queue.Queue()
+    service = PoseEstimationService(
+        "pose", queue.Queue(), output_queue, "unused.onnx", frame_ring=ring, release_frames=False
+    )
+    service.model = EmptyPoseModel()
+
+    for index in range(NUM_SLOTS):
+        service.process_batch([pickle.loads(pickle.dumps(ring.put(np.zeros(SHAPE, np.uint8), index, timeout=0)))])
+        assert output_queue.get_nowait().frame_slot is not None
+    assert ring.put(np.zeros(SHAPE, np.uint8), NUM_SLOTS, timeout=0) is None
+
+
+def test_face_service_recognizes_from_ring_and_releases_slots(ring):
+    output_queue = queue.Queue()
+    gallery = FaceGallery(np.ones((1, 4), np.float32), ["user"])
+    service = FaceRecognitionService(
+        "faces",
+        queue.Queue(),
+        output_queue,
+        "unused.onnx",
+        gallery,
+        {"user": "account"},
+        min_quality=0.0,
+        frame_ring=ring,
+    )
+    service.embedder = ConstantFaceEmbedder()
+    service.identities = {}
+
+    for index in range(5 * NUM_SLOTS):
+        frame_data = ring.put(np.full(SHAPE, index, np.uint8), index, timeout=0)
+        assert frame_data is not None, f"no free slot for frame {index}"
+        frame_data.set_people(frontal_face_people())
+
+        received = pickle.loads(pickle.dumps(frame_data))
+        assert received.image is None
+        assert service.process_frame(received) == 1
+        assert received.frame_slot is None
+        assert received.people[0].user == "account"
+
+
+def test_capture_sends_frames_larger_than_slots_as_copies(ring):
+    output_queue = queue.Queue()
+    capture = CaptureService("capture", [0], output_queue, frame_ring=ring)
+    capture.gates, capture.throttle, capture.oversized_sources = {}, None, set()
+
+    large = np.full((2 * SHAPE[0], 2 * SHAPE[1], 3), 7, np.uint8)
+    for index in range(2 * NUM_SLOTS):
+        capture.emit(FrameData(image=large, index=index, camera_id=0))
+        sent = pickle.loads(pickle.dumps(output_queue.get_nowait()))
+        assert sent.frame_slot is None and sent.image.shape == large.shape
+    assert capture.oversized_sources == {0}
+
+    # Frames that fit still go through the ring, which the copies did not use up
+    capture.emit(FrameData(image=np.zeros(SHAPE, np.uint8), index=2 * NUM_SLOTS, camera_id=0))
+    assert output_queue.get_nowait().frame_slot is not None
+
+
+def test_capture_to_pose_runs_more_frames_than_slots(ring, tmp_path, empty_pose_model):
+    video_path = write_video(tmp_path / "clip.avi", 3 * NUM_SLOTS)
+    frame_queue, pose_queue = multiprocessing.Queue(), multiprocessing.Queue()
+    capture = CaptureService("capture", [str(video_path)], frame_queue, fps=0, frame_ring=ring)
+    pose = PoseEstimationService("pose", frame_queue, pose_queue, empty_pose_model, frame_ring=ring)
+
+    pose.start()
+    capture.start()
+    received = 0
+    deadline = time.monotonic() + 60
+    try:
+        while received <= 5 * NUM_SLOTS and time.monotonic() < deadline:
+            try:
+                frame_data = pose_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            assert frame_data.frame_slot is None
+            received += 1
+    finally:
+        capture.stop()
+        frame_queue.put(STOP_SENTINEL)
+        while pose.is_alive():
+            try:
+                pose_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        pose.join()
+    assert received > 5 * NUM_SLOTS
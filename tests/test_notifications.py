@@ -0,0 +1,130 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from common.models import EventType
+from event_detection.events import DetectionEvent
+from event_detection.notifier import NotificationService
+
+
+class FakeRepository:
+    def __init__(self):
+        self.events = []
+
+    async def get_organization_by_id(self, org_id):
+        return SimpleNamespace(id=org_id, org_name="School")
+
+    async def get_user_account_by_id(self, user_id):
+        return SimpleNamespace(user_name="Student")
+
+    async def get_subscriptions_by_student_id(self, org_id, event_type, student_id):
+        return [SimpleNamespace(telegram_chat_id=42)]
+
+    async def create_event(self, **kwargs):
+        self.events.append(kwargs)
+
+
+class FakeBot:
+    def __init__(self):
+        self.messages = []
+        self.photos = []
+
+    async def send_message(self, chat_id, text):
+        self.messages.append(chat_id)
+
+    async def send_photo(self, chat_id, photo, caption):
+        self.photos.append(chat_id)
+
+
+class FakeIncomingMessage:
+    def __init__(self, body):
+        self.body = body
+
+    @asynccontextmanager
+    async def process(self):
+        yield
+
+
+def test_worker_records_incident_published_without_image():
+    pytest.importorskip("telegram")
+    pytest.importorskip("aio_pika")
+    pytest.importorskip("greenlet")
+    from notification_app.notification_worker.worker import NotificationWorker
+
+    event = DetectionEvent(EventType.LYING_MAN, 0, 7, datetime(2026, 10, 16, 12, 30), [3], user_ids=["user"])
+    service = NotificationService("notifications", None, None, "org")
+    message = service.message(event)
+    assert message.image is None
+
+    repository = FakeRepository()
+    worker = NotificationWorker(repository, "123456:TOKEN", "amqp://localhost")
+    worker.bot = FakeBot()
+    asyncio.run(worker.process_message(FakeIncomingMessage(json.dumps(message.__dict__).encode("utf-8"))))
+
+    assert worker.bot.photos == []
+    assert len(worker.bot.messages) == 2
+    assert repository.events == [
+        dict(
+            org_id="org",
+            event_type=EventType.LYING_MAN,
+            timestamp=datetime(2026, 10, 16, 12, 30),
+            student_id="user",
+            camera_id="0",
+        )
+    ]
+
+
+class FlakyConnection:
+    def __init__(self):
+        self.ticks = 0
+
+    def process_data_events(self, time_limit):
+        self.ticks += 1
+
+
+class FlakySender:
+    """MessageSender whose first connection is dropped by the broker before the first message."""
+
+    instances = []
+
+    def __init__(self, config):
+        self.mq_connection = FlakyConnection()
+        self.sent = []
+        self.closed = False
+        FlakySender.instances.append(self)
+
+    def send_message(self, message):
+        from pika.exceptions import StreamLostError
+
+        if len(FlakySender.instances) == 1:
+            raise StreamLostError("Transport indicated EOF")
+        self.sent.append(message)
+
+    def close(self):
+        self.closed = True
+
+
+def test_notifier_services_heartbeats_and_resends_after_lost_connection(monkeypatch):
+    import queue
+
+    from common.service import STOP_SENTINEL
+    from event_detection import notifier
+
+    monkeypatch.setattr(notifier, "MessageSender", FlakySender)
+    FlakySender.instances = []
+    event_queue = queue.Queue()
+    event_queue.put(DetectionEvent(EventType.FIGHTING, 1, 3, datetime(2026, 10, 16, 12, 30), [1, 2], score=1.0))
+    event_queue.put(STOP_SENTINEL)
+
+    service = NotificationService("notifications", event_queue, None, "org", get_timeout=0.01, rise_hits=1)
+    service.running.set()
+    service.run()
+
+    first, second = FlakySender.instances
+    assert first.closed and first.sent == []
+    assert [message.event_type for message in second.sent] == [EventType.FIGHTING]
+    assert second.mq_connection.ticks == 1
+    assert second.closed
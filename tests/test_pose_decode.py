@@ -0,0 +1,26 @@
+import numpy as np
+from pose_estimation.model import decode_poses, decode_poses_loop
+
+
+def clustered_output(centers, num_anchors=8400, anchors_per_person=20, jitter=5.0, seed=0):
+    """A YOLOv8-pose output where each person is found by a cluster of jittered confident anchors."""
+    rng = np.random.default_rng(seed)
+    output = np.zeros((56, num_anchors), np.float32)
+    for person, center in enumerate(centers):
+        anchors = slice(person * anchors_per_person, (person + 1) * anchors_per_person)
+        output[:4, anchors] = np.asarray(center, np.float32)[:, None] + rng.normal(0, jitter, (4, anchors_per_person))
+        output[4, anchors] = rng.uniform(0.55, 0.95, anchors_per_person)
+    return output
+
+
+def test_clustered_person_decodes_to_one_detection():
+    for seed in range(10):
+        output = clustered_output([(320, 300, 110, 260)], seed=seed)
+        assert len(decode_poses(output, 1.0, 0, 0)) == 1
+        assert len(decode_poses_loop(output, 1.0, 0, 0)) == 1
+
+
+def test_neighbouring_people_are_kept_apart():
+    # Side by side, their boxes overlap by about a third
+    output = clustered_output([(300, 300, 110, 260), (360, 300, 110, 260)], jitter=2.0)
+    assert len(decode_poses(output, 1.0, 0, 0)) == 2
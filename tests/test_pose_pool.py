@@ -0,0 +1,57 @@
+import multiprocessing
+import queue
+import threading
+import time
+
+import numpy as np
+from common.frame_data import FrameData
+from pose_estimation.pool import PoseEstimationPool
+
+NUM_FRAMES = 48
+
+
+def test_pool_stops_under_load_and_emits_every_frame(empty_pose_model):
+    input_queue, output_queue = multiprocessing.Queue(), multiprocessing.Queue()
+    pool = PoseEstimationPool("pose", input_queue, output_queue, empty_pose_model, num_workers=2)
+    pool.start()
+
+    # Full HD frames, so results pile up in the pool's results queue faster than they are pickled through
+    image = np.zeros((1080, 1920, 3), np.uint8)
+    for index in range(NUM_FRAMES):
+        input_queue.put(FrameData(image=image, index=index, camera_id=index % 2))
+    while pool.dispatched < NUM_FRAMES // 2:
+        time.sleep(0.01)
+
+    stopper = threading.Thread(target=pool.stop, daemon=True)
+    stopper.start()
+    emitted = []
+    deadline = time.monotonic() + 60
+    while stopper.is_alive() and time.monotonic() < deadline:
+        try:
+            emitted.append(output_queue.get(timeout=0.1))
+        except queue.Empty:
+            pass
+    stopper.join(timeout=0)
+    try:
+        assert not stopper.is_alive(), "pool.stop() did not return"
+        assert not any(worker.is_alive() for worker in pool.workers)
+    finally:
+        for worker in pool.workers:
+            worker.kill()
+
+    while True:
+        try:
+            emitted.append(output_queue.get(timeout=1))
+        except queue.Empty:
+            break
+    # Frames never dispatched stay on the input queue, read them so this process can exit
+    while True:
+        try:
+            input_queue.get(timeout=1)
+        except queue.Empty:
+            break
+    # Every dispatched frame comes out once, in order per camera
+    assert len(emitted) == pool.dispatched
+    for camera_id in (0, 1):
+        indices = [frame_data.index for frame_data in emitted if frame_data.camera_id == camera_id]
+        assert indices == sorted(indices)
@@ -0,0 +1,43 @@
+import queue
+import time
+
+from common.service import STOP_SENTINEL, ServiceBase
+
+from .tracker import MultiCameraTracker
+
+
+class TrackingService(ServiceBase):
+    """Assigns Person.track_id to frames coming out of pose estimation, keeping track state per camera."""
+
+    def __init__(self, name, input_queue, output_queue, get_timeout=0.5, **tracker_kwargs):
+        super().__init__(name)
+        self.input_queue = input_queue
+        self.output_queue = output_queue
+        self.get_timeout = get_timeout
+        self.tracker_kwargs = tracker_kwargs
+
+    def run(self):
+        self.tracker = MultiCameraTracker(**self.tracker_kwargs)
+        self.logger.info("Starting tracking service.")
+
+        while self.running.is_set():
+            try:
+                frame_data = self.input_queue.get(timeout=self.get_timeout)
+            except queue.Empty:
+                continue
+            if frame_data is STOP_SENTINEL:
+                break
+
+            start_time = time.perf_counter()
+            self.output_queue.put(self.tracker.track_frame(frame_data))
+            self.logger.info(
+                f"Tracked {len(frame_data.people)} persons in {time.perf_counter() - start_time:.4f} seconds."
+            )
+
+        self.logger.info("Tracking service stopped gracefully.")
+
+    def stop(self):
+        """Wake the service with a stop sentinel, then wait for it to finish."""
+        if self.running.is_set():
+            self.input_queue.put(STOP_SENTINEL)
+        super().stop()
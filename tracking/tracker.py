@@ -0,0 +1,143 @@
+import numpy as np
+
+from kit.box_ops import pairwise_iou
+
+
+def greedy_match(iou, threshold):
+    """
+    Match rows to columns by descending IoU.
+    Parameters:
+        iou (np.array): (T, D) IoU matrix between tracks and detections.
+        threshold (float): Minimum IoU for a match.
+    Returns:
+        tuple: (track indices, detection indices) of the matched pairs.
+    """
+    rows, cols = np.nonzero(iou > threshold)
+    order = np.argsort(-iou[rows, cols], kind="stable")
+    used_rows, used_cols = set(), set()
+    matched_rows, matched_cols = [], []
+    for row, col in zip(rows[order].tolist(), cols[order].tolist()):
+        if row in used_rows or col in used_cols:
+            continue
+        used_rows.add(row)
+        used_cols.add(col)
+        matched_rows.append(row)
+        matched_cols.append(col)
+    return np.array(matched_rows, dtype=np.int64), np.array(matched_cols, dtype=np.int64)
+
+
+class Tracker:
+    """
+    ByteTrack-style IoU tracker for one camera.
+
+    Track state is kept as parallel arrays. Each update first matches predicted track boxes to high-confidence
+    detections, then matches the remaining tracks to low-confidence detections so people stay tracked through
+    partial occlusion. Unmatched high-confidence detections start new tracks, and tracks unseen for more than
+    `max_age` frames are removed.
+    """
+
+    def __init__(self, high_thresh=0.5, low_thresh=0.1, match_iou=0.3, low_match_iou=0.5, max_age=30, min_hits=1):
+        self.high_thresh = high_thresh
+        self.low_thresh = low_thresh
+        self.match_iou = match_iou
+        self.low_match_iou = low_match_iou
+        self.max_age = max_age
+        self.min_hits = min_hits  # Updates needed before a track's id is reported
+        self.velocity_smoothing = 0.5
+
+        self.boxes = np.zeros((0, 4), dtype=np.float32)  # Last xyxy box of each track
+        self.velocities = np.zeros((0, 4), dtype=np.float32)  # Per-frame box motion
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.hits = np.zeros(0, dtype=np.int64)
+        self.ages = np.zeros(0, dtype=np.int64)  # Frames since the last match
+        self.next_id = 1
+
+    def __len__(self):
+        return self.ids.size
+
+    def update(self, boxes, scores):
+        """
+        Advance the tracker by one frame.
+        Parameters:
+            boxes (np.array): (P, 4) xyxy detection boxes.
+            scores (np.array): (P,) detection confidences.
+        Returns:
+            np.array: (P,) track id of each detection, -1 when it is not (yet) tracked.
+        """
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        scores = np.asarray(scores, dtype=np.float32).reshape(-1)
+        predicted = self.boxes + self.velocities
+        det_track = np.full(boxes.shape[0], -1, dtype=np.int64)  # Track index of each detection
+
+        # First association: all tracks against confident detections
+        high = np.flatnonzero(scores >= self.high_thresh)
+        tracks = np.arange(len(self))
+        rows, cols = greedy_match(pairwise_iou(predicted[tracks], boxes[high]), self.match_iou)
+        det_track[high[cols]] = tracks[rows]
+
+        # Second association: leftover tracks against weak detections
+        low = np.flatnonzero((scores >= self.low_thresh) & (scores < self.high_thresh))
+        tracks = np.setdiff1d(tracks, tracks[rows], assume_unique=True)
+        rows, cols = greedy_match(pairwise_iou(predicted[tracks], boxes[low]), self.low_match_iou)
+        det_track[low[cols]] = tracks[rows]
+
+        # Update matched tracks, coast the others on their predicted box
+        matched = det_track >= 0
+        track_idx, det_idx = det_track[matched], np.flatnonzero(matched)
+        self.boxes = predicted
+        self.ages += 1
+        motion = boxes[det_idx] - self.boxes[track_idx] + self.velocities[track_idx]
+        self.velocities[track_idx] = (
+            self.velocity_smoothing * motion + (1 - self.velocity_smoothing) * self.velocities[track_idx]
+        )
+        self.boxes[track_idx] = boxes[det_idx]
+        self.hits[track_idx] += 1
+        self.ages[track_idx] = 0
+
+        # Start tracks for unmatched confident detections
+        new = high[det_track[high] < 0]
+        det_track[new] = np.arange(len(self), len(self) + new.size)
+        self.boxes = np.concatenate((self.boxes, boxes[new]))
+        self.velocities = np.concatenate((self.velocities, np.zeros((new.size, 4), dtype=np.float32)))
+        self.ids = np.concatenate((self.ids, np.arange(self.next_id, self.next_id + new.size)))
+        self.hits = np.concatenate((self.hits, np.ones(new.size, dtype=np.int64)))
+        self.ages = np.concatenate((self.ages, np.zeros(new.size, dtype=np.int64)))
+        self.next_id += new.size
+
+        # Report ids of confirmed tracks, then forget stale ones
+        track_ids = np.full(boxes.shape[0], -1, dtype=np.int64)
+        tracked = det_track >= 0
+        confirmed = self.hits[det_track[tracked]] >= self.min_hits
+        track_ids[np.flatnonzero(tracked)[confirmed]] = self.ids[det_track[tracked]][confirmed]
+        self._remove(self.ages > self.max_age)
+        return track_ids
+
+    def _remove(self, stale):
+        if stale.any():
+            keep = ~stale
+            self.boxes = self.boxes[keep]
+            self.velocities = self.velocities[keep]
+            self.ids = self.ids[keep]
+            self.hits = self.hits[keep]
+            self.ages = self.ages[keep]
+
+
+class MultiCameraTracker:
+    """Keeps an independent Tracker per camera."""
+
+    def __init__(self, **tracker_kwargs):
+        self.tracker_kwargs = tracker_kwargs
+        self.trackers = {}
+
+    def update(self, camera_id, boxes, scores):
+        """Advance the tracker of `camera_id` and return the track id of each detection."""
+        tracker = self.trackers.get(camera_id)
+        if tracker is None:
+            tracker = self.trackers[camera_id] = Tracker(**self.tracker_kwargs)
+        return tracker.update(boxes, scores)
+
+    def track_frame(self, frame_data):
+        """Set the track id of every person of a FrameData."""
+        people = frame_data.people
+        people.track_ids = self.update(frame_data.camera_id, people.bboxes, people.confidences)
+        return frame_data
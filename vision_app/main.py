@@ -0,0 +1,45 @@
+import argparse
+import logging
+import signal
+
+from common.config import read_config
+from face_id.gallery import load_face_gallery
+from vision_app.pipeline import VisionPipeline
+
+logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO)
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="vision pipeline",
+        description="runs capture, pose estimation, tracking, event detection and notifications",
+    )
+    parser.add_argument(
+        "--config_path",
+        type=str,
+        default="config.yaml",
+        help="path to the configuration file",
+    )
+    args = parser.parse_args()
+
+    config = read_config(args.config_path)
+    face_gallery, users = None, None
+    if config.face_model_path is not None:
+        face_gallery, users = load_face_gallery(config.db, config.org_id)
+        logger.info(f"Loaded {len(face_gallery)} face encodings of {len(users)} users.")
+    pipeline = VisionPipeline(config, face_gallery=face_gallery, users=users)
+    pipeline.start()
+    logger.info("Vision pipeline started, press Ctrl-C to stop.")
+    try:
+        signal.pause()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pipeline.stop()
+        logger.info("Vision pipeline stopped.")
+
+
+if __name__ == "__main__":
+    main()
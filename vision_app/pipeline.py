@@ -0,0 +1,126 @@
+import multiprocessing
+
+from capture.service import CaptureService
+from common.config import Config
+from common.frame_buffer import SharedFrameRing
+from event_detection.fighting import FightingDetector
+from event_detection.lying import LyingDetector
+from event_detection.notifier import NotificationService
+from event_detection.service import EventDetectionService
+from face_id.service import FaceRecognitionService
+from pose_estimation.pool import PoseEstimationPool
+from pose_estimation.service import PoseEstimationService
+from tracking.service import TrackingService
+
+DEFAULT_DETECTORS = (LyingDetector, FightingDetector)
+ACTIVITY_QUEUE_SIZE = 256  # Pending event detection reports for the frame rate scheduler
+
+
+class VisionPipeline:
+    """
+    Capture -> pose estimation -> tracking -> (face recognition) -> event detection -> notifications, built
+    from a Config. Face recognition runs when `face_model_path` is configured and a gallery is given.
+
+    When the frame ring is enabled, capture copies every frame into shared memory once and only slot
+    references travel downstream. The last stage reading pixels releases each slot: pose estimation, or face
+    recognition when it runs (see SharedFrameRing for slot ownership). Services are started from the last
+    stage backwards and stopped from the first stage forwards, so every stage drains what is already queued
+    before the next one stops.
+    """
+
+    def __init__(self, config: Config, detector_factories=DEFAULT_DETECTORS, face_gallery=None, users=None):
+        self.config = config
+        recognize_faces = config.face_model_path is not None and face_gallery is not None
+        ring_config = config.frame_ring
+        self.frame_ring = (
+            SharedFrameRing(ring_config.num_slots, ring_config.max_shape()) if ring_config.enabled else None
+        )
+
+        self.frame_queue = multiprocessing.Queue()
+        self.pose_queue = multiprocessing.Queue()
+        self.tracked_queue = multiprocessing.Queue()
+        self.event_queue = multiprocessing.Queue()
+        # Event activity only feeds the pool's frame rate scheduler, nothing would drain it otherwise
+        scheduled = config.frame_scheduler.enabled
+        self.activity_queue = multiprocessing.Queue(ACTIVITY_QUEUE_SIZE) if scheduled else None
+
+        self.capture = CaptureService(
+            "capture",
+            config.camera_sources,
+            self.frame_queue,
+            fps=config.capture_fps,
+            frame_ring=self.frame_ring,
+            motion_config=config.motion,
+            schedule_config=config.schedule,
+            db_config=config.db,
+            org_id=config.org_id,
+        )
+        self.pose = self._build_pose(self.frame_queue, self.pose_queue, release_frames=not recognize_faces)
+        self.tracking = TrackingService("tracking", self.pose_queue, self.tracked_queue)
+        self.faces = None
+        event_input_queue = self.tracked_queue
+        if recognize_faces:
+            self.identified_queue = event_input_queue = multiprocessing.Queue()
+            self.faces = FaceRecognitionService(
+                "face_recognition",
+                self.tracked_queue,
+                self.identified_queue,
+                config.face_model_path,
+                face_gallery,
+                users or {},
+                frame_ring=self.frame_ring,
+            )
+        self.events = EventDetectionService(
+            "event_detection",
+            event_input_queue,
+            self.event_queue,
+            detector_factories,
+            activity_queue=self.activity_queue,
+        )
+        self.notifications = NotificationService("notifications", self.event_queue, config.message_queue, config.org_id)
+
+    def _build_pose(self, input_queue, output_queue, release_frames=True):
+        """A single pose service, or a pool when several workers or the frame rate scheduler are configured."""
+        config = self.config
+        service_kwargs = dict(
+            frame_ring=self.frame_ring,
+            release_frames=release_frames,
+            queue_policy=config.pose_queue,
+            roi_config=config.pose_roi,
+        )
+        if config.pose_workers > 1 or config.frame_scheduler.enabled:
+            return PoseEstimationPool(
+                "pose_estimation",
+                input_queue,
+                output_queue,
+                config.pose_model_path(),
+                num_workers=config.pose_workers,
+                session_config=config.pose_session,
+                scheduler_config=config.frame_scheduler,
+                activity_queue=self.activity_queue,
+                **service_kwargs,
+            )
+        return PoseEstimationService(
+            "pose_estimation",
+            input_queue,
+            output_queue,
+            config.pose_model_path(),
+            session_config=config.pose_session,
+            **service_kwargs,
+        )
+
+    @property
+    def services(self):
+        """Stages in pipeline order."""
+        stages = [self.capture, self.pose, self.tracking, self.faces, self.events, self.notifications]
+        return [service for service in stages if service is not None]
+
+    def start(self):
+        for service in reversed(self.services):
+            service.start()
+
+    def stop(self):
+        for service in self.services:
+            service.stop()
+        if self.frame_ring is not None:
+            self.frame_ring.close()